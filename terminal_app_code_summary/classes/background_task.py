@@ -0,0 +1,51 @@
+import threading  # Standard library used to run the task alongside the menus.
+
+
+class BackgroundTask:
+    # Runs a function in a background thread and hands over its result the first time it is needed.
+    # Purpose: main.py loads the students and kitchen menu this way, so the main menu is shown straight away and the
+    # loading happens while the user reads it. Screens that need the data call `result`, which waits only if the
+    # loading has not finished yet. An error raised by the function is raised again from `result`.
+    # Printing from the background thread would write over the menu the user is reading, so with report=True the
+    # function is given a `report` callable instead, which keeps each message until the main thread takes them.
+
+    # Methods include __init__, done, result and take_messages.
+
+    # Example:
+    #   data = BackgroundTask(load_application_data, report=True)
+    #   ...  # Show the main menu
+    #   students, classrooms, kitchen, connection = data.result()
+    #   for message in data.take_messages():
+    #       print(message)  # e.g. "No saved menu found. Starting with an empty menu."
+
+    def __init__(self, function, report=False):
+        self.value = None  # value: What the function returned, once it has finished.
+        self.error = None  # error (BaseException): The error raised by the function, if any.
+        self.messages = []  # messages (list of str): What the function reported, until they are taken.
+        arguments = {"report": self.messages.append} if report else {}
+        self.thread = threading.Thread(target=self._run, args=(function, arguments), name="background-task")
+        self.thread.start()
+
+    def _run(self, function, arguments):
+        try:
+            self.value = function(**arguments)
+        except BaseException as error:  # Handed over to the caller of result
+            self.error = error
+
+    def done(self):
+        # Returns: bool: True if the function has finished, so `result` will not wait.
+        return not self.thread.is_alive()
+
+    def result(self):
+        # Waits for the function to finish, then returns what it returned or raises the error it raised.
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+    def take_messages(self):
+        # Called after `result`, once the function has finished.
+        # Returns: list of str: The messages reported since they were last taken, in order. Each is returned once.
+        messages = list(self.messages)
+        self.messages.clear()
+        return messages
@@ -1,16 +1,21 @@
+from bisect import bisect_right  # Standard library binary search, used to find the age band containing a student's age.
+
+from classes.student_registry import StudentRegistry  # Internal list of students indexed by student ID.
+
 class Classroom:
     # Represents a classroom with a specific name, age range, and a list of enrolled students.
     # This class is used to define a classroom and manage students within a specified age range.
     # It provides methods to validate if a student's age falls within the classroom's range and to retrieve the classroom's name.
 
-    # method includes __init__, is_valid_for_age and get_name
+    # method includes __init__, is_valid_for_age, has_space and get_name
     
-    def __init__(self, name, min_age, max_age):
-        # Initialises the classroom with its name, age range, and an empty student list.
+    def __init__(self, name, min_age, max_age, capacity=None):
+        # Initialises the classroom with its name, age range, optional capacity, and an empty student list.
         self.name = name # name (str): The name of the classroom.
         self.min_age = min_age # The (int) minimum age for students in this classroom.
         self.max_age = max_age # The (int) maximum age for students in this classroom.
-        self.students = [] # students (list): A list to store students assigned to this classroom.
+        self.capacity = capacity # capacity (int or None): The maximum number of students, or None for no limit.
+        self.students = StudentRegistry() # students (StudentRegistry): A list to store students assigned to this classroom, indexed by student ID.
 
     def is_valid_for_age(self, age):
         """
@@ -44,6 +49,11 @@ class Classroom:
     """
         return self.min_age <= age < self.max_age
 
+    def has_space(self):
+        # Checks whether another student can be enrolled without going over the classroom's capacity.
+        # Returns: bool: True if the classroom has no capacity limit or fewer students than its capacity.
+        return self.capacity is None or len(self.students) < self.capacity
+
     def get_name(self):
         """
     Retrieve the name of the classroom.
@@ -67,27 +77,139 @@ class Classroom:
         """
         return self.name
 
+class ClassroomRegistry(list):
+    # A list of classrooms with an index of their age bands, so finding a student's classroom is a binary search.
+    # Purpose: Sites can have dozens of rooms, with overlapping age ranges and capacity limits. Instead of calling
+    # is_valid_for_age on every classroom, the ages where any classroom starts or ends are kept as a sorted list of
+    # boundaries. Between two neighbouring boundaries the same classrooms are always valid, so the classrooms valid for
+    # each of these bands are worked out once, in the order they were configured.
+    # Finding a classroom is then a binary search over the boundaries (O(log k) for k classrooms) and a check of the
+    # few classrooms in that band, so assigning a whole roster of n students takes O(n log k).
+    # It behaves like a normal list of classrooms everywhere else, and the index is rebuilt whenever the list changes.
+
+    # Methods include __init__, from_config, classrooms_for_age, find_classroom and assign_students.
+
+    # Example:
+    #   classrooms = ClassroomRegistry.from_config([
+    #       {"name": "Babies Room (0-2 years)", "min_age": 0, "max_age": 2, "capacity": 12},
+    #       {"name": "Mixed Room (1-3 years)", "min_age": 1, "max_age": 3, "capacity": None}
+    #   ])
+    #   classrooms.classrooms_for_age(1.5) -> [Babies Room (0-2 years), Mixed Room (1-3 years)]
+    #   classrooms.find_classroom(1.5) -> Babies Room, or Mixed Room once the Babies Room has 12 students
+
+    def __init__(self, classrooms=()):
+        super().__init__(classrooms)
+        self._build_index()
+
+    @classmethod
+    def from_config(cls, records):
+        # Builds the classrooms from their configuration, e.g. the records in 'data/classrooms.json'.
+        # Arguments: records (list): Dictionaries with "name", "min_age", "max_age" and optionally "capacity".
+        return cls(
+            Classroom(record["name"], record["min_age"], record["max_age"], record.get("capacity"))
+            for record in records
+        )
+
+    def _build_index(self):
+        # Rebuilds the sorted age boundaries and the classrooms valid in each band between them.
+        self.boundaries = sorted({classroom.min_age for classroom in self} | {classroom.max_age for classroom in self})
+        self.bands = [
+            [classroom for classroom in self if classroom.min_age <= low and high <= classroom.max_age]
+            for low, high in zip(self.boundaries, self.boundaries[1:])
+        ]
+
+    def classrooms_for_age(self, age):
+        # Finds every classroom valid for the age, in the configured order, with a binary search over the boundaries.
+        # Returns: list: The classrooms whose is_valid_for_age accepts the age (empty if none).
+        band = bisect_right(self.boundaries, age) - 1
+        if 0 <= band < len(self.bands):
+            return self.bands[band]
+        return []
+
+    def find_classroom(self, age, check_capacity=True):
+        # Finds the first valid classroom for the age, skipping classrooms that are full.
+        # Arguments:
+        #   age (float): The student's age in decimal years.
+        #   check_capacity (bool, optional): Set to False to ignore capacity limits. Default is True.
+        # Returns: Classroom or None: The classroom, or None if no valid classroom has space.
+        for classroom in self.classrooms_for_age(age):
+            if not check_capacity or classroom.has_space():
+                return classroom
+        return None
+
+    def assign_students(self, students, check_capacity=True):
+        # Assigns every student to their classroom in one pass, with one binary search per student (O(n log k)).
+        # Purpose: Used to place a batch of new students at once, e.g. a bulk import.
+        # Students are placed in order, so when classrooms fill up the students listed first get the places.
+        # Returns: list: The students who could not be placed in any classroom. Their details are left unchanged.
+        unassigned = []
+        for student in students:
+            classroom = self.find_classroom(student.calculate_age(), check_capacity)
+            if classroom is None:
+                unassigned.append(student)
+            else:
+                classroom.students.append(student)
+                student.assign_classroom(classroom)
+        return unassigned
+
+    # List methods that change which classrooms are in the list also rebuild the index.
+
+    def append(self, classroom):
+        super().append(classroom)
+        self._build_index()
+
+    def extend(self, classrooms):
+        super().extend(classrooms)
+        self._build_index()
+
+    def insert(self, index, classroom):
+        super().insert(index, classroom)
+        self._build_index()
+
+    def remove(self, classroom):
+        super().remove(classroom)
+        self._build_index()
+
+    def pop(self, index=-1):
+        classroom = super().pop(index)
+        self._build_index()
+        return classroom
+
+    def clear(self):
+        super().clear()
+        self._build_index()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._build_index()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._build_index()
+
+    def __iadd__(self, classrooms):
+        self.extend(classrooms)
+        return self
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._build_index()
+
+    def reverse(self):
+        super().reverse()
+        self._build_index()
+
+
 # Global list of students
 # Purpose: This list is used to store all student instances in the application. 
 # Students can be assigned to a classroom based on their age, and this global list ensures they can be accessed from various parts of the application.
-students = []
-
-# Initialize the classrooms
-# Purpose: These instances represent predefined classrooms categorized by age range. 
-# Students will be assigned to these classrooms automatically based on their age.
-babies_classroom = Classroom("Babies Room (0-2 years)", 0, 2)
-toddlers_classroom = Classroom("Toddlers Room(2-3 years)", 2, 3)
-kindergarten_classroom = Classroom("Kindergarten Room(3-5 years)", 3, 5)
-
-# List of classrooms
-# Purpose: This list contains all classroom instances. 
-# It is used to iterate through classrooms when assigning students or retrieving information about specific classrooms.
-
-# Example Usage - Assign a student to a classroom based on age:
-# for student in students:
-#     for classroom in classrooms:
-#         if classroom.is_valid_for_age(student.age):
-#             classroom.students.append(student)
-#             break
-classrooms = [babies_classroom, toddlers_classroom, kindergarten_classroom]
-
+students = StudentRegistry()
+
+# Default classrooms
+# Purpose: Used when no classroom configuration has been saved to 'data/classrooms.json' (see `load_classrooms` in file_functions.py).
+# Each classroom has a name, an age range in years (minimum included, maximum excluded) and an optional capacity (None for no limit).
+DEFAULT_CLASSROOMS = [
+    {"name": "Babies Room (0-2 years)", "min_age": 0, "max_age": 2, "capacity": None},
+    {"name": "Toddlers Room (2-3 years)", "min_age": 2, "max_age": 3, "capacity": None},
+    {"name": "Kindergarten Room (3-5 years)", "min_age": 3, "max_age": 5, "capacity": None}
+]
@@ -0,0 +1,224 @@
+from array import array  # Standard library typed array, used to keep a copy of the menu slots as they were last checked.
+
+from classes.allergen_index import allergen_index, normalize_allergen  # Internal index of students by allergen, and its allergen name normalization.
+from classes.kitchen import MENU_DAYS, MENU_MEALS, SLOTS_PER_DAY, SLOTS_PER_WEEK, menu_week_number  # Internal fixed shape of the compact menu, and its week number parsing.
+
+
+def slot_position(slot):
+    # Converts a position in CompactMenu.slots to the meal it holds.
+    # Example: slot_position(22) -> ("2", "Monday", "Lunch")
+    week_index, day_slot = divmod(slot, SLOTS_PER_WEEK)
+    day_index, meal_index = divmod(day_slot, SLOTS_PER_DAY)
+    return str(week_index + 1), MENU_DAYS[day_index], MENU_MEALS[meal_index]
+
+
+class ExposureChecker:
+    # Finds every meal on the menu that contains an allergen a student who eats it is allergic to.
+    # Purpose: Links the menu to the students' allergies, so cooks no longer compare the two lists by eye.
+    # Each allergen is given a bit, so a dish's allergens, a student's allergies and the allergies of everyone in a
+    # classroom are each one integer (a bitset), and checking a meal against a student is a single AND:
+    #   - dish_bits: the allergens of each dish, from Kitchen.dish_allergens (entered with set_dish_allergens).
+    #   - slot_bits: the allergens of the dish served in each of the menu's 1,092 slots, including the weeks that
+    #     repeat a rotating menu (see CompactMenu.effective_slots in classes/kitchen.py).
+    #   - student_bits and group_bits: each student's allergies, and the combined allergies of each classroom,
+    #     so a meal is only compared with the students of classrooms where someone is allergic to it.
+    # The first check covers all 52 weeks in one pass, reading only the weeks a report asks for. After that, `refresh` only rechecks:
+    #   - the slots whose dish changed since the last check (found by comparing the served dishes with a copy) in the
+    #     weeks already read, the weeks changed since the last save and the weeks a report asks for,
+    #   - the students added or removed since the last check (from allergen_index.changed_students),
+    # and `update_dish` only rechecks the slots serving a dish whose allergens changed.
+    # The classroom groups are only used to skip classrooms; a student who moves classroom is still checked in
+    # their previous group until they are rechecked, and reports show their current classroom.
+
+    # Methods include __init__, allergen_bits_for, check_all, refresh, update_dish, update_student, remove_student and conflicts.
+
+    # Example:
+    #   kitchen.dish_allergens["Peanut Butter Toast"] = ["Peanut"]
+    #   exposure_checker.refresh(kitchen, kitchen.menu)
+    #   exposure_checker.conflicts() -> [("1", "Monday", "Breakfast", "Peanut Butter Toast", student, ["Peanuts"])]
+
+    def __init__(self, index=allergen_index):
+        self.index = index  # index (AllergenIndex): The index of the students with allergies.
+        self.kitchen = None  # kitchen (Kitchen): The kitchen whose menu was last checked.
+        self.menu = None  # menu (CompactMenu): The menu that was last checked.
+        self.bits_by_allergen = {}  # bits_by_allergen (dict): The bit of each normalized allergen.
+        self.dish_bits = {}  # dish_bits (dict): The allergen bitset of each dish, keyed by lower-case dish name.
+        self.slot_bits = []  # slot_bits (list): The allergen bitset of the dish in each menu slot.
+        self.checked_slots = array('I')  # checked_slots (array): The menu's dish IDs as they were last checked.
+        self.students = {}  # students (dict): Each checked student, keyed by student ID.
+        self.student_bits = {}  # student_bits (dict): The allergy bitset of each checked student, keyed by student ID.
+        self.student_groups = {}  # student_groups (dict): The classroom group each student was checked in, keyed by student ID.
+        self.groups = {}  # groups (dict): The IDs of the students in each classroom group, keyed by classroom name.
+        self.group_bits = {}  # group_bits (dict): The combined allergy bitset of each classroom group.
+        self.students_by_slot = {}  # students_by_slot (dict): The IDs of the students exposed at each slot with a conflict.
+        self.slots_by_student = {}  # slots_by_student (dict): The slots each exposed student has a conflict at.
+
+    def allergen_bits_for(self, allergens):
+        # Returns: int: The bitset of the allergens, giving a new bit to each allergen seen for the first time.
+        bits = 0
+        for allergen in allergens:
+            allergen = normalize_allergen(allergen)
+            if allergen:
+                bits |= 1 << self.bits_by_allergen.setdefault(allergen, len(self.bits_by_allergen))
+        return bits
+
+    def _dish_id_bits(self, dish_id):
+        dish = self.menu.dish(dish_id)
+        return self.dish_bits.get(dish.lower(), 0) if dish else 0
+
+    def check_all(self, kitchen, weeks=None):
+        # Checks every meal of all 52 weeks against every student with allergies, replacing any earlier results.
+        # Every week is read first, unless `weeks` lists the only weeks to read (e.g. none, to check the weeks in memory).
+        self.kitchen = kitchen
+        self.menu = menu = kitchen.menu
+        self._read_weeks(menu if weeks is None else weeks)
+
+        self.dish_bits = {dish.lower(): self.allergen_bits_for(allergens) for dish, allergens in kitchen.dish_allergens.items()}
+        self.students, self.student_bits, self.student_groups, self.groups, self.group_bits = {}, {}, {}, {}, {}
+        self.students_by_slot, self.slots_by_student = {}, {}
+        self.index.changed_students.clear()
+        for student in self.index.students_with_allergies.values():
+            self._add_student(student)
+
+        dish_id_bits = [self._dish_id_bits(dish_id) for dish_id in range(len(menu.dishes))]
+        self.checked_slots = menu.effective_slots()
+        self.slot_bits = [dish_id_bits[dish_id] for dish_id in self.checked_slots]
+        for slot, bits in enumerate(self.slot_bits):
+            if bits:
+                self._check_slot(slot)
+
+    def _read_weeks(self, weeks):
+        # Reads each week's file if the menu is stored in weekly files and the week was not read yet.
+        # Returns: list of str: The weeks read that have a menu.
+        weeks = [str(week) for week in list(weeks) if week in self.menu]
+        for week in weeks:
+            self.menu[week]
+        return weeks
+
+    def refresh(self, kitchen, weeks=()):
+        # Brings the results up to date, rechecking only the slots and students that changed since the last check.
+        # Only the weeks already in memory, the weeks in Kitchen.changed_weeks and the given `weeks` are rechecked, so
+        # setting one day's menu never reads the other weeks' files. A report of the whole menu passes every week,
+        # e.g. refresh(kitchen, kitchen.menu); any week left out is rechecked once it is read.
+        # A different kitchen or menu (e.g. after load_menu) is checked in full, reading only the given `weeks`.
+        if kitchen is not self.kitchen or kitchen.menu is not self.menu:
+            self.check_all(kitchen, weeks)
+            return
+        menu = self.menu
+        weeks = self._read_weeks(weeks)
+        slots = menu.effective_slots()
+        loaded_weeks = getattr(menu, "loaded_weeks", None)
+        if loaded_weeks is None:
+            slot_range = range(len(slots))  # Every week of a menu that is not stored in weekly files is in memory
+        else:
+            numbers = {menu_week_number(week) for week in set(loaded_weeks) | kitchen.changed_weeks | set(weeks)}
+            numbers.discard(None)
+            slot_range = (slot for number in sorted(numbers) for slot in range((number - 1) * SLOTS_PER_WEEK, number * SLOTS_PER_WEEK))
+        changed_slots = [slot for slot in slot_range if slots[slot] != self.checked_slots[slot]]
+        self._recheck_slots(changed_slots, slots)
+
+        changed_students = self.index.changed_students
+        self.index.changed_students = {}
+        for student_id, student in changed_students.items():
+            if self.index.students_with_allergies.get(student_id) is student:
+                self.update_student(student)
+            elif self.students.get(student_id) is student:
+                self.remove_student(student_id)
+
+    def update_dish(self, dish):
+        # Rechecks only the slots serving a dish, after its allergens in Kitchen.dish_allergens were changed.
+        key = dish.lower()
+        allergens = next((allergens for name, allergens in self.kitchen.dish_allergens.items() if name.lower() == key), [])
+        self.dish_bits[key] = self.allergen_bits_for(allergens)
+        dish_ids = {dish_id for dish_id, name in enumerate(self.menu.dishes) if name and name.lower() == key}
+        self._recheck_slots([slot for slot, dish_id in enumerate(self.checked_slots) if dish_id in dish_ids], self.checked_slots)
+
+    def _recheck_slots(self, slots, dish_ids):
+        # Rechecks the given slots, now serving the dishes at the same positions in `dish_ids`.
+        for slot in slots:
+            self.checked_slots[slot] = dish_ids[slot]
+            self.slot_bits[slot] = self._dish_id_bits(self.checked_slots[slot])
+            self._check_slot(slot)
+
+    def _check_slot(self, slot):
+        # Replaces the conflicts at one slot, comparing it only with classrooms where someone has one of its allergens.
+        self._clear_slot(slot)
+        bits = self.slot_bits[slot]
+        if not bits:
+            return
+        for group, group_bits in self.group_bits.items():
+            if group_bits & bits:
+                for student_id in self.groups[group]:
+                    if self.student_bits[student_id] & bits:
+                        self._add_conflict(slot, student_id)
+
+    def _add_conflict(self, slot, student_id):
+        self.students_by_slot.setdefault(slot, set()).add(student_id)
+        self.slots_by_student.setdefault(student_id, set()).add(slot)
+
+    def _clear_slot(self, slot):
+        for student_id in self.students_by_slot.pop(slot, ()):
+            slots = self.slots_by_student[student_id]
+            slots.discard(slot)
+            if not slots:
+                del self.slots_by_student[student_id]
+
+    def _add_student(self, student):
+        # Adds a student to their classroom group. Returns: int: The student's allergy bitset.
+        bits = self.allergen_bits_for(student.allergies)
+        if not bits:
+            return 0
+        group = student.classroom.get_name() if student.classroom is not None else None
+        self.students[student.student_id] = student
+        self.student_bits[student.student_id] = bits
+        self.student_groups[student.student_id] = group
+        self.groups.setdefault(group, set()).add(student.student_id)
+        self.group_bits[group] = self.group_bits.get(group, 0) | bits
+        return bits
+
+    def update_student(self, student):
+        # Rechecks one student against the slot bitsets, e.g. after they were enrolled or their allergies changed.
+        self.remove_student(student.student_id)
+        bits = self._add_student(student)
+        if bits:
+            for slot, slot_bits in enumerate(self.slot_bits):
+                if slot_bits & bits:
+                    self._add_conflict(slot, student.student_id)
+
+    def remove_student(self, student_id):
+        # Removes a student and their conflicts, e.g. after they were deleted.
+        for slot in self.slots_by_student.pop(student_id, ()):
+            students = self.students_by_slot[slot]
+            students.discard(student_id)
+            if not students:
+                del self.students_by_slot[slot]
+        if student_id not in self.students:
+            return
+        del self.students[student_id], self.student_bits[student_id]
+        group = self.student_groups.pop(student_id)
+        self.groups[group].discard(student_id)
+        group_bits = 0
+        for other_id in self.groups[group]:
+            group_bits |= self.student_bits[other_id]
+        self.group_bits[group] = group_bits
+
+    def conflicts(self, week=None, day=None):
+        # Lists the conflicts found by the last check, optionally only for one week or one day of a week.
+        # Returns:
+        #   list: (week, day, meal, dish, student, allergies) tuples in menu order, where allergies are the student's
+        #   allergies found in the dish, as the student's allergies were entered.
+        results = []
+        for slot in sorted(self.students_by_slot):
+            slot_week, slot_day, meal = slot_position(slot)
+            if (week is not None and slot_week != str(week)) or (day is not None and slot_day != day):
+                continue
+            dish = self.menu.dish(self.checked_slots[slot])
+            for student_id in sorted(self.students_by_slot[slot]):
+                student = self.students[student_id]
+                allergies = [allergy for allergy in student.allergies if self.allergen_bits_for([allergy]) & self.slot_bits[slot]]
+                results.append((slot_week, slot_day, meal, dish, student, allergies))
+        return results
+
+
+# Global exposure checker - refreshed from the kitchen menu and allergen index whenever conflicts are listed or a day's menu is set.
+exposure_checker = ExposureChecker()
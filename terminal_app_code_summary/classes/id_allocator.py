@@ -0,0 +1,79 @@
+import threading  # Standard library used to lock the allocator so concurrent callers never receive the same ID.
+
+from constants import STUDENT_ID_CAPACITY  # Imported constant for the number of student IDs available.
+
+class IdAllocator:
+    # Hands out unique integer IDs from 1 up to a fixed capacity.
+    # Purpose: Replaces picking random IDs and retrying until an unused one is found, which slows down as the IDs fill up.
+    # Every call takes constant time, however many IDs are already in use:
+    #   - A bitmap (one bit per ID) records which IDs are in use, so a million IDs need about 125 KB.
+    #   - IDs given back with `release` (e.g. when a student is deleted) go on a free list and are handed out first.
+    #   - Otherwise the next never-used ID is handed out; this pointer only moves forward, skipping IDs marked as used.
+    # A lock makes every method safe to call from several threads at once.
+    # The allocator is seeded from the saved roster on startup with `mark_used` (see `load_students` in file_functions.py),
+    # so the IDs it hands out never collide with existing students.
+
+    # Methods include __init__, allocate, mark_used, release, is_used and __len__.
+
+    # Example:
+    #   allocator = IdAllocator(capacity=100)
+    #   allocator.mark_used(1)
+    #   allocator.allocate() -> 2
+    #   allocator.release(2)
+    #   allocator.allocate() -> 2
+
+    def __init__(self, capacity=STUDENT_ID_CAPACITY):
+        self.capacity = capacity  # capacity (int): The largest ID that can be handed out.
+        self.used = bytearray(capacity // 8 + 1)  # used (bytearray): Bitmap with bit n set when ID n is in use.
+        self.free_ids = []  # free_ids (list): IDs that were released and can be handed out again.
+        self.next_id = 1  # next_id (int): The lowest ID that has never been handed out.
+        self.used_count = 0  # used_count (int): The number of IDs in use.
+        self.lock = threading.Lock()
+
+    def _is_set(self, id_number):
+        return self.used[id_number >> 3] & (1 << (id_number & 7))
+
+    def _set(self, id_number):
+        self.used[id_number >> 3] |= 1 << (id_number & 7)
+        self.used_count += 1
+
+    def allocate(self):
+        # Hands out an unused ID and marks it as used.
+        # Returns: int or None: The new ID, or None if all IDs up to the capacity are in use.
+        with self.lock:
+            while self.free_ids:
+                id_number = self.free_ids.pop()
+                if not self._is_set(id_number):  # Skip IDs that were marked as used again after being released
+                    self._set(id_number)
+                    return id_number
+            while self.next_id <= self.capacity:
+                id_number = self.next_id
+                self.next_id += 1
+                if not self._is_set(id_number):
+                    self._set(id_number)
+                    return id_number
+            return None
+
+    def mark_used(self, id_number):
+        # Marks an existing ID (e.g. a student loaded from the saved roster) as used, so it is never handed out.
+        # IDs outside 1 to capacity are ignored, as the allocator would never hand them out.
+        with self.lock:
+            if 1 <= id_number <= self.capacity and not self._is_set(id_number):
+                self._set(id_number)
+
+    def release(self, id_number):
+        # Gives an ID back (e.g. when a student is deleted) so it can be handed out again.
+        with self.lock:
+            if 1 <= id_number <= self.capacity and self._is_set(id_number):
+                self.used[id_number >> 3] &= ~(1 << (id_number & 7))
+                self.used_count -= 1
+                self.free_ids.append(id_number)
+
+    def is_used(self, id_number):
+        # Returns: bool: True if the ID is in use.
+        with self.lock:
+            return 1 <= id_number <= self.capacity and bool(self._is_set(id_number))
+
+    def __len__(self):
+        # Returns: int: The number of IDs in use.
+        return self.used_count
@@ -1,7 +1,535 @@
+import json  # Standard library for reading a week's menu and the dish table from their JSON files.
+import os  # Standard library for building the path of each week's file and checking whether it exists.
+from array import array  # Standard library typed array, used to store every meal slot of the year as an unsigned integer.
+from collections.abc import MutableMapping  # Base class that gives the menu and its week and day views the same interface as a dict.
+
+# The fixed shape of the menu: 52 weeks, 7 days and 3 meals, so every meal of the year has its own slot.
+MENU_WEEKS = 52
+MENU_DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+MENU_MEALS = ["Breakfast", "Lunch", "Afternoon Tea"]
+SLOTS_PER_DAY = len(MENU_MEALS)
+SLOTS_PER_WEEK = len(MENU_DAYS) * SLOTS_PER_DAY
+
+DAY_POSITIONS = {day: position for position, day in enumerate(MENU_DAYS)}
+MEAL_POSITIONS = {meal: position for position, meal in enumerate(MENU_MEALS)}
+
+
+def menu_week_path(folder, week):
+    # Returns the path of the file that stores the menu for one week.
+    # Example: menu_week_path("data/kitchen", 3) -> "data/kitchen/week_3.json"
+    return os.path.join(folder, f"week_{week}.json")
+
+
+def menu_week_number(week):
+    # Converts a week key (e.g. 3 or "3") to its number, or None if it is not a week between 1 and 52.
+    try:
+        number = int(week)
+    except (TypeError, ValueError):
+        return None
+    return number if 1 <= number <= MENU_WEEKS else None
+
+
+class CompactMenu(MutableMapping):
+    # The kitchen menu stored as one fixed-size array of dish IDs, with each dish name stored once in a dish table.
+    # Purpose: Replaces the nested week -> day -> meal dictionaries, which repeat the day and meal names for every
+    # week and store a copy of a dish name for every meal it is served at.
+    #   - `slots` holds one unsigned integer per meal of the year (52 weeks x 7 days x 3 meals = 1,092 slots, about 4 KB).
+    #   - `dishes` is the dish table: the dish with ID n is dishes[n], and ID 0 means no dish is set.
+    #     A dish is added to the table the first time it is served and reused afterwards, so "Pizza" is stored once
+    #     however many days it is on the menu. Dishes are never removed from the table, so saved IDs stay valid.
+    #   - `weeks_present` records which weeks have a menu, so a planned week with no dishes set is kept apart from
+    #     a week that was never planned.
+    # Reading kitchen.menu[week] returns a MenuWeekView, and reading a day of it returns a MenuDayView. Both behave like
+    # the dictionaries they replace and read and write the dish IDs directly, so existing code such as
+    # kitchen.menu["1"]["Monday"]["Lunch"] = "Pasta" works unchanged. Every week has all 7 days and every day all 3 meals.
+
+    # Rotating menus: most centres repeat a 4 or 6 week menu, so a range of weeks can follow a rotation (see set_rotation).
+    #   - `cycle` holds the dish IDs of the rotation's weeks once, and `cycle_weeks` records which rotation week each
+    #     week follows. A week following the rotation reads its dishes from `cycle` rather than from `slots`.
+    #   - The first weeks of the range are the rotation's template: editing them edits the rotation, so every week
+    #     following the same rotation week changes too.
+    #   - Editing a day of any other following week is copy-on-write: the day's dishes are copied from the rotation
+    #     into `slots`, marked in `own_days`, and only then changed, so the other weeks are unaffected.
+    # Only the template and the days that differ from it are saved, so file size and save time grow with the number
+    # of distinct days, not with the number of weeks that repeat the rotation.
+
+    # Methods include __init__, intern, dish, dish_id_at, set_dish_id, effective_slots, week_slots, set_week_slots,
+    # saved_week, set_day_overrides, cycle_week, set_rotation, clear_rotation and the dict methods.
+
+    # Example:
+    #   menu = CompactMenu()
+    #   menu["1"] = {"Monday": {"Breakfast": "Pancakes", "Lunch": "Pizza", "Afternoon Tea": None}}
+    #   menu["2"] = {"Friday": {"Lunch": "Pizza"}}
+    #   menu["1"]["Monday"]["Lunch"] -> "Pizza"
+    #   menu.dishes -> [None, "Pancakes", "Pizza"]  # "Pizza" is stored once
+    #   menu.week_slots("1")[:3] -> [1, 2, 0]
+    #   menu.set_rotation(1, 2)  # Weeks 3 to 52 repeat weeks 1 and 2
+    #   menu["5"]["Monday"]["Lunch"] -> "Pizza"
+
+    def __init__(self):
+        self.slots = array('I', [0]) * (MENU_WEEKS * SLOTS_PER_WEEK)  # slots (array): The dish ID of every meal of the year.
+        self.weeks_present = bytearray(MENU_WEEKS + 1)  # weeks_present (bytearray): 1 at each week number that has a menu.
+        self.dishes = [None]  # dishes (list): The dish table, where the dish with ID n is dishes[n].
+        self.dish_ids = {}  # dish_ids (dict): The ID of each dish in the table, keyed by dish name.
+        self.cycle = array('I')  # cycle (array): The dish IDs of each week of the rotation, 21 per week.
+        self.cycle_first_week = 0  # cycle_first_week (int): The first week following the rotation, or 0 without a rotation.
+        self.cycle_length = 0  # cycle_length (int): The number of weeks in the rotation.
+        self.cycle_last_week = 0  # cycle_last_week (int): The last week following the rotation.
+        self.cycle_weeks = bytearray(MENU_WEEKS + 1)  # cycle_weeks (bytearray): The rotation week (from 1) each week follows, or 0.
+        self.own_days = bytearray(MENU_WEEKS * len(MENU_DAYS))  # own_days (bytearray): 1 for each day of a following week with its own dishes.
+        self.rotation_changed = False  # rotation_changed (bool): Whether the rotation changed since it was last saved.
+
+    def intern(self, dish):
+        # Returns: int: The ID of the dish, adding it to the dish table if it is new. Empty dishes and None have ID 0.
+        if not dish:
+            return 0
+        dish_id = self.dish_ids.get(dish)
+        if dish_id is None:
+            dish_id = len(self.dishes)
+            self.dishes.append(dish)
+            self.dish_ids[dish] = dish_id
+        return dish_id
+
+    def dish(self, dish_id):
+        # Returns: str or None: The dish with this ID, or None for ID 0 or an ID missing from the dish table.
+        return self.dishes[dish_id] if dish_id < len(self.dishes) else None
+
+    @staticmethod
+    def slot(week_number, day, meal):
+        # Returns: int: The position of a meal in `slots`. Raises KeyError for an unknown day or meal.
+        return (week_number - 1) * SLOTS_PER_WEEK + DAY_POSITIONS[day] * SLOTS_PER_DAY + MEAL_POSITIONS[meal]
+
+    def _week_number(self, week):
+        number = menu_week_number(week)
+        if number is None:
+            raise KeyError(week)
+        return number
+
+    def _is_template_week(self, number):
+        return self.cycle_length and self.cycle_first_week <= number < self.cycle_first_week + self.cycle_length
+
+    def cycle_week(self, week):
+        # Returns: int: The rotation week (from 1) that a week follows, or 0 if it has its own menu.
+        number = menu_week_number(week)
+        return self.cycle_weeks[number] if number is not None else 0
+
+    def dish_id_at(self, slot):
+        # Returns: int: The dish ID served at a slot, read from the rotation unless the week or day has its own dishes.
+        week_index, week_slot = divmod(slot, SLOTS_PER_WEEK)
+        cycle_week = self.cycle_weeks[week_index + 1]
+        if cycle_week and not self.own_days[slot // SLOTS_PER_DAY]:
+            return self.cycle[(cycle_week - 1) * SLOTS_PER_WEEK + week_slot]
+        return self.slots[slot]
+
+    def set_dish_id(self, slot, dish_id):
+        # Sets the dish ID served at a slot. In a template week this changes the rotation; in another week following
+        # the rotation, the day is first given its own copy of the rotation's dishes (copy-on-write).
+        week_index, week_slot = divmod(slot, SLOTS_PER_WEEK)
+        cycle_week = self.cycle_weeks[week_index + 1]
+        day_index = slot // SLOTS_PER_DAY
+        if cycle_week and not self.own_days[day_index]:
+            cycle_slot = (cycle_week - 1) * SLOTS_PER_WEEK + week_slot
+            if self._is_template_week(week_index + 1):
+                self.cycle[cycle_slot] = dish_id
+                self.rotation_changed = True
+                return
+            day_start = day_index * SLOTS_PER_DAY
+            cycle_day_start = cycle_slot - cycle_slot % SLOTS_PER_DAY
+            self.slots[day_start:day_start + SLOTS_PER_DAY] = self.cycle[cycle_day_start:cycle_day_start + SLOTS_PER_DAY]
+            self.own_days[day_index] = 1
+        self.slots[slot] = dish_id
+
+    def effective_slots(self):
+        # Returns: array: The dish ID served at every slot of the year, with the rotation filled in.
+        slots = array('I', self.slots)
+        for number in range(1, MENU_WEEKS + 1):
+            cycle_week = self.cycle_weeks[number]
+            if not cycle_week:
+                continue
+            for day_index in range((number - 1) * len(MENU_DAYS), number * len(MENU_DAYS)):
+                if not self.own_days[day_index]:
+                    start = day_index * SLOTS_PER_DAY
+                    cycle_start = (cycle_week - 1) * SLOTS_PER_WEEK + start % SLOTS_PER_WEEK
+                    slots[start:start + SLOTS_PER_DAY] = self.cycle[cycle_start:cycle_start + SLOTS_PER_DAY]
+        return slots
+
+    def weeks_repeating_day(self, week, day):
+        # Returns: list of str: The weeks serving the same dishes as this day of the week because they repeat it from the
+        # rotation, including the week itself, e.g. ["1", "3"] for Monday of Week 1 in a 2 week rotation through Week 4.
+        # Only a day of the rotation's first weeks is repeated; for any other week the list is just that week.
+        number = self._week_number(week)
+        if not self._is_template_week(number):
+            return [str(number)]
+        cycle_week, day_position = self.cycle_weeks[number], DAY_POSITIONS[day]
+        return [
+            str(repeating_week) for repeating_week in range(self.cycle_first_week, self.cycle_last_week + 1)
+            if self.cycle_weeks[repeating_week] == cycle_week
+            and not self.own_days[(repeating_week - 1) * len(MENU_DAYS) + day_position]
+        ]
+
+    def week_slots(self, week):
+        # Returns: list: The 21 dish IDs served in a week (Monday's breakfast, lunch and afternoon tea first).
+        start = (self._week_number(week) - 1) * SLOTS_PER_WEEK
+        return [self.dish_id_at(slot) for slot in range(start, start + SLOTS_PER_WEEK)]
+
+    def set_week_slots(self, week, dish_ids):
+        # Sets a week from its 21 dish IDs, as read from its file, and marks the week as having its own menu.
+        number = self._week_number(week)
+        start = (number - 1) * SLOTS_PER_WEEK
+        self.slots[start:start + SLOTS_PER_WEEK] = array('I', dish_ids)
+        self.cycle_weeks[number] = 0
+        self.own_days[(number - 1) * len(MENU_DAYS):number * len(MENU_DAYS)] = bytes(len(MENU_DAYS))
+        self.weeks_present[number] = 1
+
+    def saved_week(self, week):
+        # Returns what is saved in a week's file:
+        #   - list: The week's 21 dish IDs, for a week with its own menu.
+        #   - dict: The 3 dish IDs of each day with its own dishes, for a week following the rotation, e.g. {"Monday": [4, 2, 0]}.
+        #   - None: Nothing, for a template week (saved with the rotation) or a following week with no days of its own.
+        number = self._week_number(week)
+        if not self.cycle_weeks[number]:
+            return self.week_slots(number)
+        overrides = {}
+        for day_position, day in enumerate(MENU_DAYS):
+            day_index = (number - 1) * len(MENU_DAYS) + day_position
+            if self.own_days[day_index]:
+                overrides[day] = self.slots[day_index * SLOTS_PER_DAY:(day_index + 1) * SLOTS_PER_DAY].tolist()
+        return overrides or None
+
+    def set_day_overrides(self, week, overrides):
+        # Sets the days of a week following the rotation that have their own dishes, as read from its file.
+        number = self._week_number(week)
+        for day, dish_ids in overrides.items():
+            day_index = (number - 1) * len(MENU_DAYS) + DAY_POSITIONS[day]
+            self.slots[day_index * SLOTS_PER_DAY:(day_index + 1) * SLOTS_PER_DAY] = array('I', dish_ids)
+            self.own_days[day_index] = 1
+
+    def set_rotation(self, first_week, length, last_week=MENU_WEEKS):
+        # Makes weeks first_week to last_week repeat the `length` weeks starting at first_week.
+        # Arguments:
+        #   first_week (int): The first week of the rotation's template, e.g. 1.
+        #   length (int): The number of weeks in the rotation, e.g. 4.
+        #   last_week (int, optional): The last week to repeat the rotation through. Default is 52.
+        # Days of the repeating weeks that already had dishes different from the rotation keep them as their own.
+        # Weeks that followed an earlier rotation outside the new range keep their dishes as their own menu.
+        # Raises: ValueError: If the weeks do not fit between 1 and 52.
+        if length < 1 or first_week < 1 or last_week > MENU_WEEKS or first_week + length - 1 > last_week:
+            raise ValueError(f"A {length} week rotation starting at week {first_week} does not fit before week {last_week}.")
+        slots = self.effective_slots()
+        cycle_start = (first_week - 1) * SLOTS_PER_WEEK
+        self.cycle = slots[cycle_start:cycle_start + length * SLOTS_PER_WEEK]
+        self.slots = slots
+        self.cycle_weeks = bytearray(MENU_WEEKS + 1)
+        self.own_days = bytearray(MENU_WEEKS * len(MENU_DAYS))
+        self.cycle_first_week, self.cycle_length, self.cycle_last_week = first_week, length, last_week
+
+        for number in range(first_week, last_week + 1):
+            cycle_week = (number - first_week) % length + 1
+            self.cycle_weeks[number] = cycle_week
+            if self._is_template_week(number) or not self.weeks_present[number]:
+                self.weeks_present[number] = 1
+                continue
+            for day_position in range(len(MENU_DAYS)):
+                day_index = (number - 1) * len(MENU_DAYS) + day_position
+                start = day_index * SLOTS_PER_DAY
+                cycle_day_start = (cycle_week - 1) * SLOTS_PER_WEEK + day_position * SLOTS_PER_DAY
+                day_dishes = slots[start:start + SLOTS_PER_DAY]
+                if any(day_dishes) and day_dishes != self.cycle[cycle_day_start:cycle_day_start + SLOTS_PER_DAY]:
+                    self.own_days[day_index] = 1
+        self.rotation_changed = True
+
+    def clear_rotation(self):
+        # Stops repeating the rotation. Every week that followed it keeps its current dishes as its own menu.
+        self.slots = self.effective_slots()
+        self.cycle = array('I')
+        self.cycle_weeks = bytearray(MENU_WEEKS + 1)
+        self.own_days = bytearray(MENU_WEEKS * len(MENU_DAYS))
+        self.cycle_first_week = self.cycle_length = self.cycle_last_week = 0
+        self.rotation_changed = True
+
+    def _clear_week(self, number):
+        # Removes every dish from a week. A template week clears its rotation week; any other week stops following the rotation.
+        start = (number - 1) * SLOTS_PER_WEEK
+        if self._is_template_week(number):
+            cycle_start = (self.cycle_weeks[number] - 1) * SLOTS_PER_WEEK
+            self.cycle[cycle_start:cycle_start + SLOTS_PER_WEEK] = array('I', [0]) * SLOTS_PER_WEEK
+            self.rotation_changed = True
+        else:
+            self.cycle_weeks[number] = 0
+        self.slots[start:start + SLOTS_PER_WEEK] = array('I', [0]) * SLOTS_PER_WEEK
+        self.own_days[(number - 1) * len(MENU_DAYS):number * len(MENU_DAYS)] = bytes(len(MENU_DAYS))
+
+    def __getitem__(self, week):
+        number = menu_week_number(week)
+        if number is None or not self.weeks_present[number]:
+            raise KeyError(week)
+        return MenuWeekView(self, number)
+
+    def __setitem__(self, week, days):
+        # Replaces a week with the days and meals in `days` (e.g. a dict, or a week of another menu).
+        # Days and meals missing from `days` have no dish set, so menu["1"] = {} adds an empty week.
+        number = self._week_number(week)
+        days = {day: dict(meals) for day, meals in days.items()}  # Copied first, in case `days` is a view of this week
+        self._clear_week(number)
+        self.weeks_present[number] = 1
+        week_view = MenuWeekView(self, number)
+        for day, meals in days.items():
+            week_view[day] = meals
+
+    def __delitem__(self, week):
+        number = menu_week_number(week)
+        if number is None or not self.weeks_present[number]:
+            raise KeyError(week)
+        self._clear_week(number)
+        self.weeks_present[number] = 0
+
+    def __contains__(self, week):
+        number = menu_week_number(week)
+        return number is not None and bool(self.weeks_present[number])
+
+    def __iter__(self):
+        # Iterates over every week with a menu, as week number strings in week order.
+        return (str(number) for number in range(1, MENU_WEEKS + 1) if self.weeks_present[number])
+
+    def __len__(self):
+        return sum(self.weeks_present)
+
+    def __repr__(self):
+        return repr({week: dict(days.items()) for week, days in self.items()})
+
+
+class MenuWeekView(MutableMapping):
+    # A dict-like view of one week of a CompactMenu, keyed by day name ("Monday" to "Sunday").
+    # Reading a day returns a MenuDayView, and setting a day to a dict of meals writes its dishes into the menu's slots.
+
+    # Example:
+    #   week = kitchen.menu["1"]
+    #   week["Monday"] = {"Breakfast": "Pancakes", "Lunch": "Pizza", "Afternoon Tea": "Popcorn"}
+    #   dict(week["Monday"]) -> {"Breakfast": "Pancakes", "Lunch": "Pizza", "Afternoon Tea": "Popcorn"}
+
+    def __init__(self, menu, week_number):
+        self.menu = menu  # menu (CompactMenu): The menu holding the week's slots.
+        self.week_number = week_number  # week_number (int): The week, from 1 to 52.
+
+    def __getitem__(self, day):
+        if day not in DAY_POSITIONS:
+            raise KeyError(day)
+        return MenuDayView(self.menu, self.week_number, day)
+
+    def __setitem__(self, day, meals):
+        # Meals missing from `meals` have no dish set.
+        day_view = self[day]
+        for meal in MENU_MEALS:
+            day_view[meal] = meals.get(meal)
+
+    def __delitem__(self, day):
+        # A week always has every day, so deleting a day clears its meals.
+        self[day].clear()
+
+    def clear(self):
+        for day in MENU_DAYS:
+            self[day].clear()
+
+    def __contains__(self, day):
+        return day in DAY_POSITIONS
+
+    def __iter__(self):
+        return iter(MENU_DAYS)
+
+    def __len__(self):
+        return len(MENU_DAYS)
+
+    def __repr__(self):
+        return repr({day: dict(meals) for day, meals in self.items()})
+
+
+class MenuDayView(MutableMapping):
+    # A dict-like view of the meals of one day of a CompactMenu, keyed by meal ("Breakfast", "Lunch", "Afternoon Tea").
+    # Reading a meal looks its dish up in the dish table, and setting a meal stores the dish's ID in the menu
+    # (see CompactMenu.set_dish_id for weeks following a rotation).
+
+    # Example:
+    #   kitchen.menu["1"]["Monday"]["Lunch"] = "Pizza"
+    #   kitchen.menu["1"]["Monday"]["Lunch"] -> "Pizza"
+
+    def __init__(self, menu, week_number, day):
+        self.menu = menu  # menu (CompactMenu): The menu holding the day's slots.
+        self.week_number = week_number  # week_number (int): The week, from 1 to 52.
+        self.day = day  # day (str): The day name, e.g. "Monday".
+
+    def __getitem__(self, meal):
+        if meal not in MEAL_POSITIONS:
+            raise KeyError(meal)
+        return self.menu.dish(self.menu.dish_id_at(self.menu.slot(self.week_number, self.day, meal)))
+
+    def __setitem__(self, meal, dish):
+        if meal not in MEAL_POSITIONS:
+            raise KeyError(meal)
+        self.menu.set_dish_id(self.menu.slot(self.week_number, self.day, meal), self.menu.intern(dish))
+
+    def __delitem__(self, meal):
+        # A day always has every meal, so deleting a meal clears its dish.
+        self[meal] = None
+
+    def clear(self):
+        for meal in MENU_MEALS:
+            self[meal] = None
+
+    def __contains__(self, meal):
+        return meal in MEAL_POSITIONS
+
+    def __iter__(self):
+        return iter(MENU_MEALS)
+
+    def __len__(self):
+        return len(MENU_MEALS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class WeekMenuFiles(CompactMenu):
+    # A CompactMenu stored as one small JSON file per week (e.g. data/kitchen/week_1.json), plus one shared dish table
+    # (data/kitchen_dishes.json) and the rotation, if the menu repeats one (data/kitchen_rotation.json).
+    # Purpose: Lets Kitchen.menu load a week only the first time it is accessed, so startup does not read every planned week.
+    # Each week's file holds just its 21 dish IDs (e.g. [1,2,3,0,...]), which the dish table turns back into dish names.
+    # A week following the rotation only has a file if some of its days differ from the rotation, holding just those
+    # days (e.g. {"Monday": [4,2,0]}); the rotation's template weeks are saved in the rotation file.
+    # Week files saved before the menu was made compact (nested week -> day -> meal dicts) are still read, and are
+    # written in the compact form the next time the week is saved.
+    # Weeks read or set are kept in memory, and save_menu writes back only the weeks in Kitchen.changed_weeks.
+    # Deleted weeks are remembered until the next save, which removes their files, so they are not read back in the meantime.
+
+    # Example:
+    #   kitchen.menu = WeekMenuFiles("data/kitchen", "data/kitchen_dishes.json", "data/kitchen_rotation.json")
+    #   "1" in kitchen.menu -> True if data/kitchen/week_1.json exists or week 1 follows the rotation (no week file is read)
+    #   kitchen.menu["1"]["Monday"]["Lunch"] -> Reads week_1.json on first access, then uses the week in memory
+
+    def __init__(self, folder, dishes_path, rotation_path=None):
+        super().__init__()
+        self.folder = folder  # folder (str): The folder holding one file per week.
+        self.dishes_path = dishes_path  # dishes_path (str): The file holding the dish table shared by every week.
+        self.rotation_path = rotation_path  # rotation_path (str): The file holding the rotation, or None to not save one.
+        self.loaded_weeks = {}  # loaded_weeks (dict): Weeks read from disk or set since loading, keyed by week number string.
+        self.deleted_weeks = set()  # deleted_weeks (set): Weeks deleted since the last save, whose files save_menu removes.
+        try:
+            with open(dishes_path, 'r') as file:
+                for dish in json.load(file)[1:]:
+                    self.dish_ids[dish] = len(self.dishes)
+                    self.dishes.append(dish)
+        except FileNotFoundError:
+            pass
+        self.saved_dish_count = len(self.dishes)  # saved_dish_count (int): How many dishes of the table are saved.
+
+        rotation = None
+        if rotation_path is not None:
+            try:
+                with open(rotation_path, 'r') as file:
+                    rotation = json.load(file)
+            except FileNotFoundError:
+                pass
+        if rotation:
+            self.cycle = array('I', rotation["cycle"])
+            self.cycle_first_week, self.cycle_length, self.cycle_last_week = rotation["first_week"], rotation["length"], rotation["last_week"]
+            for number in range(self.cycle_first_week, self.cycle_last_week + 1):
+                self.cycle_weeks[number] = (number - self.cycle_first_week) % self.cycle_length + 1
+                self.weeks_present[number] = 1
+
+    def rotation_record(self):
+        # Returns: dict or None: The rotation as saved to its file, or None if the menu does not repeat a rotation.
+        if not self.cycle_length:
+            return None
+        return {"first_week": self.cycle_first_week, "length": self.cycle_length, "last_week": self.cycle_last_week, "cycle": self.cycle.tolist()}
+
+    def _load_week(self, week):
+        # Reads a week's file into the menu the first time the week is accessed.
+        week = str(week)
+        number = menu_week_number(week)
+        if week in self.loaded_weeks or week in self.deleted_weeks or number is None:
+            return
+        try:
+            with open(menu_week_path(self.folder, week), 'r') as file:
+                saved_week = json.load(file)
+        except FileNotFoundError:
+            if self.weeks_present[number]:
+                self.loaded_weeks[week] = True  # A week following the rotation with no days of its own
+            return
+        if isinstance(saved_week, list):
+            self.set_week_slots(week, saved_week)
+        elif self.cycle_weeks[number] and all(isinstance(dish_ids, list) for dish_ids in saved_week.values()):
+            self.set_day_overrides(week, saved_week)
+        else:
+            super().__setitem__(week, saved_week)  # A week saved before the menu was made compact
+        self.loaded_weeks[week] = True
+
+    def _load_all_weeks(self):
+        for week in list(self):
+            self._load_week(week)
+
+    def week_slots(self, week):
+        self._load_week(week)
+        return super().week_slots(week)
+
+    def saved_week(self, week):
+        self._load_week(week)
+        return super().saved_week(week)
+
+    def set_rotation(self, first_week, length, last_week=MENU_WEEKS):
+        # Every week is read first, so the rotation is built from (and compared with) the dishes saved in the week files.
+        self._load_all_weeks()
+        super().set_rotation(first_week, length, last_week)
+        self.loaded_weeks.update(dict.fromkeys(CompactMenu.__iter__(self), True))
+
+    def clear_rotation(self):
+        self._load_all_weeks()
+        super().clear_rotation()
+        self.loaded_weeks.update(dict.fromkeys(CompactMenu.__iter__(self), True))
+
+    def __getitem__(self, week):
+        self._load_week(week)
+        return super().__getitem__(week)
+
+    def __setitem__(self, week, days):
+        super().__setitem__(week, days)
+        self.loaded_weeks[str(week)] = True
+
+    def __delitem__(self, week):
+        # Drops the week from memory and remembers it, so its file is ignored until save_menu removes it.
+        self._load_week(week)
+        super().__delitem__(week)
+        self.loaded_weeks.pop(str(week), None)
+        self.deleted_weeks.add(str(week))
+
+    def __contains__(self, week):
+        # Checks whether a week has a menu without reading its file.
+        week = str(week)
+        if week in self.loaded_weeks or super().__contains__(week):
+            return True
+        if week in self.deleted_weeks:
+            return False
+        return menu_week_number(week) is not None and os.path.exists(menu_week_path(self.folder, week))
+
+    def __iter__(self):
+        # Iterates over every week with a menu, in week order. Only file names are listed; weeks are read when accessed.
+        weeks = set(self.loaded_weeks)
+        weeks.update(super().__iter__())
+        if os.path.isdir(self.folder):
+            for file_name in os.listdir(self.folder):
+                if file_name.startswith("week_") and file_name.endswith(".json"):
+                    week = file_name[len("week_"):-len(".json")]
+                    if menu_week_number(week) is not None and week not in self.deleted_weeks:
+                        weeks.add(week)
+        return iter(sorted(weeks, key=int))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
 class Kitchen:
     # Represents a kitchen responsible for managing menus for different days and weeks.
     # This class provides methods to add, update, list, and delete menus for specific days and weeks.
-    # It uses a nested dictionary structure to organize menu items for breakfast, lunch, and afternoon tea.
+    # The menu is a CompactMenu (see above), which behaves like a nested dictionary of weeks, days and meals
+    # for breakfast, lunch, and afternoon tea.
     # It includes the following methods __init__, add_menu, list_menu, and delete_menu
 
     def __init__(self):
@@ -18,7 +546,28 @@ class Kitchen:
         #         }
         #     }
         # }
-        self.menu = {}
+        # The menu is stored as a CompactMenu, which offers this structure as views over a fixed array of dish IDs.
+        # Once load_menu runs, menu is a WeekMenuFiles, a CompactMenu that reads each week from its file on first access.
+        self.menu = CompactMenu()
+
+        # Dirty set of the weeks changed since the menu was last saved or loaded.
+        # Purpose: Lets save_menu skip saving when nothing changed and write only the changed weeks.
+        self.changed_weeks = set()
+
+        # The allergens in each dish, keyed by dish name, e.g. {"Peanut Butter Toast": ["Peanut", "Wheat"]}.
+        # Purpose: Lets the exposure checker (see classes/exposure_checker.py) find meals that students are allergic to.
+        # dish_allergens_changed records whether they changed since they were last saved or loaded.
+        self.dish_allergens = {}
+        self.dish_allergens_changed = False
+
+    def mark_week_changed(self, week):
+        # Records that the menu for a week was added, updated or deleted since the last save.
+        # Arguments: week (int or str): The week number.
+
+        # Example:
+        #   kitchen.mark_week_changed(1)
+        #   print(kitchen.changed_weeks) -> {"1"}
+        self.changed_weeks.add(str(week))
 
     def add_menu(self, week, day, breakfast, lunch, afternoon_tea): 
         # Adds or updates the menu for a specific day and week.
@@ -34,22 +583,15 @@ class Kitchen:
         #   kitchen.add_menu(1, "Monday", "Pancakes", "Spaghetti", "Fruit Salad")
         #   Adds a menu for Week 1, Monday with the given meals.
 
-        # This if statement below ensures the week exists in the menu dictionary.
+        # This if statement below ensures the week exists in the menu, with no dishes set for any day.
         if week not in self.menu:
-            self.menu[week] = {
-                "Monday": {"Breakfast": None, "Lunch": None, "Afternoon Tea": None},
-                "Tuesday": {"Breakfast": None, "Lunch": None, "Afternoon Tea": None},
-                "Wednesday": {"Breakfast": None, "Lunch": None, "Afternoon Tea": None},
-                "Thursday": {"Breakfast": None, "Lunch": None, "Afternoon Tea": None},
-                "Friday": {"Breakfast": None, "Lunch": None, "Afternoon Tea": None},
-                "Saturday": {"Breakfast": None, "Lunch": None, "Afternoon Tea": None},
-                "Sunday": {"Breakfast": None, "Lunch": None, "Afternoon Tea": None}
-            }
+            self.menu[week] = {}
 
         # Set/update the dish for each meal (breakfast, lunch, and afternoon tea)
         self.menu[week][day]["Breakfast"] = breakfast
         self.menu[week][day]["Lunch"] = lunch
         self.menu[week][day]["Afternoon Tea"] = afternoon_tea
+        self.mark_week_changed(week)
 
         print(f"Menu for {day} in Week {week} has been updated.\n")
 
@@ -87,6 +629,7 @@ class Kitchen:
         #   Removes the menu for Monday in Week 1, resetting all meals to None
         if week in self.menu and day in self.menu[week]:
             self.menu[week][day] = {"Breakfast": None, "Lunch": None, "Afternoon Tea": None}
+            self.mark_week_changed(week)
             print(f"Menu for {day} in Week {week} has been deleted.")
         else:
             print(f"Invalid day or week: {day} in Week {week}. Please enter a valid day and week.")
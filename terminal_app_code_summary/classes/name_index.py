@@ -0,0 +1,92 @@
+from bisect import bisect_left  # Standard library binary search, used to find the first name starting with a prefix.
+
+
+def normalize_name(name):
+    # Lower-cases the search text and collapses repeated spaces, so searches ignore case and spacing.
+    # Example: normalize_name("  Bukayo   SAKA ") -> "bukayo saka"
+    return " ".join(name.lower().split())
+
+
+class NameIndex:
+    # Prefix index over the names of students and their parents/guardians.
+    # Purpose: Staff can find a student by typing the start of the student's or guardian's first name, last name or
+    # full name, instead of listing the whole roster to find a student ID.
+    # The index is a sorted list of (name, student ID) entries, six per student (the student's and the guardian's first,
+    # last and full names). A search is a binary search for the first entry starting with the typed text, followed by
+    # reading entries until they stop matching, so it takes well under a millisecond even for 100,000 students.
+    # New students are collected in `pending` and merged into the sorted list with one sort before the next search,
+    # so loading or importing a large roster does not insert names one at a time.
+
+    # Methods include __init__, add, remove and search.
+
+    # Example:
+    #   name_index.add(student)  # Bukayo Saka, guardian Mary Saka
+    #   name_index.search("sak") -> [student]
+    #   name_index.search("mary s") -> [student]
+
+    def __init__(self):
+        self.entries = []  # entries (list): Sorted (normalized name, student ID) tuples.
+        self.pending = []  # pending (list): Entries added since the last search, not yet merged into `entries`.
+        self.students = {}  # students (dict): Each indexed Student, keyed by student ID.
+        self.names = {}  # names (dict): The entries added for each student, keyed by student ID, so they can be removed.
+
+    @staticmethod
+    def names_for(student):
+        # Returns: list: The lower-case first, last and full names of the student and their guardian.
+        names = []
+        for person in (student, student.guardian):
+            if person is not None and person.fname and person.lname:
+                fname, lname = person.fname.lower(), person.lname.lower()
+                names += [fname, lname, f"{fname} {lname}"]
+        return names
+
+    def add(self, student):
+        # Adds the student's and guardian's names to the index. Adding a student again replaces their previous names.
+        self.remove(student)
+        student_id = student.student_id
+        names = [(name, student_id) for name in self.names_for(student)]
+        self.students[student.student_id] = student
+        self.names[student.student_id] = names
+        self.pending.extend(names)
+
+    def _merge_pending(self):
+        # Merges the entries added since the last search into the sorted list.
+        if self.pending:
+            self.entries.extend(self.pending)
+            self.entries.sort()  # Sorting an already sorted list with a few new entries appended takes close to linear time
+            self.pending = []
+
+    def remove(self, student):
+        # Removes the student's and guardian's names from the index, e.g. when the student is deleted.
+        if self.students.get(student.student_id) is not student:
+            return
+        self._merge_pending()
+        for entry in self.names.pop(student.student_id):
+            position = bisect_left(self.entries, entry)
+            if position < len(self.entries) and self.entries[position] == entry:
+                del self.entries[position]
+        del self.students[student.student_id]
+
+    def search(self, text, limit=20):
+        # Finds the students whose own or guardian's first, last or full name starts with the text.
+        # Arguments:
+        #   text (str): The start of a name, in any case.
+        #   limit (int, optional): The most students to return. Default is 20.
+        # Returns: list: The matching students, ordered by the name that matched, without duplicates.
+        prefix = normalize_name(text)
+        if not prefix:
+            return []
+        self._merge_pending()
+        matches = {}
+        position = bisect_left(self.entries, (prefix,))
+        while position < len(self.entries) and len(matches) < limit:
+            name, student_id = self.entries[position]
+            if not name.startswith(prefix):
+                break
+            matches.setdefault(student_id, self.students[student_id])
+            position += 1
+        return list(matches.values())
+
+
+# Global name index - students are added when they are enrolled, imported or loaded, and removed when they are deleted.
+name_index = NameIndex()
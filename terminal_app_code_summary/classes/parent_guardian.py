@@ -4,7 +4,12 @@ class ParentGuardian(Person):
     # Represents a parent or guardian associated with a student. Like the Student class, it inherits from the Person class.
     # This class extends the Person class to include additional attributes and methods specific to guardians, such as contact number and email address.
     # Methods include __init__, get_guardian_fname, get_guardian_lname, get_guardian_contact_number, and get_guardian_contact_email.
-    def __init__(self, fname, lname, contact_number, contact_email):
+
+    # Attributes added to those of Person, stored in slots rather than a per-instance __dict__ (see Person.__slots__).
+    # Guardians only carry their contact details, not the birthday and allergies that only students need.
+    __slots__ = ("contact_number", "contact_email", "guardian_id")
+
+    def __init__(self, fname, lname, contact_number, contact_email, guardian_id=None):
         # Initializes a ParentGuardian instance by extending the attributes of the Person class.
         # Purpose: Sets up a parent or guardian with their name, contact number, and email address.
         # Arguments:
@@ -12,8 +17,9 @@ class ParentGuardian(Person):
         #   lname (str): The last name of the guardian.
         #   contact_number (str): The contact phone number of the guardian.
         #   contact_email (str): The email address of the guardian.
+        #   guardian_id (int, optional): The guardian's ID in the guardians table. Assigned by guardian_registry if None.
         # Attributes:
-        #   fname, lname (inherited from Person), contact_number, contact_email.
+        #   fname, lname (inherited from Person), contact_number, contact_email, guardian_id.
         
         # Example Usage:
         #   guardian = ParentGuardian("Jude", "Bellingham", "1234567890", "judebellingham@coderacademy.edu.au")
@@ -21,6 +27,7 @@ class ParentGuardian(Person):
         super().__init__(fname, lname) # Call the parent class constructor to initialize shared attributes.
         self.contact_number = contact_number
         self.contact_email = contact_email
+        self.guardian_id = guardian_id
 
 # Getter methods for guardian details
     def get_guardian_fname(self):
@@ -57,4 +64,53 @@ class ParentGuardian(Person):
         # Example:
         #   guardian = ParentGuardian("Jude", "Bellingham", "1234567890", "judebellingham@coderacademy.edu.au")
         #   print(guardian.get_guardian_contact_email()) -> "judebellingham@coderacademy.edu.au"
-        return self.contact_email
\ No newline at end of file
+        return self.contact_email
+
+
+class GuardianRegistry:
+    # Keeps one ParentGuardian instance per guardian, so siblings share the same guardian in memory and in the saved files.
+    # Guardians are found by their details (name, contact number and email) or by their guardian ID.
+    # Methods include __init__, add, get_or_add and get.
+
+    def __init__(self):
+        self.by_id = {}  # by_id (dict): ParentGuardian instances keyed by guardian ID.
+        self.by_details = {}  # by_details (dict): ParentGuardian instances keyed by their details.
+        self.last_guardian_id = 0  # last_guardian_id (int): The highest guardian ID handed out or loaded so far.
+
+    @staticmethod
+    def details_key(fname, lname, contact_number, contact_email):
+        # Names and emails are compared without case, so "mary@example.com" and "Mary@Example.com" are the same guardian.
+        return ((fname or "").lower(), (lname or "").lower(), contact_number, (contact_email or "").lower())
+
+    def add(self, guardian):
+        # Registers a guardian, giving them the next guardian ID if they do not have one yet.
+        # Returns: ParentGuardian: The registered guardian.
+        if guardian.guardian_id is None:
+            self.last_guardian_id += 1
+            guardian.guardian_id = self.last_guardian_id
+        else:
+            self.last_guardian_id = max(self.last_guardian_id, guardian.guardian_id)
+        self.by_id[guardian.guardian_id] = guardian
+        self.by_details[self.details_key(guardian.fname, guardian.lname, guardian.contact_number, guardian.contact_email)] = guardian
+        return guardian
+
+    def get_or_add(self, fname, lname, contact_number, contact_email):
+        # Returns the existing guardian with these details (e.g. a sibling's parent), or registers a new one.
+
+        # Example:
+        #   first = guardian_registry.get_or_add("Mary", "Lamb", "0406346693", "mary@example.com")
+        #   second = guardian_registry.get_or_add("Mary", "Lamb", "0406346693", "mary@example.com")
+        #   print(first is second) -> True
+        guardian = self.by_details.get(self.details_key(fname, lname, contact_number, contact_email))
+        if guardian is None:
+            guardian = self.add(ParentGuardian(fname, lname, contact_number, contact_email))
+        return guardian
+
+    def get(self, guardian_id):
+        # Returns the guardian with this guardian ID, or None if there is none.
+        return self.by_id.get(guardian_id)
+
+
+# Global registry of guardians shared by the whole application.
+guardian_registry = GuardianRegistry()
+
@@ -0,0 +1,36 @@
+class RenderCache:
+    # Keeps the last rendered text of each listing, with the key it was rendered for.
+    # Purpose: Listings such as a classroom's table of students are rendered again only when what they show changed.
+    # The key is built from roster versions (see roster_versions in classes/student_registry.py) and anything else the
+    # text depends on, such as today's date for ages, so a repeated listing of an unchanged roster is served from the
+    # cached string, and enrolling one student only re-renders that student's classroom.
+
+    # Methods include __init__, render and clear.
+
+    # Example:
+    #   render_cache.render(("classroom", "Babies Room (0-2 years)"), (classroom.students.version, today), render_function)
+    #   -> Calls render_function the first time, then returns the same string until the classroom's version or the day changes.
+
+    def __init__(self):
+        self.entries = {}  # entries (dict): (key, text) of each listing, keyed by listing name.
+        self.hits = 0  # hits (int): The number of renders served from the cache.
+        self.misses = 0  # misses (int): The number of renders that called the render function.
+
+    def render(self, name, key, render_function):
+        # Returns: str: The cached text of the listing if it was rendered for the same key, otherwise render_function().
+        entry = self.entries.get(name)
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        text = render_function()
+        self.entries[name] = (key, text)
+        return text
+
+    def clear(self):
+        # Removes every cached listing.
+        self.entries.clear()
+
+
+# Global render cache for the student and allergy listings (see classroom_functions.py and kitchen_functions.py).
+render_cache = RenderCache()
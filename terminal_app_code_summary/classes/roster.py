@@ -0,0 +1,115 @@
+from array import array  # Standard library for compact typed arrays, used to store each roster column.
+from datetime import date  # Standard library used to get today's date as a day ordinal.
+
+# Birthday column entry for a student without a birthday. Day ordinals start at 1, so 0 is never a real birthday.
+NO_BIRTHDAY = 0
+
+class ColumnarRoster:
+    # Mirrors a list of Student objects as parallel typed arrays (columns), one entry per student.
+    # Purpose: Ages, classroom assignment and per-classroom counts are computed for the whole roster in one pass over
+    # plain integers, instead of calling calculate_age and is_valid_for_age on every student and classroom.
+    # Columns:
+    #   student_ids (array of int): Each student's ID.
+    #   birth_ordinals (array of int): Each student's birthday as a day ordinal (see date.toordinal), or NO_BIRTHDAY.
+    #   classroom_indexes (array of int): Each student's position in the classrooms list, or -1 if unassigned.
+    # Students without a birthday have no age and are never assigned a classroom.
+    # Methods include __init__, from_students, append, ages, assign_classrooms, classroom_counts and apply.
+
+    def __init__(self):
+        self.students = []  # students (list): The Student instances, in the same order as the columns.
+        self.student_ids = array('q')
+        self.birth_ordinals = array('l')
+        self.classroom_indexes = array('i')
+
+    @classmethod
+    def from_students(cls, students):
+        # Builds the columns for a list of students, e.g. the global students list in main.py.
+        # Example:
+        #   roster = ColumnarRoster.from_students(students)
+        roster = cls()
+        roster.students = list(students)
+        roster.student_ids = array('q', [student.student_id for student in roster.students])
+        roster.birth_ordinals = array('l', [birthday_column_entry(student) for student in roster.students])
+        roster.classroom_indexes = array('i', [-1]) * len(roster.students)
+        return roster
+
+    def append(self, student):
+        # Adds a student to the end of every column. Their classroom index starts as -1 (unassigned)
+        # until assign_classrooms runs.
+        self.students.append(student)
+        self.student_ids.append(student.student_id)
+        self.birth_ordinals.append(birthday_column_entry(student))
+        self.classroom_indexes.append(-1)
+
+    def __len__(self):
+        return len(self.students)
+
+    def ages(self, today=None):
+        # Computes every student's age in decimal years in one pass over the birthday column.
+        # Arguments: today (int, optional): Today's date as a day ordinal. Defaults to date.today().
+        # Returns: array of float: The ages, matching Student.calculate_age, or NaN for students without a birthday.
+        today = date.today().toordinal() if today is None else today
+        return array('d', [
+            (today - birth_ordinal) / 365.25 if birth_ordinal != NO_BIRTHDAY else float('nan')
+            for birth_ordinal in self.birth_ordinals
+        ])
+
+    @staticmethod
+    def classroom_by_age_in_days(classrooms):
+        # Builds a lookup table from age in days to the index of the first classroom whose is_valid_for_age accepts it
+        # (-1 if none), covering every age up to the oldest classroom's maximum age.
+        # Classroom.is_valid_for_age is called once per day of age rather than once per student.
+        days = int(max((classroom.max_age for classroom in classrooms), default=0) * 365.25) + 2
+        table = array('i', [-1]) * days
+        for age_in_days in range(days):
+            age = age_in_days / 365.25
+            for index, classroom in enumerate(classrooms):
+                if classroom.is_valid_for_age(age):
+                    table[age_in_days] = index
+                    break
+        return table
+
+    def assign_classrooms(self, classrooms, today=None):
+        # Computes every student's classroom in one pass: each age in days is looked up in the table built by
+        # classroom_by_age_in_days, so the result matches assign_student's first valid classroom when capacity limits
+        # are not checked (check_capacity=False, as when loading). Students without a birthday get -1.
+        # Arguments:
+        #   classrooms (list): The Classroom instances, in the order assign_student checks them.
+        #   today (int, optional): Today's date as a day ordinal. Defaults to date.today().
+        # Returns: array of int: The classroom index of each student, or -1 if they fit no classroom.
+        today = date.today().toordinal() if today is None else today
+        table = self.classroom_by_age_in_days(classrooms)
+        days = len(table)
+        self.classroom_indexes = array('i', [
+            table[today - birth_ordinal] if birth_ordinal != NO_BIRTHDAY and 0 <= today - birth_ordinal < days else -1
+            for birth_ordinal in self.birth_ordinals
+        ])
+        return self.classroom_indexes
+
+    def classroom_counts(self, classrooms):
+        # Counts the students assigned to each classroom from the classroom index column.
+        # Returns: list of int: The number of students in each classroom, in the order of the classrooms list.
+        return [self.classroom_indexes.count(index) for index in range(len(classrooms))]
+
+    def apply(self, classrooms):
+        # Rebuilds each Classroom.students list and each student's classroom from the classroom index column,
+        # keeping the roster's order within each classroom. Students who fit no classroom are left unassigned.
+        # Returns: list: The students who fit no classroom.
+        for classroom in classrooms:
+            classroom.students.clear()
+        unassigned = []
+        for student, index in zip(self.students, self.classroom_indexes):
+            if index < 0:
+                student.classroom = None
+                unassigned.append(student)
+            else:
+                classroom = classrooms[index]
+                classroom.students.append(student)
+                student.classroom = classroom
+        return unassigned
+
+
+def birthday_column_entry(student):
+    # Returns: int: The student's birthday as a day ordinal for the birthday column, or NO_BIRTHDAY if they have none.
+    birth_ordinal = student.get_birth_ordinal()
+    return NO_BIRTHDAY if birth_ordinal is None else birth_ordinal
@@ -0,0 +1,129 @@
+import itertools  # Standard library counter, used to give every change to any roster a new version number.
+
+# Roster version counter shared by every StudentRegistry. Each change to a registry takes the next number,
+# so a registry's `version` is different after every change and never equal to another registry's version.
+roster_versions = itertools.count(1)
+
+
+class StudentRegistry(list):
+    # A list of students that also keeps an index from student ID to the student's position in the list.
+    # Purpose: Used for the global students list in main.py and for each Classroom.students list, so finding a student by ID
+    # and finding their position in their classroom take constant time, and removing them needs no scan of the roster.
+    # It behaves like a normal list everywhere else (iteration, len, append, indexing), so existing code keeps working.
+
+    # Removing a student keeps the remaining students in enrolment order, so classroom listings and the saved
+    # students.json keep their order; only the students after the removed one move up and are reindexed.
+
+    # Every change stores a new number from `roster_versions` in `version`, so cached listings of the students
+    # (see classes/render_cache.py) can tell whether the list changed since they were rendered.
+
+    # Methods include get, position, append, remove and the other list methods that change the list.
+
+    # Example:
+    #   students = StudentRegistry()
+    #   students.append(student)          # student.student_id == 42
+    #   students.get(42) -> student
+    #   students.position(42) -> 0
+    #   students.remove(student)          # Found by ID; the students after it keep their order
+
+    def __init__(self, students=()):
+        super().__init__(students)
+        self.positions = {}  # positions (dict): Each student's position in the list, keyed by student ID.
+        self.version = next(roster_versions)  # version (int): The roster version when the list last changed.
+        self._reindex()
+
+    def _changed(self):
+        self.version = next(roster_versions)
+
+    def _reindex(self):
+        # Rebuilds the index after an operation that can move many students (e.g. sort or insert).
+        self.positions = {student.student_id: position for position, student in enumerate(self)}
+
+    def get(self, student_id):
+        # Retrieves the student with this ID, or None if they are not in the list.
+        position = self.positions.get(student_id)
+        return None if position is None else self[position]
+
+    def __contains__(self, student):
+        # Checks whether the student is in the list in constant time, using their ID.
+        position = self.positions.get(getattr(student, "student_id", None))
+        return position is not None and self[position] is student
+
+    def position(self, student_id):
+        # Retrieves the position of the student with this ID in the list, or None if they are not in the list.
+        return self.positions.get(student_id)
+
+    def append(self, student):
+        self.positions[student.student_id] = len(self)
+        super().append(student)
+        self._changed()
+
+    def extend(self, students):
+        for student in students:
+            self.append(student)
+
+    def __iadd__(self, students):
+        self.extend(students)
+        return self
+
+    def remove(self, student):
+        # Removes the student found by ID, then reindexes only the students after them, which each move up one position.
+        position = self.positions.get(student.student_id)
+        if position is None or self[position] is not student:
+            super().remove(student)  # Not indexed by this ID, so fall back to a normal list removal
+            self._changed()
+            self._reindex()
+            return
+        super().__delitem__(position)
+        self._changed()
+        del self.positions[student.student_id]
+        for moved_position in range(position, len(self)):
+            self.positions[self[moved_position].student_id] = moved_position
+
+    def pop(self, index=-1):
+        student = super().pop(index)
+        self._changed()
+        if index in (-1, len(self)):
+            self.positions.pop(student.student_id, None)
+        else:
+            self._reindex()
+        return student
+
+    def clear(self):
+        super().clear()
+        self._changed()
+        self.positions.clear()
+
+    def insert(self, index, student):
+        super().insert(index, student)
+        self._changed()
+        self._reindex()
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            super().__setitem__(index, value)
+            self._changed()
+            self._reindex()
+            return
+        position = index if index >= 0 else len(self) + index
+        replaced_id = self[index].student_id
+        super().__setitem__(index, value)
+        self._changed()
+        if self.positions.get(replaced_id) == position:
+            del self.positions[replaced_id]  # The replaced student is no longer in the list
+        self.positions[value.student_id] = position
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._changed()
+        self._reindex()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._changed()
+        self._reindex()
+
+    def reverse(self):
+        super().reverse()
+        self._changed()
+        self._reindex()
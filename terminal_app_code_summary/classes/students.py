@@ -1,15 +1,39 @@
-import random  # An external library used to generate random numbers for unique student IDs.
+from datetime import date  # Imported to handle date parsing and age calculation.
 
 from classes.person import Person  # Internally importing the Person class for inheritance.
+from classes.id_allocator import IdAllocator  # Internally importing the allocator that hands out unique student IDs.
 
-# Global set to track used student IDs - this ensures that all generated student IDs are unique across the application.
-used_student_ids = set()
+# Global allocator of student IDs - this ensures that all generated student IDs are unique across the application.
+# It is seeded with the IDs of the loaded students by load_students, and deleted students' IDs are released back to it.
+student_ids = IdAllocator()
+
+# Global dirty set of unsaved student changes - maps each changed student ID to its latest (action, student) tuple,
+# where action is "add" or "delete". Students are never edited in place (a classroom move is not saved, as the classroom
+# is recomputed from the birthday on load), so there is no update action. It is filled by add_student and delete_student
+# and drained by save_students, so a save with no changes does no I/O and a save with changes only writes the affected students.
+student_changes = {}
+
+
+def record_student_change(action, student):
+    # Marks a student as changed so only their record is written on the next save.
+    # Arguments:
+    #   action (str): "add" or "delete".
+    #   student (Student): The student that was changed.
+
+    # Example:
+    #   record_student_change("add", student)
+    #   print(student_changes) -> {42: ("add", student)}
+    student_changes[student.student_id] = (action, student)
 
 class Student(Person):
     # Represents a student with attributes such as name, birthday, allergies, student ID, and classroom. Like the ParentGuardian class, it inherits from the Person class.
     # This class extends the Person class to include additional attributes and methods specific to students, 
     # such as student ID generation, classroom assignment, and retrieving guardian information.
-    # Methods include __init__, generate_unique_id, and various getter methods.
+    # Methods include __init__, generate_unique_id, calculate_age, and various getter methods.
+
+    # Attributes added to those of Person, stored in slots rather than a per-instance __dict__ (see Person.__slots__).
+    # The birthday is kept both as the "YYYY-MM-DD" string and as a day ordinal, and the age is cached for the day it was computed.
+    __slots__ = ("_birthday", "_birth_ordinal", "_age_day", "_age", "allergies", "student_id", "classroom", "guardian")
 
     def __init__(self, fname, lname, birthday, allergies=None, student_id=None):
         # Initializes a Student instance by extending the attributes of the Person class.
@@ -27,7 +51,9 @@ class Student(Person):
         #   student = Student("John", "Doe", "2010-05-15", allergies=["Peanuts"])
         #   print(student.student_id) -> A unique ID (e.g., 42).
 
-        super().__init__(fname, lname, birthday, allergies=allergies)
+        super().__init__(fname, lname)
+        self.birthday = birthday
+        self.allergies = allergies if allergies is not None else []
         if student_id is None:
             self.student_id = self.generate_unique_id() # Generate a unique ID if none is provided.
         else:
@@ -37,28 +63,57 @@ class Student(Person):
 
 
     def generate_unique_id(self):
-        # Generates a unique student ID within a specified range.
+        # Generates a unique student ID.
         # Purpose: Ensures that each student has a unique identifier.
-        # Returns: int or None: A unique ID or None if the maximum capacity is reached. i.e. when IDs between 1 and 100 are all in use.
+        # Returns: int or None: A unique ID or None if the maximum capacity is reached. i.e. when IDs between 1 and
+        # STUDENT_ID_CAPACITY (see constants.py) are all in use.
 
         # Example Usage:
         #   student_id = student.generate_unique_id()
         #   print(student_id) -> A unique ID (e.g., 15).
 
         # Implementation Details:
-        #   - IDs are integers between 1 and 100 (adjustable as needed).
-        #   - Tracks used IDs with the global set `used_student_ids`.
-        #   - Check if all IDs in the specified range are used
-
-        if len(used_student_ids) >= 100:  # Adjust this number to match student's max capacity
-            return None
-
-        while True:
-            new_id = random.randint(1, 100)  # Adjusted range for 1-100 to fit 100 unique student ids
-            if new_id not in used_student_ids:  # Check if the ID is unique
-                used_student_ids.add(new_id)    # Add the ID to the set of used IDs
-                return new_id
+        #   - IDs are handed out by the global `student_ids` allocator in constant time, reusing deleted students' IDs first.
+        #   - It is safe to call from several threads at once.
+        return student_ids.allocate()
     
+    # With @property, the birthday is still read and set like an attribute (student.birthday), while setting it
+    # also parses the date once and clears the cached age.
+    @property
+    def birthday(self):
+        # Returns: str: The student's birthday in "YYYY-MM-DD" format (or None if it was cleared).
+        return self._birthday
+
+    @birthday.setter
+    def birthday(self, birthday):
+        # Parses the birthday once into a day ordinal, so calculate_age never parses dates.
+        # Raises ValueError if the birthday is not a valid "YYYY-MM-DD" date.
+        self._birthday = birthday
+        self._birth_ordinal = date.fromisoformat(birthday).toordinal() if birthday else None
+        self._age_day = None  # Invalidate the cached age
+        self._age = None
+
+    def calculate_age(self):
+        # Calculates the student's age in decimal years from their birthday.
+        # Purpose: Used to assign the student to a classroom for their age range and to display their age.
+        # The age is cached together with the day it was computed, so repeated calls on the same day (e.g. loading,
+        # assigning and listing a large roster) only compare two integers. The cache is refreshed when the date changes
+        # and cleared when the birthday is edited.
+        # Returns: float: The age in decimal years (e.g., 2.5 for 2 years and 6 months).
+
+        # Example:
+        #   student = Student("John", "Doe", "2022-04-18")
+        #   print(student.calculate_age()) -> 2.5 (on 2024-10-18)
+        today = date.today().toordinal()
+        if self._age_day != today:
+            age_in_days = today - self._birth_ordinal
+            self._age = age_in_days / 365.25  # Convert days to years, including fractions
+            self._age_day = today
+        return self._age
+
+    def __str__(self):
+        return f"Name: {self.fname} {self.lname}, Birthday: {self.birthday}"
+
     # Getter methods
 
     def get_student_id(self):
@@ -81,6 +136,11 @@ class Student(Person):
         # Returns: str: The student's birthday in "YYYY-MM-DD" format.
         return self.birthday
 
+    def get_birth_ordinal(self):
+        # Retrieves the student's date of birth as a day ordinal (see date.toordinal), parsed when the birthday was set.
+        # Returns: int: e.g. 738521 for "2023-01-01".
+        return self._birth_ordinal
+
     def get_allergies(self):
         # Retrieves the list of the student's allergies.
         # Returns: list: The student's allergies.
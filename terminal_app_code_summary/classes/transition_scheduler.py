@@ -0,0 +1,119 @@
+import heapq  # Standard library min-heap, used to keep the students ordered by the day they next change classroom.
+import math  # Standard library used to round a classroom's maximum age up to a whole number of days.
+from datetime import date  # Standard library used to get today's date as a day ordinal.
+
+from classes.classrooms import ClassroomRegistry  # Internal classroom registry, used to find a classroom with a binary search.
+
+class TransitionScheduler:
+    # Keeps every enrolled student in a min-heap keyed by the day they become too old for their classroom.
+    # Purpose: A student keeps the classroom they were given when they were enrolled or loaded, even after a birthday
+    # takes them past the classroom's maximum age. Instead of recomputing every student's age each day, the scheduler
+    # only looks at the top of the heap: each day tick pops the students who are due and moves just those students
+    # to the classroom for their new age. A tick with nobody due takes constant time.
+
+    # Entries are never removed from the middle of the heap. When a student is deleted or rescheduled, their old entry
+    # is left in place and skipped when it reaches the top, as it no longer matches the `due` dictionary.
+
+    # Methods include __init__, transition_day, schedule, unschedule, next_due and tick.
+
+    # Example:
+    #   transition_scheduler.schedule(student)  # Student born 2023-01-01, in the Toddlers Room (2-3 years)
+    #   transition_scheduler.next_due() -> date(2026, 1, 1).toordinal()
+    #   transition_scheduler.tick(classrooms) -> ([(student, toddlers_room)], [])  # On 2026-01-01, moved to the Kindergarten Room
+
+    def __init__(self):
+        self.heap = []  # heap (list): (transition day ordinal, student ID) entries, smallest day first.
+        self.due = {}  # due (dict): Each scheduled student's (transition day ordinal, Student), keyed by student ID.
+
+    @staticmethod
+    def transition_day(student):
+        # Works out the first day on which the student is too old for their classroom.
+        # Returns: int: The day as a date ordinal, on which Student.calculate_age first reaches the classroom's maximum age.
+        max_age = student.classroom.max_age
+        days = math.ceil(max_age * 365.25)
+        if days / 365.25 < max_age:  # Guard against rounding in max_age * 365.25
+            days += 1
+        return student.get_birth_ordinal() + days
+
+    def schedule(self, student):
+        # Adds the student to the heap, or moves their entry if they were already scheduled (e.g. after changing classroom).
+        # Students without a classroom are not scheduled.
+        if student.classroom is None or student.get_birth_ordinal() is None:
+            self.unschedule(student)
+            return
+        day = self.transition_day(student)
+        self.due[student.student_id] = (day, student)
+        heapq.heappush(self.heap, (day, student.student_id))
+
+    def unschedule(self, student):
+        # Removes the student's schedule, e.g. when they are deleted. Their heap entry is skipped when it reaches the top.
+        scheduled = self.due.get(student.student_id)
+        if scheduled is not None and scheduled[1] is student:
+            del self.due[student.student_id]
+
+    def next_due(self):
+        # Returns: int or None: The day (as a date ordinal) of the next scheduled transition, or None if nobody is scheduled.
+        self._drop_stale_entries()
+        return self.heap[0][0] if self.heap else None
+
+    def _drop_stale_entries(self):
+        # Pops entries at the top of the heap that no longer match the student's current schedule.
+        while self.heap:
+            day, student_id = self.heap[0]
+            scheduled = self.due.get(student_id)
+            if scheduled is not None and scheduled[0] == day:
+                return
+            heapq.heappop(self.heap)
+
+    def tick(self, classrooms, today=None):
+        # Moves every student who is due on or before today to the classroom for their new age.
+        # Arguments:
+        #   classrooms (list): The Classroom instances, checked in order (a ClassroomRegistry uses its binary search).
+        #   today (int, optional): Today's date as a day ordinal. Defaults to date.today().
+        # Returns:
+        #   tuple: (moved, aged_out), where moved is a list of (student, previous classroom) tuples for the students who
+        #   changed classroom, and aged_out is a list of the students who are too old for every classroom.
+        #   Aged out students are removed from their classroom and left without one.
+        today = date.today().toordinal() if today is None else today
+        moved = []
+        aged_out = []
+        while True:
+            self._drop_stale_entries()
+            if not self.heap or self.heap[0][0] > today:
+                break
+            day, student_id = heapq.heappop(self.heap)
+            student = self.due.pop(student_id)[1]
+            previous_classroom = student.classroom
+            if previous_classroom is None:
+                continue
+
+            age = (today - student.get_birth_ordinal()) / 365.25
+            if previous_classroom.is_valid_for_age(age):
+                self.schedule(student)  # The classroom's age range changed since it was scheduled
+                continue
+
+            previous_classroom.students.remove(student)
+            new_classroom = self._find_classroom(classrooms, age)
+            if new_classroom is None:
+                student.classroom = None
+                aged_out.append(student)
+                continue
+            new_classroom.students.append(student)
+            student.assign_classroom(new_classroom)
+            self.schedule(student)
+            moved.append((student, previous_classroom))
+        return moved, aged_out
+
+    @staticmethod
+    def _find_classroom(classrooms, age):
+        # Finds the first valid classroom with space, or else the first valid classroom even if it is full,
+        # so a student who is already enrolled is never left without a classroom because of capacity.
+        if isinstance(classrooms, ClassroomRegistry):
+            return classrooms.find_classroom(age) or classrooms.find_classroom(age, check_capacity=False)
+        valid_classrooms = [classroom for classroom in classrooms if classroom.is_valid_for_age(age)]
+        return next((classroom for classroom in valid_classrooms if classroom.has_space()), None) or next(iter(valid_classrooms), None)
+
+
+# Global transition scheduler - students are scheduled when assign_student places them in a classroom,
+# and main.py calls run_classroom_transitions (see classroom_functions.py) to move the students who are due.
+transition_scheduler = TransitionScheduler()
@@ -1,9 +1,26 @@
-# `Style`, `Fore`, and `Back` are imported from the `colored` library to apply styles and colors to terminal output.
-from colored import Style, Fore, Back 
-
 # Declaring variables for color palette to use across application
-color1: str = f'{Style.underline}{Style.BOLD}{Fore.dark_green}{Back.spring_green_4}' # Color for welcome header and exit app
-color2: str = f"{Style.BOLD}{Fore.white}{Back.dark_blue}"                   # Color for sub menu
-color3: str = f"{Fore.yellow}{Back.black}"                                  # Color for sub menu headers and confirmations
-color4: str = f"{Style.BOLD}{Fore.magenta}"                                 # color for other headers
-color5: str = f"{Fore.red}{Back.black}"                                     # Color for errors/exceptions raised
+# These are the only definitions of the application's colors: every message ends its color with color_reset rather
+# than colored's Style.reset. Each color is the escape code of the `Style`, `Fore` and `Back` attributes of the
+# `colored` library shown beside it, written out so the main menu can be shown without waiting for `colored` to be
+# imported (see benchmarks/startup_time.py). tests/test_output_functions.py checks them against `colored`.
+color1: str = "\x1b[4m\x1b[1m\x1b[38;5;22m\x1b[48;5;29m"  # Style.underline, Style.BOLD, Fore.dark_green, Back.spring_green_4: Color for welcome header and exit app
+color2: str = "\x1b[1m\x1b[38;5;15m\x1b[48;5;18m"           # Style.BOLD, Fore.white, Back.dark_blue: Color for sub menu
+color3: str = "\x1b[38;5;3m\x1b[48;5;0m"                     # Fore.yellow, Back.black: Color for sub menu headers and confirmations
+color4: str = "\x1b[1m\x1b[38;5;5m"                          # Style.BOLD, Fore.magenta: color for other headers
+color5: str = "\x1b[38;5;1m\x1b[48;5;0m"                     # Fore.red, Back.black: Color for errors/exceptions raised
+color_reset: str = "\x1b[0m"                                  # Style.reset: Ends a color
+
+# Storage backend used to save and load students and menus:
+# "json" keeps the students in data/students.json and the menu in one file per week (data/kitchen/week_N.json), with the
+# dish names in data/kitchen_dishes.json and any rotating menu in data/kitchen_rotation.json. A menu saved in the older
+# single data/kitchen.json file is split into weekly files when it is loaded, and the old file is deleted.
+# "sqlite" keeps them in data/childcare.db.
+STORAGE_BACKEND: str = "json"
+
+# Format of the student, allergy and menu listings:
+# "table" prints colored tables, "plain" prints aligned columns without colors or borders (e.g. for printers),
+# "tsv" prints tab-separated values and "jsonl" prints one JSON object per row (e.g. for piping to other tools).
+OUTPUT_FORMAT: str = "table"
+
+# Largest student ID the application hands out (see IdAllocator in classes/id_allocator.py), i.e. the maximum number of students.
+STUDENT_ID_CAPACITY: int = 1_000_000
@@ -0,0 +1,223 @@
+import shlex  # Standard library used to split command lines into words, keeping quoted names with spaces together.
+import sys  # Standard library used to read scripts from standard input and report errors on standard error.
+
+from constants import OUTPUT_FORMAT  # The default listing format.
+from classes.kitchen import MENU_DAYS  # The days of each week of the menu.
+from functions.output_functions import OUTPUT_FORMATS, write_in_chunks, write_rows  # Listing formats, and writers for the menu listing.
+from functions.student_functions import CSV_COLUMNS, validate_student_row, enrol_student  # Validate and enrol students without prompts.
+from functions.classroom_functions import list_students_by_classroom, remove_student, run_classroom_transitions  # List, delete and move students without prompts.
+from functions.kitchen_functions import set_menu_for_day, parse_menu_range, menu_range_lines, menu_range_rows, list_students_with_allergies, MENU_LISTING_HEADERS  # Set and list the menu and allergies without prompts.
+from functions.file_functions import save_students, save_menu  # Save the roster and menu once at the end of a batch.
+
+# Commands accepted by run_batch, shown by "python main.py help".
+BATCH_USAGE = """Usage: python main.py [--format table|plain|tsv|jsonl] COMMAND [ARGUMENTS]
+
+Commands:
+  add FNAME LNAME BIRTHDAY ALLERGIES GUARDIAN_FNAME GUARDIAN_LNAME CONTACT_NUMBER CONTACT_EMAIL
+      Enrol a student. ALLERGIES are separated by semicolons, e.g. "Peanut;Dairy", or "" for none.
+  delete STUDENT_ID
+      Delete a student.
+  list [FORMAT]
+      List the students in each classroom.
+  allergies [FORMAT]
+      List the students with allergies.
+  menu set WEEK DAY BREAKFAST LUNCH AFTERNOON_TEA
+      Set the dishes for a day. DAY is Monday to Friday, or 1 to 5.
+  menu list RANGE [FORMAT]
+      List the menu for a week (5), a range of weeks (1-13) or dates ("2026-01-05 to 2026-03-27").
+  run SCRIPT
+      Run the commands in a file, one per line ("-" reads them from standard input). Lines starting with # are skipped.
+
+The data is loaded once, every command is run, and the changes are saved once at the end.
+With only "--format FORMAT" and no command, the menus are shown and list students, allergies and menus in that format.
+"""
+
+# Days accepted by "menu set", by name or number.
+BATCH_DAYS = {day.lower(): day for day in MENU_DAYS[:5]}
+BATCH_DAYS.update({str(number): day for number, day in enumerate(MENU_DAYS[:5], start=1)})
+
+
+def batch_output_format(words, position, output_format):
+    # Returns: str: The listing format given at words[position], or output_format if there is none.
+    # Raises: ValueError: If the format is not one of OUTPUT_FORMATS or there are extra words.
+    if len(words) > position + 1:
+        raise ValueError(f"Too many arguments for {words[0]}.")
+    if len(words) == position:
+        return output_format
+    if words[position] not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown format {words[position]!r}, expected one of {', '.join(OUTPUT_FORMATS)}.")
+    return words[position]
+
+
+def run_batch_command(words, students, classrooms, kitchen, connection=None, output_format=None):
+    """
+    Run one batch command against data that is already loaded, without prompting and without saving.
+
+    Arguments:
+        words (list of str): The command and its arguments, e.g. ["delete", "14"] (see BATCH_USAGE).
+        students (list): The global list of Student instances.
+        classrooms (list): The list of Classroom instances.
+        kitchen (Kitchen): The Kitchen instance containing the menu.
+        connection (sqlite3.Connection, optional): With the SQLite storage backend, each change is also written to the database.
+        output_format (str, optional): The format of listings without a FORMAT argument. Defaults to OUTPUT_FORMAT in constants.py.
+
+    Returns:
+        str or None: "students" or "menu" if the command changed that data, so it is saved at the end, otherwise None.
+
+    Raises:
+        ValueError: If the command is unknown, its arguments are invalid, or it could not be carried out.
+
+    Example Usage:
+        run_batch_command(["menu", "set", "5", "Monday", "Pancakes", "Pasta", "Fruit"], students, classrooms, kitchen) -> "menu"
+    """
+    output_format = OUTPUT_FORMAT if output_format is None else output_format
+    command = words[0].lower() if words else ""
+
+    if command == "add":
+        if len(words) != len(CSV_COLUMNS) + 1:
+            raise ValueError(f"add expects {len(CSV_COLUMNS)} arguments: {' '.join(column.upper() for column in CSV_COLUMNS)}.")
+        values = validate_student_row(dict(zip(CSV_COLUMNS, words[1:])), classrooms)
+        student = enrol_student(students, classrooms, values, connection=connection, silent=True)
+        if student is None:
+            raise ValueError("Childcare is full. No more unique student IDs available.")
+        if student.classroom is None:
+            raise ValueError("No classroom for the student's age has space.")
+        return "students"
+
+    if command == "delete":
+        if len(words) != 2 or not words[1].isdigit():
+            raise ValueError("delete expects a student ID, e.g. delete 14.")
+        if remove_student(students, classrooms, int(words[1]), connection=connection, silent=True) is None:
+            raise ValueError(f"Student with ID {words[1]} not found.")
+        return "students"
+
+    if command == "list":
+        list_students_by_classroom(classrooms, batch_output_format(words, 1, output_format))
+        return None
+
+    if command == "allergies":
+        list_students_with_allergies(classrooms, connection, batch_output_format(words, 1, output_format))
+        return None
+
+    if command == "menu" and len(words) > 1 and words[1].lower() == "set":
+        if len(words) != 7:
+            raise ValueError("menu set expects WEEK DAY BREAKFAST LUNCH AFTERNOON_TEA.")
+        week, day = words[2], BATCH_DAYS.get(words[3].lower())
+        if not week.isdigit() or not 1 <= int(week) <= 52:
+            raise ValueError("Please enter a valid week number between 1 and 52.")
+        if day is None:
+            raise ValueError("Please enter a weekday, Monday to Friday or 1 to 5.")
+        set_menu_for_day(kitchen, str(int(week)), day, [dish.strip().title() for dish in words[4:]], connection=connection)
+        return "menu"
+
+    if command == "menu" and len(words) > 1 and words[1].lower() == "list":
+        if len(words) < 3:
+            raise ValueError("menu list expects a week, a range of weeks or a range of dates.")
+        days = parse_menu_range(words[2])
+        menu_format = batch_output_format(words, 3, output_format)
+        if menu_format == "table":
+            write_in_chunks(menu_range_lines(kitchen, days))
+        else:
+            write_rows(MENU_LISTING_HEADERS, menu_range_rows(kitchen, days), menu_format, title="Menu:")
+        return None
+
+    raise ValueError(f"Unknown command {' '.join(words[:2])!r}. Run 'python main.py help' for the list of commands.")
+
+
+def read_batch_script(path):
+    """
+    Read the commands in a batch script, one per line, skipping blank lines and # comments.
+
+    Arguments:
+        path (str): The location of the script, or "-" for standard input.
+
+    Yields:
+        tuple: (line number, words), e.g. (3, ["delete", "14"]).
+
+    Raises:
+        OSError: If the file cannot be opened.
+        ValueError: If a line has an unclosed quote.
+    """
+    file = sys.stdin if path == "-" else open(path)
+    try:
+        for line_number, line in enumerate(file, start=1):
+            words = shlex.split(line, comments=True)
+            if words:
+                yield line_number, words
+    finally:
+        if file is not sys.stdin:
+            file.close()
+
+
+def run_batch(arguments, students, classrooms, kitchen, connection=None):
+    """
+    Run batch commands from the command line or a script, then save the changed data once.
+
+    Purpose:
+        Lets nightly sync jobs and other scripts enrol and delete students, set the menu and print listings without
+        going through the menus. The data is loaded once before this is called, every command is run against it in
+        memory, and the roster and menu are each saved at most once at the end, so thousands of commands take seconds.
+        A command that fails is reported on standard error with its line number, and the remaining commands still run.
+
+    Arguments:
+        arguments (list of str): The words after "main.py": one command, or "run SCRIPT", optionally after "--format FORMAT".
+        students (list): The global list of Student instances.
+        classrooms (list): The list of Classroom instances.
+        kitchen (Kitchen): The Kitchen instance containing the menu.
+        connection (sqlite3.Connection, optional): The open database with the SQLite storage backend. Default is None.
+
+    Returns:
+        int: The exit status: 0 if every command succeeded, 1 if any failed, 2 if the arguments or script could not be read.
+
+    Example Usage:
+        run_batch(["run", "nightly.txt"], students, classrooms, kitchen)
+        # nightly.txt:
+        #   add Bukayo Saka 2023-01-01 "Peanut;Dairy" Mary Saka 0406346693 mary@example.com
+        #   menu set 5 Monday Pancakes "Chicken Pasta" "Fruit Salad"
+        #   list tsv
+    """
+    output_format = None
+    if arguments[:1] == ["--format"]:
+        if len(arguments) < 2 or arguments[1] not in OUTPUT_FORMATS:
+            print(f"--format expects one of {', '.join(OUTPUT_FORMATS)}.", file=sys.stderr)
+            return 2
+        output_format, arguments = arguments[1], arguments[2:]
+
+    if arguments[:1] == ["run"]:
+        if len(arguments) != 2:
+            print("run expects one script, e.g. run nightly.txt.", file=sys.stderr)
+            return 2
+        commands = read_batch_script(arguments[1])
+    else:
+        commands = [(None, arguments)]
+
+    # Move students who outgrew their classroom, as the menus do before each choice
+    run_classroom_transitions(students, classrooms, connection=connection, silent=True)
+
+    changed = set()
+    command_count = 0
+    failures = 0
+    try:
+        for line_number, words in commands:
+            command_count += 1
+            try:
+                changed.add(run_batch_command(words, students, classrooms, kitchen, connection, output_format))
+            except ValueError as error:
+                failures += 1
+                where = f"Line {line_number}: " if line_number is not None else ""
+                print(f"{where}{error}", file=sys.stderr)
+    except (OSError, ValueError) as error:
+        print(f"Could not read {arguments[1]}: {error}", file=sys.stderr)
+        failures = None
+
+    # Save what changed once, including the commands that ran before any failure
+    if "students" in changed:
+        save_students(students, journal=True, connection=connection)
+    if "menu" in changed:
+        save_menu(kitchen, connection=connection)
+
+    if failures is None:
+        return 2
+    if arguments[:1] == ["run"]:
+        print(f"Ran {command_count} commands, {failures} failed.", file=sys.stderr)
+    return 1 if failures else 0
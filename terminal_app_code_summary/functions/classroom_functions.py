@@ -1,15 +1,28 @@
-from prettytable import PrettyTable  # External library used to display tabular data. E.g. list students by classrooms in individual tables
-from colored import Style, stylize, attr, fg  # External library for colored text styling.
+import itertools  # Standard library used to take one page of rows at a time from the roster listing, and to compare neighbouring students.
+from datetime import date  # Standard library used to get today's date, as ages in the cached classroom tables change each day.
 
-from classes.person import Person  # Import the Person class for shared methods like age formatting.
-from constants import color3, color4, color5  # Imported constants for consistent colored output.
 
-def assign_student(classrooms, student, silent=False):
+from classes.person import Person  # Import the Person class for shared methods like age formatting.
+from classes.classrooms import ClassroomRegistry  # Import the classroom registry to find classrooms with a binary search.
+from classes.allergen_index import allergen_index  # Import to remove deleted students from the allergen index.
+from classes.name_index import name_index  # Import to remove deleted students from the name search index.
+from classes.transition_scheduler import transition_scheduler  # Import to schedule each student's move to the next classroom.
+from classes.roster import ColumnarRoster  # Import the columnar roster to recompute every student's classroom in one pass.
+from classes.student_registry import StudentRegistry  # Import to look students up by ID without scanning the classrooms.
+from classes.render_cache import render_cache  # Import to reuse classroom tables rendered since the roster last changed.
+from functions.output_functions import new_styled_table, write_in_chunks, write_rows  # Import to create tables in the application's table style, and to write pages of rows or plain, TSV and JSON Lines listings.
+from classes.students import record_student_change, student_ids  # Import to record deletions for the student change journal and release deleted IDs.
+from functions.database_functions import delete_student_from_database, update_classrooms_in_database  # Import to delete students and update classrooms with the SQLite storage backend.
+from constants import color3, color4, color5, color_reset, OUTPUT_FORMAT  # Imported constants for consistent colored output, and the default listing format.
+
+def assign_student(classrooms, student, silent=False, check_capacity=True):
     """
     Assign a student to a valid classroom based on their age.
 
     Purpose:
-        This function iterates through a list of classrooms to find one that matches the student's age range.
+        This function finds the first classroom, in the configured order, that matches the student's age range and has space.
+        For a ClassroomRegistry (as in main.py) this is a binary search over the classrooms' age bands; for a plain list
+        the classrooms are checked one by one.
         If a match is found, the student is assigned to that classroom.
         If no match is found, the student's details (e.g., name, birthday) are cleared to ensure consistency.
 
@@ -19,6 +32,8 @@ def assign_student(classrooms, student, silent=False):
         silent (bool, optional): Suppresses output messages if set to True. This is particularly useful 
             during operations like loading data from a file (e.g., `load_students` in `file_functions.py`) 
             to prevent re-generating student IDs or displaying assignment messages. Default is False.
+        check_capacity (bool, optional): Skips classrooms that have reached their capacity. Set to False when loading
+            saved students, so students already enrolled are never dropped. Default is True.
 
     Example Usage:
         # Sample Data
@@ -40,52 +55,152 @@ def assign_student(classrooms, student, silent=False):
     """
 
 
-    age = student.calculate_age() # Calculate the student's age in years, including fractional months, using the `calculate_age` method from the Person class.
+    age = student.calculate_age() # Calculate the student's age in years, including fractional months, using the `calculate_age` method from the Student class.
 
     
-    # Initialize to track if the student is assigned
-    assigned = False
+    # Find a valid classroom for the student's age with space for them
+    if isinstance(classrooms, ClassroomRegistry):
+        classroom = classrooms.find_classroom(age, check_capacity)  # Binary search over the classrooms' age bands
+    else:
+        classroom = next(
+            (classroom for classroom in classrooms if classroom.is_valid_for_age(age) and (not check_capacity or classroom.has_space())),
+            None
+        )
+
+    if classroom is not None:
+        classroom.students.append(student)  # Add the student to the classroom's student list
+        student.assign_classroom(classroom)  # Assign the classroom to the student
+        transition_scheduler.schedule(student)  # Move them on the day they become too old for this classroom
+        # If silent mode is not enabled, provide user feedback with output below
+        if not silent:
+            # Format the student's age as a user-friendly string (e.g., "3 years and 2 months old")
+            formatted_age = Person.age_in_years_and_months(age)
+            print(f"\n{color3}{student.full_name} (Student ID: {student.get_formatted_id()}) is {formatted_age} and is assigned to {classroom.name}.{color_reset}")
+        return
 
-    # Try to assign the student to a valid classroom
-    for classroom in classrooms:
-        if classroom.is_valid_for_age(age):
-            classroom.students.append(student)  # Add the student to the classroom's student list
-            student.assign_classroom(classroom)  # Assign the classroom to the student
-            assigned = True
-            # If silent mode is not enabled, provide user feedback with output below
-            if not silent:
-                # Format the student's age as a user-friendly string (e.g., "3 years and 2 months old")
-                formatted_age = Person.age_in_years_and_months(age)
-                print(f"\n{color3}{student.full_name} (Student ID: {student.get_formatted_id()}) is {formatted_age} and is assigned to {classroom.name}.{Style.reset}")
-            
-            break  # Exit the loop once the student is assigned
-
-    if not assigned:
-        # Clear student details if no classroom is suitable
-        student.fname = None
-        student.lname = None
-        student.birthday = None
-        student.allergies = []
-        student.guardian = None
+    # A classroom exists for this age if capacity limits are ignored, so every classroom for the age is full
+    classrooms_full = check_capacity and any(classroom.is_valid_for_age(age) for classroom in classrooms)
+    if not silent:
+        formatted_age = Person.age_in_years_and_months(age)
+        reason = "all classrooms for their age are full" if classrooms_full else "age restriction"
+        if student.fname and student.lname:
+            print(f"{student.full_name}, {formatted_age} cannot be added to any classroom due to {reason}. Therefore, they are not enrolled.")
+        else:
+            print(f"Student of age: {formatted_age} cannot be added to any classroom due to {reason}. Therefore, they are not enrolled.")
+
+    # Clear student details if no classroom is suitable
+    clear_student_details(student)
+
+
+def clear_student_details(student):
+    # Clears the details of a student who could not be placed in any classroom, so they are not enrolled.
+    student.fname = None
+    student.lname = None
+    student.birthday = None
+    student.allergies = []
+    student.guardian = None
+
+
+def reassign_students(students, classrooms):
+    """
+    Recompute the classroom of every student from their current age in one pass.
 
+    Purpose:
+        `load_students` (see file_functions.py) uses this to place the whole saved roster at once. This function mirrors
+        the roster as columns (see ColumnarRoster in classes/roster.py), computes every age and classroom together,
+        and rebuilds each classroom's student list, keeping the roster's order.
+        It gives the same classrooms as calling `assign_student` with check_capacity=False for each student, as loading
+        always has: capacity limits apply when new students are enrolled, never to students who are already enrolled.
+        Students without a birthday fit no classroom.
+
+    Arguments:
+        students (list): The global list of Student instances.
+        classrooms (list): A list of Classroom instances, checked in order like `assign_student`.
+
+    Returns:
+        list: The students who fit no classroom. They are left without a classroom, so they are not saved.
+
+    Example Usage:
+        unassigned = reassign_students(students, classrooms)
+        print(len(unassigned))  # e.g. 2 students turned 5 since the roster was saved
+    """
+    roster = ColumnarRoster.from_students(students)
+    roster.assign_classrooms(classrooms)
+    unassigned = roster.apply(classrooms)
+    for student in students:
+        transition_scheduler.schedule(student)  # Reschedule from the new classroom (unassigned students are unscheduled)
+    return unassigned
+
+
+def run_classroom_transitions(students, classrooms, connection=None, today=None, silent=False):
+    """
+    Move the students who have become too old for their classroom since they were enrolled or loaded.
+
+    Purpose:
+        Without this, a student keeps the classroom they were given until the application is restarted, even after a
+        birthday takes them past the classroom's maximum age. main.py calls this function every time a menu is shown.
+        Only the students who are due are looked at (see TransitionScheduler in classes/transition_scheduler.py), so
+        it is cheap to call often, and a student is moved on the first call after the day they change classroom.
+        Students who are too old for every classroom are removed from the roster, as they would be when loading.
+
+    Arguments:
+        students (list): The global list of Student instances.
+        classrooms (list): A list of Classroom instances, checked in order like `assign_student`.
+        connection (sqlite3.Connection, optional): With the SQLite storage backend, the moved students' classrooms are
+            updated and aged out students are deleted in the database. Default is None.
+        today (int, optional): Today's date as a day ordinal. Defaults to date.today().
+        silent (bool, optional): Suppresses output messages if set to True. Default is False.
+
+    Returns:
+        tuple: (moved, aged_out), where moved is a list of (student, previous classroom) tuples.
+
+    Example Usage:
+        run_classroom_transitions(students, classrooms)
+        # Output (on Lamine's 3rd birthday):
+        # Lamine Yamal (Student ID: 01) has moved from Toddlers Room (2-3 years) to Kindergarten Room (3-5 years).
+    """
+    moved, aged_out = transition_scheduler.tick(classrooms, today)
+
+    for student in aged_out:
+        if student in students:
+            students.remove(student)
+        record_student_change("delete", student)
+        allergen_index.remove(student)
+        name_index.remove(student)
+        if connection is not None:
+            delete_student_from_database(connection, student.student_id)
+        student_ids.release(student.student_id)
         if not silent:
-            formatted_age = Person.age_in_years_and_months(age)
-            if student.fname and student.lname:
-                print(f"{student.full_name}, {formatted_age} cannot be added to any classroom due to age restriction. Therefore, they are not enrolled.")
-            else:
-                print(f"Student of age: {formatted_age} cannot be added to any classroom due to age restriction. Therefore, they are not enrolled.")
+            print(f"\n{color4}{student.full_name} (Student ID: {student.get_formatted_id()}) is too old for every classroom and is no longer enrolled.{color_reset}")
+
+    if connection is not None and moved:
+        update_classrooms_in_database(connection, [(student.classroom.get_name(), student.student_id) for student, _ in moved])
+    if not silent:
+        for student, previous_classroom in moved:
+            print(f"\n{color3}{student.full_name} (Student ID: {student.get_formatted_id()}) has moved from {previous_classroom.get_name()} to {student.classroom.get_name()}.{color_reset}")
+    return moved, aged_out
+
 
+# Columns of the student listing in the plain, TSV and JSON Lines formats.
+CLASSROOM_LISTING_HEADERS = ["Student ID", "Name", "Classroom", "Age"]
 
-def list_students_by_classroom(classrooms):
+
+def list_students_by_classroom(classrooms, output_format=None, output=None):
     """
     Display a list of students for each classroom in a tabular format.
 
     Purpose:
         Iterates through the provided list of Classroom instances and displays enrolled students in a table format.
         The table includes each student's full name, student ID, and age in a readable format, grouped by classroom.
+        Each classroom's table is cached (see classes/render_cache.py) and only rendered again when the classroom's
+        students change or on a new day, so repeated listings of an unchanged roster are printed from the cache.
+        In the plain, TSV and JSON Lines formats, every student is listed in one set of rows with their classroom
+        (see classroom_rows), without colors or table borders.
 
     Arguments:
         classrooms (list): A list of Classroom instances, each containing a list of assigned students.
+        output_format (str, optional): "table", "plain", "tsv" or "jsonl". Defaults to OUTPUT_FORMAT in constants.py.
+        output (file, optional): The open file to write to. Defaults to the terminal.
 
     Example Usage:
         # Sample Data
@@ -113,37 +228,190 @@ def list_students_by_classroom(classrooms):
         Harry Kane (2)                3 years, 0 months
     """
 
+    output_format = OUTPUT_FORMAT if output_format is None else output_format
+    if output_format != "table":
+        write_rows(CLASSROOM_LISTING_HEADERS, classroom_rows(classrooms), output_format, output, title="Students by classroom:")
+        return
+
+    today = date.today().toordinal()  # Ages change each day, so the cached tables are rendered again on a new day
     for classroom in classrooms:
         if classroom.students:  # Check if the classroom has any students
-            # Initialize the table for the specific classroom
-            table = PrettyTable()
+            # Each classroom's table is rendered again only if its students changed since it was last listed
+            cache_key = (classroom.students.version, today)
+            print(render_cache.render(("classroom", classroom.get_name()), cache_key, lambda: render_classroom_table(classroom)), file=output)
+        else:
+            # If no students in the classroom, print a message
+            print(f"\n{color4}No students in {classroom.get_name()}.{color_reset}", file=output)
 
-            # Bold and style headers for table
-            header_color = fg("blue") + attr("bold")
-            header_student_name_id = stylize("Student Name (Student ID)", header_color)
-            header_age = stylize("Age", header_color)
 
-            # Apply green color for table lines
-            table.horizontal_char = stylize("-", fg("spring_green_4"))
-            table.junction_char = stylize("+", fg("spring_green_4"))
-            table.vertical_char = stylize("|", fg("spring_green_4"))
+def classroom_rows(classrooms):
+    """
+    Generate a row of plain strings for each student, classroom by classroom, for the plain, TSV and JSON Lines listings.
 
-            table.field_names = [header_student_name_id, header_age]
+    Arguments:
+        classrooms (list): A list of Classroom instances.
 
-            for student in classroom.students:  # Loop through each student in the classroom
-                age = student.calculate_age()
-                formatted_age = Person.age_in_years_and_months(age)  # Use the static method from Person class
-                name_id = f"{student.full_name} (ID: {student.get_formatted_id()})"
+    Yields:
+        list: The student's ID, full name, classroom and age, matching CLASSROOM_LISTING_HEADERS.
 
-                # Add row to the table
-                table.add_row([name_id, formatted_age])
+    Example Usage:
+        next(classroom_rows(classrooms)) -> ["01", "Dani Olmo", "Babies Room (0-2 years)", "1 years and 11 months old"]
+    """
+    for classroom in classrooms:
+        classroom_name = classroom.get_name()
+        for student in classroom.students:
+            yield [student.get_formatted_id(), student.full_name, classroom_name, Person.age_in_years_and_months(student.calculate_age())]
 
-            # Print the table for the current classroom
-            print(f"\n{color3}Students in {classroom.get_name()}:{Style.reset}")
-            print(table)
-        else:
-            # If no students in the classroom, print a message
-            print(f"\n{color4}No students in {classroom.get_name()}.{Style.reset}")
+
+def render_classroom_table(classroom):
+    """
+    Render the table of students in one classroom, with its heading, as used by list_students_by_classroom.
+
+    Arguments:
+        classroom (Classroom): The classroom whose students are listed.
+
+    Returns:
+        str: The heading and the table, ready to print.
+    """
+    table = new_styled_table(["Student Name (Student ID)", "Age"])
+    for student in classroom.students:  # Loop through each student in the classroom
+        age = student.calculate_age()
+        formatted_age = Person.age_in_years_and_months(age)  # Use the static method from Person class
+        name_id = f"{student.full_name} (ID: {student.get_formatted_id()})"
+
+        # Add row to the table
+        table.add_row([name_id, formatted_age])
+    return f"\n{color3}Students in {classroom.get_name()}:{color_reset}\n{table}"
+
+
+# Sort orders for the page-by-page roster listing, keyed by the name typed at the prompt.
+ROSTER_SORT_KEYS = {
+    "id": lambda student: student.student_id,
+    "name": lambda student: (student.lname.lower(), student.fname.lower(), student.student_id),
+    "age": lambda student: (student.get_birth_ordinal(), student.student_id),  # Oldest first
+}
+
+# Column widths of the page-by-page roster listing. Longer names are cut to fit, so every row has the same width.
+ROSTER_NAME_WIDTH = 40
+ROSTER_AGE_WIDTH = 25
+
+
+def roster_lines(classroom, sort_key="id"):
+    """
+    Generate the fixed-width rows of a classroom's students, one at a time.
+
+    Purpose:
+        Each row is formatted only when it is needed, so a page of a large classroom can be shown without formatting
+        the rest of the classroom, and no table of the whole classroom is held in memory.
+        If the students are already in the order asked for (e.g. by ID, when they were enrolled in ID order), they are
+        listed as they are. Otherwise they are sorted first, which builds a list with one position per student in the
+        classroom; the rows themselves are still made one at a time.
+
+    Arguments:
+        classroom (Classroom): The classroom whose students are listed.
+        sort_key (str, optional): "id", "name" (last name, then first name) or "age" (oldest first). Default is "id".
+
+    Yields:
+        str: Each row, e.g. "Dani Olmo (ID: 01)                       2 years old              \n".
+
+    Example Usage:
+        next(roster_lines(classroom, sort_key="name")) -> The row of the student whose last name comes first.
+    """
+    students = classroom.students
+    key = ROSTER_SORT_KEYS[sort_key]
+    if all(key(student) <= key(next_student) for student, next_student in zip(students, itertools.islice(students, 1, None))):
+        order = range(len(students))  # Already in order, so nothing is sorted or held
+    else:
+        order = sorted(range(len(students)), key=lambda position: key(students[position]))
+    for position in order:
+        student = students[position]
+        name_id = f"{student.full_name} (ID: {student.get_formatted_id()})"[:ROSTER_NAME_WIDTH]
+        formatted_age = Person.age_in_years_and_months(student.calculate_age())
+        yield f"{name_id:<{ROSTER_NAME_WIDTH}} {formatted_age:<{ROSTER_AGE_WIDTH}}\n"
+
+
+def page_students_by_classroom(classrooms, page_size=20, sort_key="id", output=None, next_page=None):
+    """
+    Display the students of each classroom a page at a time, in fixed-width rows.
+
+    Purpose:
+        Unlike list_students_by_classroom, which builds a whole table before printing it, rows are produced by
+        roster_lines and written a page at a time, so the first page of a classroom with thousands of students
+        appears straight away and no rows are held beyond the page being written. A classroom that is not already in
+        the chosen order is sorted first (see roster_lines).
+
+    Arguments:
+        classrooms (list): A list of Classroom instances.
+        page_size (int, optional): The number of students on each page. Default is 20.
+        sort_key (str, optional): The order of the students in each classroom (see ROSTER_SORT_KEYS). Default is "id".
+        output (file, optional): Where to write the pages. Defaults to the terminal.
+        next_page (function, optional): Called after each page except the last; the listing stops if it returns False.
+            Default is None, which lists every page without stopping.
+
+    Returns:
+        bool: True if every page was listed, False if next_page stopped the listing.
+
+    Example Usage:
+        page_students_by_classroom(classrooms, page_size=2, sort_key="name")
+        Output:
+            Students in Babies Room (0-2 years) (page 1 of 2):
+            Student Name (Student ID)                Age
+            ---------------------------------------- -------------------------
+            Harry Kane (ID: 02)                      1 years and 3 months old
+            Dani Olmo (ID: 01)                       1 years and 11 months old
+    """
+    header = f"{'Student Name (Student ID)':<{ROSTER_NAME_WIDTH}} {'Age':<{ROSTER_AGE_WIDTH}}\n"
+    rule = f"{'-' * ROSTER_NAME_WIDTH} {'-' * ROSTER_AGE_WIDTH}\n"
+    for classroom_number, classroom in enumerate(classrooms):
+        if not classroom.students:
+            write_in_chunks([f"\n{color4}No students in {classroom.get_name()}.{color_reset}\n"], output)
+            continue
+        page_count = -(-len(classroom.students) // page_size)
+        rows = roster_lines(classroom, sort_key)
+        for page_number in range(1, page_count + 1):
+            title = f"\n{color3}Students in {classroom.get_name()} (page {page_number} of {page_count}):{color_reset}\n"
+            write_in_chunks(itertools.chain([title, header, rule], itertools.islice(rows, page_size)), output)
+            is_last_page = page_number == page_count and classroom_number == len(classrooms) - 1
+            if next_page is not None and not is_last_page and next_page() is False:
+                return False
+    return True
+
+
+def list_students_page_by_page(classrooms):
+    """
+    Prompt for a sort order and page size, then display the students of each classroom a page at a time.
+
+    Purpose:
+        Interactive version of page_students_by_classroom for large classrooms. After each page the user presses
+        Enter to see the next page, or types q to stop.
+
+    Arguments:
+        classrooms (list): A list of Classroom instances.
+
+    Example Usage:
+        list_students_page_by_page(classrooms)
+        Input: "name", "50" -> Lists each classroom sorted by last name, 50 students per page.
+    """
+    try:
+        sort_key = input("Sort students by id, name or age (press Enter for id): ").strip().lower() or "id"
+        page_size_input = input("Enter the number of students per page (press Enter for 20): ").strip()
+    except (EOFError, KeyboardInterrupt):
+        print(f"\n{color5}Input interrupted.{color_reset}")
+        return
+    if sort_key not in ROSTER_SORT_KEYS:
+        print(f"{color5}Please sort by id, name or age.{color_reset}\n")
+        return
+    if page_size_input and (not page_size_input.isdigit() or int(page_size_input) < 1):
+        print(f"{color5}Please enter a whole number of students per page, such as 20.{color_reset}\n")
+        return
+
+    def next_page():
+        try:
+            return input("Press Enter for the next page, or q to stop: ").strip().lower() != "q"
+        except (EOFError, KeyboardInterrupt):
+            return False
+
+    page_students_by_classroom(classrooms, int(page_size_input or 20), sort_key, next_page=next_page)
 
 
 def count_total_students(classrooms):
@@ -183,10 +451,10 @@ def count_total_students(classrooms):
     """
 
     total_students = sum(len(classroom.students) for classroom in classrooms)
-    print(f"\n{color3}Total number of students: {total_students}{Style.reset}")  
+    print(f"\n{color3}Total number of students: {total_students}{color_reset}")  
 
 
-def delete_student(students, classrooms):
+def delete_student(students, classrooms, connection=None):
     """
     Delete a student by their student ID.
 
@@ -196,8 +464,11 @@ def delete_student(students, classrooms):
         2. The global list of all students.
 
     Arguments:
-        students (list): The global list containing all Student instances.
+        students (list): The global list containing all Student instances. If it is a StudentRegistry (as in main.py), the student
+            and their classroom are found by ID in constant time, and removing them from both lists keeps the other students' order.
         classrooms (list): The list of all Classroom instances, used to locate and remove the student from their assigned classroom.
+        connection (sqlite3.Connection, optional): With the SQLite storage backend, the student is looked up and deleted in the
+            database by ID, and only the classroom saved for them is searched. Default is None.
 
     Example Usage:
         # Sample Data
@@ -230,38 +501,89 @@ def delete_student(students, classrooms):
         # Ask for student ID to delete and ensure it's an integer
         student_id = int(input("Enter the student ID to delete: "))  # Convert input to int
     except ValueError:
-        print(f"{color5}Invalid input. Please enter a valid student ID (integer).{Style.reset}")
+        print(f"{color5}Invalid input. Please enter a valid student ID (integer).{color_reset}")
         return
     except EOFError:
-        print(f"\n{color5}Input interrupted. Returning to the previous menu.{Style.reset}")
+        print(f"\n{color5}Input interrupted. Returning to the previous menu.{color_reset}")
         return
     except Exception as e:  
-        print(f"{color5}An unexpected error occurred: {e}{Style.reset}")
+        print(f"{color5}An unexpected error occurred: {e}{color_reset}")
         return
-    
+    remove_student(students, classrooms, student_id, connection=connection)
+
+
+def remove_student(students, classrooms, student_id, connection=None, silent=False):
+    """
+    Delete the student with a given student ID, without prompting, e.g. for `delete_student` or a batch `delete` command.
+
+    Purpose:
+        Removes the student from their classroom, the global list of students and the indexes, records the deletion for
+        the next journal save, and gives their student ID back so it can be reused.
+
+    Arguments:
+        students (list): The global list containing all Student instances (see delete_student).
+        classrooms (list): The list of all Classroom instances.
+        student_id (int): The ID of the student to delete.
+        connection (sqlite3.Connection, optional): With the SQLite storage backend, the student is also deleted from the database.
+        silent (bool, optional): Print nothing, leaving the caller to report a missing student. Default is False.
+
+    Returns:
+        Student or None: The deleted student, or None if no student has this ID.
+
+    Example Usage:
+        remove_student(students, classrooms, 1) -> Student("Harry", "Kane", ...)
+    """
     # Find the student in the classrooms' students list
     student_to_delete = None
     classroom_to_delete_from = None
 
-    # Loop through each classroom to find the student
-    for classroom in classrooms:
-        for student in classroom.students:
-            if student.student_id == student_id:  # Ensure comparison is between integers
-                student_to_delete = student
-                classroom_to_delete_from = classroom
-                break  # Exit inner loop once the student is found
-        if student_to_delete:
-            break  # Exit outer loop once the student is found
+    if connection is not None:
+        # Delete the student from the database first; it also tells us which classroom to search
+        classroom_name = delete_student_from_database(connection, student_id)
+        if classroom_name is None:
+            if not silent:
+                print(f"Student with ID {student_id} not found.")
+            return None
+        classrooms_to_search = [classroom for classroom in classrooms if classroom.get_name() == classroom_name]
+    else:
+        classrooms_to_search = classrooms
+
+    if isinstance(students, StudentRegistry):
+        # Look the student up by ID in constant time instead of scanning every classroom.
+        # Students who could not be placed in a classroom are not enrolled, so they are not found, as with the scan below.
+        student_to_delete = students.get(student_id)
+        if student_to_delete is not None and student_to_delete.classroom is None:
+            student_to_delete = None
+        classroom_to_delete_from = student_to_delete.classroom if student_to_delete else None
+    else:
+        # Loop through each classroom to find the student
+        for classroom in classrooms_to_search:
+            for student in classroom.students:
+                if student.student_id == student_id:  # Ensure comparison is between integers
+                    student_to_delete = student
+                    classroom_to_delete_from = classroom
+                    break  # Exit inner loop once the student is found
+            if student_to_delete:
+                break  # Exit outer loop once the student is found
     
     if not student_to_delete:
-        print(f"Student with ID {student_id} not found.")
-        return
+        if not silent:
+            print(f"Student with ID {student_id} not found.")
+        return None
     
     # Remove the student from the classroom they are assigned to
     if classroom_to_delete_from:
         classroom_to_delete_from.students.remove(student_to_delete)
-        print(f"\n{color3}{student_to_delete.full_name} removed from {classroom_to_delete_from.get_name()}.{Style.reset}")
+        if not silent:
+            print(f"\n{color3}{student_to_delete.full_name} removed from {classroom_to_delete_from.get_name()}.{color_reset}")
 
     # Remove the student from the global students list
     students.remove(student_to_delete)
-    print(f"{color3}{student_to_delete.full_name} (student ID: {student_to_delete.student_id}) has been deleted from the system.{Style.reset}")
+    record_student_change("delete", student_to_delete)
+    transition_scheduler.unschedule(student_to_delete)
+    allergen_index.remove(student_to_delete)
+    name_index.remove(student_to_delete)
+    student_ids.release(student_to_delete.student_id)  # The ID can be given to a new student
+    if not silent:
+        print(f"{color3}{student_to_delete.full_name} (student ID: {student_to_delete.student_id}) has been deleted from the system.{color_reset}")
+    return student_to_delete
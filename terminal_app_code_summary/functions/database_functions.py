@@ -0,0 +1,317 @@
+from classes.kitchen import CompactMenu  # Internal compact menu store that the saved menu is loaded into.
+
+# Location of the SQLite database used when the "sqlite" storage backend is selected in constants.py
+DATABASE_FILE = 'data/childcare.db'
+
+# Tables and indexes for the database. Students are indexed on student_id (primary key) and classroom,
+# and allergies are indexed on allergen, so lookups do not need to scan the whole roster.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS guardians (
+    guardian_id INTEGER PRIMARY KEY,
+    fname TEXT,
+    lname TEXT,
+    contact_number TEXT,
+    contact_email TEXT,
+    UNIQUE (fname, lname, contact_number, contact_email)
+);
+CREATE TABLE IF NOT EXISTS students (
+    student_id INTEGER PRIMARY KEY,
+    fname TEXT NOT NULL,
+    lname TEXT NOT NULL,
+    birthday TEXT NOT NULL,
+    classroom TEXT,
+    guardian_id INTEGER REFERENCES guardians (guardian_id)
+);
+CREATE INDEX IF NOT EXISTS idx_students_classroom ON students (classroom);
+CREATE TABLE IF NOT EXISTS allergies (
+    student_id INTEGER NOT NULL REFERENCES students (student_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    allergen TEXT NOT NULL,
+    PRIMARY KEY (student_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_allergies_allergen ON allergies (allergen);
+CREATE TABLE IF NOT EXISTS menu (
+    week TEXT NOT NULL,
+    day TEXT NOT NULL,
+    meal TEXT NOT NULL,
+    dish TEXT,
+    PRIMARY KEY (week, day, meal)
+);
+"""
+
+# Meals stored for every day of the menu, in display order
+MEALS = ["Breakfast", "Lunch", "Afternoon Tea"]
+
+
+def connect_database(path=DATABASE_FILE):
+    """
+    Open the SQLite database and create its tables if they do not exist yet.
+
+    Arguments:
+        path (str, optional): Location of the database file. Default is 'data/childcare.db'.
+
+    Returns:
+        sqlite3.Connection: An open connection with foreign keys enabled. It may be used by one thread at a time from any
+        thread, as main.py opens it while loading the data in the background and then uses it from the menus.
+
+    Example:
+        connection = connect_database()
+    """
+    import sqlite3  # Standard library for the SQLite database, imported only when the "sqlite" storage backend is selected
+
+    connection = sqlite3.connect(path, check_same_thread=False)
+    connection.execute("PRAGMA foreign_keys = ON")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def _save_guardian(connection, guardian):
+    # Inserts the guardian (or finds the identical existing row) and returns its guardian_id.
+    if guardian is None:
+        return None
+    details = (guardian.fname, guardian.lname, guardian.contact_number, guardian.contact_email)
+    connection.execute(
+        "INSERT OR IGNORE INTO guardians (fname, lname, contact_number, contact_email) VALUES (?, ?, ?, ?)", details
+    )
+    row = connection.execute(
+        "SELECT guardian_id FROM guardians WHERE fname IS ? AND lname IS ? AND contact_number IS ? AND contact_email IS ?", details
+    ).fetchone()
+    return row[0]
+
+
+def _save_student_row(connection, student):
+    # Writes one student, their guardian and their allergies without committing.
+    guardian_id = _save_guardian(connection, student.guardian)
+    classroom_name = student.classroom.get_name() if student.classroom else None
+    connection.execute(
+        "INSERT OR REPLACE INTO students (student_id, fname, lname, birthday, classroom, guardian_id) VALUES (?, ?, ?, ?, ?, ?)",
+        (student.student_id, student.fname, student.lname, student.birthday, classroom_name, guardian_id)
+    )
+    connection.execute("DELETE FROM allergies WHERE student_id = ?", (student.student_id,))
+    connection.executemany(
+        "INSERT INTO allergies (student_id, position, allergen) VALUES (?, ?, ?)",
+        [(student.student_id, position, allergen) for position, allergen in enumerate(student.allergies)]
+    )
+
+
+def save_student_to_database(connection, student):
+    """
+    Save a single student in one transaction.
+
+    Purpose:
+        Inserts or replaces the student's row, guardian and allergies, committing them together so a failure
+        never leaves a half-written student. Only this student is written, not the whole roster.
+
+    Arguments:
+        connection (sqlite3.Connection): The open database connection.
+        student (Student): The student to save. Students without a classroom are not saved, matching `save_students`.
+
+    Example:
+        save_student_to_database(connection, student)
+    """
+    if not (student.classroom and student.fname and student.lname and student.student_id):
+        return
+    with connection:
+        _save_student_row(connection, student)
+
+
+def save_students_to_database(connection, students):
+    """
+    Save every enrolled student in one transaction, e.g. when moving an existing roster into the database.
+
+    Arguments:
+        connection (sqlite3.Connection): The open database connection.
+        students (list): A list of Student instances.
+    """
+    with connection:
+        for student in students:
+            if student.classroom and student.fname and student.lname and student.student_id:
+                _save_student_row(connection, student)
+
+
+def delete_student_from_database(connection, student_id):
+    """
+    Delete a student, their allergies, and their guardian if no other student refers to them, in one transaction.
+
+    Arguments:
+        connection (sqlite3.Connection): The open database connection.
+        student_id (int): The ID of the student to delete.
+
+    Returns:
+        str or None: The name of the classroom the student was saved in, or None if no student has this ID.
+
+    Example:
+        delete_student_from_database(connection, 14) -> "Toddlers Room (2-3 years)"
+    """
+    with connection:
+        row = connection.execute("SELECT classroom, guardian_id FROM students WHERE student_id = ?", (student_id,)).fetchone()
+        if row is None:
+            return None
+        connection.execute("DELETE FROM students WHERE student_id = ?", (student_id,))
+        # Siblings share one guardian row, so it is only deleted with the last of them
+        connection.execute(
+            "DELETE FROM guardians WHERE guardian_id = ? AND NOT EXISTS (SELECT 1 FROM students WHERE guardian_id = ?)",
+            (row[1], row[1])
+        )
+    return row[0]
+
+
+def find_guardian_in_database(connection, student_id):
+    """
+    Look up a student and their guardian by student ID using the primary key index.
+
+    Arguments:
+        connection (sqlite3.Connection): The open database connection.
+        student_id (int): The ID of the student.
+
+    Returns:
+        tuple or None: (student fname, student lname, guardian fname, guardian lname, contact number, contact email),
+        with the guardian fields set to None if the student has no guardian, or None if no student has this ID.
+    """
+    return connection.execute(
+        """SELECT s.fname, s.lname, g.fname, g.lname, g.contact_number, g.contact_email
+           FROM students s LEFT JOIN guardians g ON g.guardian_id = s.guardian_id
+           WHERE s.student_id = ?""",
+        (student_id,)
+    ).fetchone()
+
+
+def find_students_with_allergies_in_database(connection):
+    """
+    Look up every student with at least one allergy, using the allergies table instead of scanning the roster.
+
+    Arguments:
+        connection (sqlite3.Connection): The open database connection.
+
+    Returns:
+        list: (student_id, fname, lname, classroom, allergies) tuples, where allergies is a list in the order they were entered.
+
+    Example:
+        find_students_with_allergies_in_database(connection) -> [(14, "Lionel", "Messi", "Toddlers Room (2-3 years)", ["Peanut"])]
+    """
+    students_with_allergies = {}
+    rows = connection.execute(
+        """SELECT s.student_id, s.fname, s.lname, s.classroom, a.allergen
+           FROM allergies a JOIN students s ON s.student_id = a.student_id
+           ORDER BY a.student_id, a.position"""
+    )
+    for student_id, fname, lname, classroom, allergen in rows:
+        if student_id not in students_with_allergies:
+            students_with_allergies[student_id] = (student_id, fname, lname, classroom, [])
+        students_with_allergies[student_id][4].append(allergen)
+    return list(students_with_allergies.values())
+
+
+def iter_student_records_from_database(connection):
+    """
+    Yield every saved student as a dictionary in the same format as 'data/students.json'.
+
+    Purpose:
+        Lets `load_students` in file_functions.py build students from the database with the same pipeline as the JSON files.
+        Each dictionary also includes the saved "classroom" name, so classrooms that change with age can be updated.
+
+    Arguments:
+        connection (sqlite3.Connection): The open database connection.
+
+    Example:
+        next(iter_student_records_from_database(connection)) ->
+            {"student_id": 14, "fname": "Lionel", ..., "allergies": [], "guardian": {...}, "classroom": "Toddlers Room (2-3 years)"}
+    """
+    allergies = {}
+    for student_id, allergen in connection.execute("SELECT student_id, allergen FROM allergies ORDER BY student_id, position"):
+        allergies.setdefault(student_id, []).append(allergen)
+
+    rows = connection.execute(
+        """SELECT s.student_id, s.fname, s.lname, s.birthday, s.classroom, s.guardian_id,
+                  g.fname, g.lname, g.contact_number, g.contact_email
+           FROM students s LEFT JOIN guardians g ON g.guardian_id = s.guardian_id
+           ORDER BY s.rowid"""
+    )
+    for student_id, fname, lname, birthday, classroom_name, guardian_id, guardian_fname, guardian_lname, contact_number, contact_email in rows:
+        student_dict = {
+            'student_id': student_id,
+            'fname': fname,
+            'lname': lname,
+            'birthday': birthday,
+            'allergies': allergies.get(student_id, []),
+            'classroom': classroom_name,
+        }
+        if guardian_id is not None:
+            student_dict['guardian'] = {
+                'fname': guardian_fname,
+                'lname': guardian_lname,
+                'contact_number': contact_number,
+                'contact_email': contact_email
+            }
+        yield student_dict
+
+
+def update_classrooms_in_database(connection, moved_students):
+    """
+    Update the saved classroom of students whose age placed them in a different classroom when loading.
+
+    Arguments:
+        connection (sqlite3.Connection): The open database connection.
+        moved_students (list): (classroom name, student_id) tuples.
+    """
+    with connection:
+        connection.executemany("UPDATE students SET classroom = ? WHERE student_id = ?", moved_students)
+
+
+def save_menu_day_to_database(connection, week, day, meals):
+    """
+    Save the menu for a single day in one transaction.
+
+    Arguments:
+        connection (sqlite3.Connection): The open database connection.
+        week (str): The week number, e.g. "1".
+        day (str): The day of the week, e.g. "Monday".
+        meals (dict): The dishes keyed by meal, e.g. {"Breakfast": "Pancakes", "Lunch": None, "Afternoon Tea": None}.
+    """
+    with connection:
+        connection.executemany(
+            "INSERT OR REPLACE INTO menu (week, day, meal, dish) VALUES (?, ?, ?, ?)",
+            [(str(week), day, meal, meals.get(meal)) for meal in MEALS]
+        )
+
+
+def save_menu_to_database(connection, kitchen):
+    """
+    Save the whole kitchen menu in one transaction, e.g. when moving an existing menu into the database.
+
+    Arguments:
+        connection (sqlite3.Connection): The open database connection.
+        kitchen (Kitchen): The Kitchen instance containing the menu to save.
+    """
+    with connection:
+        connection.executemany(
+            "INSERT OR REPLACE INTO menu (week, day, meal, dish) VALUES (?, ?, ?, ?)",
+            [
+                (str(week), day, meal, meals.get(meal))
+                for week, days in kitchen.menu.items()
+                for day, meals in days.items()
+                for meal in MEALS
+            ]
+        )
+
+
+def load_menu_from_database(connection, kitchen):
+    """
+    Load the kitchen menu from the database into the `menu` attribute of the Kitchen instance.
+
+    Arguments:
+        connection (sqlite3.Connection): The open database connection.
+        kitchen (Kitchen): The Kitchen instance whose `menu` attribute will be populated.
+    """
+    kitchen.menu = CompactMenu()
+    for week, day, meal, dish in connection.execute("SELECT week, day, meal, dish FROM menu ORDER BY CAST(week AS INTEGER), rowid"):
+        if week not in kitchen.menu:
+            kitchen.menu[week] = {}
+        kitchen.menu[week][day][meal] = dish
+
+
+def database_is_empty(connection):
+    # Returns True if no students and no menu have been saved to the database yet.
+    has_students = connection.execute("SELECT 1 FROM students LIMIT 1").fetchone()
+    has_menu = connection.execute("SELECT 1 FROM menu LIMIT 1").fetchone()
+    return not has_students and not has_menu
@@ -1,11 +1,119 @@
 import json  # Standard library for reading and writing JSON files.
+import os  # Standard library used to check the size of the change journal, fsync files and rename them into place.
 
-from classes.students import Student  # Import the Student class for creating and managing student instances.
-from functions.classroom_functions import assign_student  # Import the assign_student function to handle classroom assignments.
-from classes.parent_guardian import ParentGuardian  # Import the ParentGuardian class to associate guardians with students.
+from classes.students import Student, student_changes, student_ids  # Import the Student class, the list of unsaved student changes and the student ID allocator.
+from functions.classroom_functions import reassign_students, clear_student_details  # Import to assign every loaded student to their classroom in one pass, and to clear the details of students who fit no classroom.
+from classes.parent_guardian import ParentGuardian, guardian_registry  # Import the ParentGuardian class and the registry that shares one guardian between siblings.
+from classes.classrooms import ClassroomRegistry, DEFAULT_CLASSROOMS  # Import the classroom registry and the classrooms used when none are configured.
+from classes.allergen_index import allergen_index  # Import to index the allergies of loaded students.
+from classes.name_index import name_index  # Import to index the names of loaded students for name search.
+from classes.kitchen import WeekMenuFiles, menu_week_path  # Import the lazily loaded weekly menu files, stored in compact form.
+from functions.database_functions import iter_student_records_from_database, update_classrooms_in_database, load_menu_from_database  # SQLite storage backend.
 
+# File locations for student persistence. The snapshot holds the full roster, the journal holds changes made since the snapshot.
+# Guardians are stored once in their own table keyed by guardian ID, and students refer to them by that ID.
+STUDENTS_FILE = 'data/students.json'
+GUARDIANS_FILE = 'data/guardians.json'
+STUDENTS_JOURNAL_FILE = 'data/students_journal.jsonl'
 
-def save_students(students):
+# Classroom configuration: each classroom's name, age range and capacity.
+CLASSROOMS_FILE = 'data/classrooms.json'
+
+# Once the journal grows past this many bytes, the next save compacts it into a fresh snapshot.
+JOURNAL_COMPACT_THRESHOLD = 256 * 1024
+
+
+def write_file_atomically(path, text):
+    """
+    Replace a file's contents so it is never left half-written.
+
+    Purpose:
+        Writes the text to a temporary file next to `path`, flushes and fsyncs it, then renames it over `path`.
+        A crash during the save leaves either the old file or the new one, never a truncated mix of both.
+
+    Arguments:
+        path (str): The file to replace, e.g. 'data/students.json'.
+        text (str): The new contents of the file.
+
+    Example:
+        write_file_atomically('data/kitchen/week_1.json', json.dumps(kitchen.menu.saved_week("1")))
+    """
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, 'w') as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, path)
+
+    # Make the rename itself durable by syncing the folder that contains the file (not supported on every platform)
+    try:
+        folder = os.open(os.path.dirname(path) or '.', os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(folder)
+    except OSError:
+        pass
+    finally:
+        os.close(folder)
+
+
+def is_saveable(student):
+    # Only students who have been successfully assigned a classroom and have valid attributes are saved.
+    return bool(student.classroom and student.fname and student.lname and student.student_id)
+
+
+def student_to_dict(student):
+    """
+    Convert a Student instance into the dictionary stored in 'data/students.json'.
+
+    Purpose:
+        Builds the JSON-compatible representation of a student, referring to their guardian (if available) by guardian ID.
+        It is shared by the full snapshot written by `save_students` and the records appended to the change journal.
+
+    Arguments:
+        student (Student): The student to convert.
+
+    Returns:
+        dict: The student's details, e.g.
+            {"student_id": 1, "fname": "John", "lname": "Doe", "birthday": "2015-03-25", "allergies": [], "guardian_id": 1}
+    """
+    student_data = {
+        'student_id': student.get_student_id(),
+        'fname': student.get_fname(),
+        'lname': student.get_lname(),
+        'birthday': student.get_birthday(),
+        'allergies': student.get_allergies(),
+    }
+
+    # Check if guardian exists before referring to it
+    if student.guardian:
+        if student.guardian.guardian_id is None:
+            guardian_registry.add(student.guardian)  # Give guardians created outside the registry an ID
+        student_data['guardian_id'] = student.guardian.guardian_id
+    return student_data
+
+
+def guardian_to_dict(guardian):
+    """
+    Convert a ParentGuardian instance into the dictionary stored in the guardians table ('data/guardians.json').
+
+    Arguments:
+        guardian (ParentGuardian): The guardian to convert.
+
+    Returns:
+        dict: The guardian's details, e.g.
+            {"fname": "Jane", "lname": "Doe", "contact_number": "0412345678", "contact_email": "jane.doe@example.com"}
+    """
+    return {
+        'fname': guardian.get_guardian_fname(),
+        'lname': guardian.get_guardian_lname(),
+        'contact_number': guardian.get_guardian_contact_number(),
+        'contact_email': guardian.get_guardian_contact_email()
+    }
+
+
+def save_students(students, journal=False, connection=None):
   
     """
     Save student data to a JSON file.
@@ -15,16 +123,27 @@ def save_students(students):
         valid students with assigned classrooms are saved.
 
         It works by interating through the list of students, validates that each student has been assigned a classroom and has valid attributes 
-        before constructing a dictionary representation for each student, including their guardian details (if available).
-        And finally, writes the list of dictionaries to a JSON file.
+        before constructing a dictionary representation for each student, referring to their guardian (if available) by guardian ID.
+        And finally, writes the list of dictionaries to a JSON file, and each guardian once to 'data/guardians.json',
+        so siblings' guardian details are only stored once.
+
+        In journal mode, only the students changed since the last save (see `record_student_change` in classes/students.py)
+        are appended to 'data/students_journal.jsonl', so a save costs time proportional to what changed,
+        and a save with no changes does no I/O at all.
+        Once the journal passes `JOURNAL_COMPACT_THRESHOLD` bytes it is compacted into a fresh snapshot.
+        Full snapshots are written with `write_file_atomically`, so a crash never leaves a truncated students.json.
 
     Arguments:
         students (list): A list of Student instances.
+        journal (bool, optional): Append recorded changes to the journal instead of rewriting the whole file. Default is False.
+        connection (sqlite3.Connection, optional): With the SQLite storage backend each student is already saved by
+            `add_student` and `delete_student`, so nothing is rewritten. Default is None.
 
     Example usage with JSON Output:
-        save_students(students) -> Saves all valid students to 'data/students.json'.
+        save_students(students) -> Saves all valid students to 'data/students.json' and their guardians to 'data/guardians.json'.
+        save_students(students, journal=True) -> Appends e.g. {"action": "add", "student": {...}, "guardian": {...}} to 'data/students_journal.jsonl'.
 
-    JSON Output Example:
+    JSON Output Example ('data/students.json'):
         [
             {
                 "student_id": 1,
@@ -32,70 +151,365 @@ def save_students(students):
                 "lname": "Doe",
                 "birthday": "2015-03-25",
                 "allergies": ["Peanuts", "Shellfish"],
-                "guardian": {
-                    "fname": "Jane",
-                    "lname": "Doe",
-                    "contact_number": "0412345678",
-                    "contact_email": "jane.doe@example.com"
-                }
+                "guardian_id": 1
             },
             {
                 "student_id": 2,
                 "fname": "Alice",
-                "lname": "Smith",
+                "lname": "Doe",
                 "birthday": "2017-07-12",
                 "allergies": [],
-                "guardian": {
-                    "fname": "Bob",
-                    "lname": "Smith",
-                    "contact_number": "0498765432",
-                    "contact_email": "bob.smith@example.com"
-                }
+                "guardian_id": 1
             }
         ]
+
+    JSON Output Example ('data/guardians.json'):
+        {
+            "1": {
+                "fname": "Jane",
+                "lname": "Doe",
+                "contact_number": "0412345678",
+                "contact_email": "jane.doe@example.com"
+            }
+        }
     """
 
-    with open('data/students.json', 'w') as file:
-        students_to_save = []
-        for student in students:
-            # Only save students who have been successfully assigned a classroom and have valid attributes
-            if student.classroom and student.fname and student.lname and student.student_id:
-                student_data = {
-                    'student_id': student.get_student_id(),
-                    'fname': student.get_fname(),
-                    'lname': student.get_lname(),
-                    'birthday': student.get_birthday(),
-                    'allergies': student.get_allergies(),
-                }
-                
-                # Check if guardian exists before accessing its attributes
-                if student.guardian:
-                    student_data['guardian'] = {
-                        'fname': student.guardian.get_guardian_fname(),
-                        'lname': student.guardian.get_guardian_lname(),
-                        'contact_number': student.guardian.get_guardian_contact_number(),
-                        'contact_email': student.guardian.get_guardian_contact_email()
-                    }
-                
-                students_to_save.append(student_data) # writes the list of dictionaries to a JSON file by appending it.
-        json.dump(students_to_save, file, indent=4)
-       
-
-def load_students(students, classrooms):
+    if connection is not None:
+        student_changes.clear()  # Every change was already committed to the database
+        return
+
+    if journal:
+        if not student_changes:
+            return  # Nothing changed since the last save
+        journal_size = append_student_journal()
+        if journal_size > JOURNAL_COMPACT_THRESHOLD:
+            save_students(students)  # Compact the journal into a fresh snapshot
+        return
+
+    students_to_save = []
+    guardians_to_save = {}
+    for student in students:
+        if is_saveable(student):
+            student_data = student_to_dict(student)
+            if student.guardian and student.guardian.guardian_id not in guardians_to_save:
+                guardians_to_save[student.guardian.guardian_id] = guardian_to_dict(student.guardian)
+            students_to_save.append(student_data)
+
+    # Guardians are written first, so the students file never refers to a guardian that was not saved
+    write_file_atomically(GUARDIANS_FILE, json.dumps(guardians_to_save, indent=4))
+    write_file_atomically(STUDENTS_FILE, json.dumps(students_to_save, indent=4))
+
+    # The snapshot now holds every change, so the journal and pending changes are no longer needed
+    student_changes.clear()
+    if os.path.exists(STUDENTS_JOURNAL_FILE):
+        os.remove(STUDENTS_JOURNAL_FILE)
+
+
+def append_student_journal():
+    """
+    Append the recorded student changes to the change journal.
+
+    Purpose:
+        Writes one JSON line per changed student to 'data/students_journal.jsonl', fsyncs it, and clears the dirty set.
+        Added students whose enrolment failed (no classroom assigned) are skipped, matching `save_students`.
+
+    Returns:
+        int: The size of the journal in bytes after appending.
+
+    Example:
+        record_student_change("add", student)
+        append_student_journal()
+
+        Journal Output Example:
+            {"action": "add", "student": {"student_id": 1, "fname": "John", ..., "guardian_id": 1}, "guardian": {"guardian_id": 1, "fname": "Jane", ...}}
+            {"action": "delete", "student_id": 1}
+    """
+    lines = []
+    for action, student in student_changes.values():
+        if action == "delete":
+            lines.append(json.dumps({'action': action, 'student_id': student.student_id}))
+        elif is_saveable(student):
+            entry = {'action': action, 'student': student_to_dict(student)}
+            if student.guardian:
+                # The guardian travels with the entry until the next compaction writes it to the guardians table
+                entry['guardian'] = {'guardian_id': student.guardian.guardian_id, **guardian_to_dict(student.guardian)}
+            lines.append(json.dumps(entry))
+
+    with open(STUDENTS_JOURNAL_FILE, 'a') as file:
+        file.writelines(line + "\n" for line in lines)
+        file.flush()
+        os.fsync(file.fileno())
+        journal_size = file.tell()
+    student_changes.clear()
+    return journal_size
+
+
+def read_student_journal():
+    """
+    Read the change journal into the latest record for each changed student.
+
+    Purpose:
+        Reads 'data/students_journal.jsonl' line by line and keeps only the last "add" or "delete" entry per student,
+        so the loader can apply them while streaming the snapshot. Deleted students map to None.
+        Guardians saved with journal entries are added to the guardian registry.
+
+    Returns:
+        dict: The latest student dictionary (or None if deleted) keyed by student ID, in journal order.
+
+    Example:
+        Journal: {"action": "add", "student": {"student_id": 2, ...}}
+                 {"action": "delete", "student_id": 1}
+        read_student_journal() -> {2: {"student_id": 2, ...}, 1: None}
+    """
+    journal_records = {}
+    try:
+        with open(STUDENTS_JOURNAL_FILE, 'r') as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry['action'] == "delete":
+                    journal_records[entry['student_id']] = None
+                else:
+                    student_dict = entry['student']
+                    journal_records[student_dict['student_id']] = student_dict
+                    if 'guardian' in entry:
+                        load_guardian(entry['guardian']['guardian_id'], entry['guardian'])
+    except FileNotFoundError:
+        pass  # No changes since the last snapshot
+    return journal_records
+
+
+def iter_json_array(file, chunk_size=64 * 1024):
+    """
+    Yield the elements of a top-level JSON array one at a time.
+
+    Purpose:
+        Reads the file in fixed-size chunks and decodes one element at a time with `json.JSONDecoder.raw_decode`,
+        so only the current chunk and element are held in memory instead of the whole parsed file.
+
+    Arguments:
+        file (file object): An open text file containing a JSON array.
+        chunk_size (int, optional): Number of characters read per chunk. Default is 64 KiB.
+
+    Example:
+        with open('data/students.json') as file:
+            for student_dict in iter_json_array(file):
+                print(student_dict['student_id'])
+
+    Exceptions:
+        - Raises ValueError if the file does not contain a complete JSON array.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+
+    def read_more():
+        # Drop the consumed part of the buffer and append the next chunk
+        nonlocal buffer, position, eof
+        chunk = file.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+    # Find the opening bracket of the array
+    while True:
+        while position < len(buffer) and buffer[position].isspace():
+            position += 1
+        if position < len(buffer):
+            break
+        if eof:
+            raise ValueError("Expected a JSON array of students.")
+        read_more()
+    if buffer[position] != '[':
+        raise ValueError("Expected a JSON array of students.")
+    position += 1
+
+    while True:
+        # Skip whitespace and the commas between elements
+        while position < len(buffer) and (buffer[position].isspace() or buffer[position] == ','):
+            position += 1
+        if position == len(buffer):
+            if eof:
+                raise ValueError("Unexpected end of the JSON array of students.")
+            read_more()
+            continue
+        if buffer[position] == ']':
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            read_more()  # The element continues in the next chunk
+            continue
+        if end == len(buffer) and not eof:
+            read_more()  # A number or literal at the end of the chunk may not be complete yet
+            continue
+
+        position = end
+        yield item
+
+
+def iter_student_records():
+    """
+    Yield the saved student dictionaries with the change journal applied.
+
+    Purpose:
+        Streams the snapshot in 'data/students.json' record by record, replacing or skipping the students changed in the journal,
+        and then yields the students that were only added through the journal.
+
+    Example:
+        for student_dict in iter_student_records():
+            print(student_dict['fname'])
+
+    Exceptions:
+        - Raises FileNotFoundError if neither the snapshot nor the journal exists.
+    """
+    journal_records = read_student_journal()
+
+    try:
+        file = open(STUDENTS_FILE, 'r')
+    except FileNotFoundError:
+        if not os.path.exists(STUDENTS_JOURNAL_FILE):
+            raise
+        file = None  # Only the journal exists, e.g. the first students were saved in journal mode
+
+    if file is not None:
+        with file:
+            for student_dict in iter_json_array(file):
+                student_id = student_dict['student_id']
+                if student_id in journal_records:
+                    student_dict = journal_records.pop(student_id)
+                    if student_dict is None:
+                        continue  # Deleted since the snapshot
+                yield student_dict
+
+    # Students added since the snapshot
+    for student_dict in journal_records.values():
+        if student_dict is not None:
+            yield student_dict
+
+
+def load_guardian(guardian_id, guardian_dict):
+    # Adds a saved guardian to the guardian registry under their saved guardian ID.
+    guardian_registry.add(ParentGuardian(
+        fname=guardian_dict.get('fname'),
+        lname=guardian_dict.get('lname'),
+        contact_number=guardian_dict.get('contact_number'),
+        contact_email=guardian_dict.get('contact_email'),
+        guardian_id=int(guardian_id)
+    ))
+
+
+def load_guardians():
+    """
+    Load the guardians table from 'data/guardians.json' into the guardian registry.
+
+    Purpose:
+        Creates one ParentGuardian instance per saved guardian, so every student referring to the same guardian ID
+        (e.g. siblings) shares that instance when the students are loaded.
+
+    JSON Input Example ('data/guardians.json'):
+        {"1": {"fname": "Jane", "lname": "Doe", "contact_number": "0412345678", "contact_email": "jane.doe@example.com"}}
+    """
+    try:
+        with open(GUARDIANS_FILE, 'r') as file:
+            guardians_data = json.load(file)
+    except FileNotFoundError:
+        return  # Students saved before guardians had their own table carry their guardian inline
+    for guardian_id, guardian_dict in guardians_data.items():
+        load_guardian(guardian_id, guardian_dict)
+
+
+def student_from_dict(student_dict):
+    """
+    Recreate a Student from a saved student dictionary and attach their ParentGuardian.
+
+    Purpose:
+        The guardian is looked up in the guardian registry by guardian ID, so siblings share one ParentGuardian instance.
+        Records saved before guardians had their own table, or read from the SQLite backend, carry the guardian's details
+        inline instead; those are matched by details so siblings still share one instance.
+
+    Arguments:
+        student_dict (dict): A student dictionary as written by `student_to_dict`.
+
+    Returns:
+        Student: The student with their guardian attached and the saved student ID.
+    """
+    if 'guardian_id' in student_dict:
+        guardian = guardian_registry.get(student_dict['guardian_id'])
+    else:
+        guardian_dict = student_dict.get('guardian', {})
+        guardian = guardian_registry.get_or_add(
+            guardian_dict.get('fname'),
+            guardian_dict.get('lname'),
+            guardian_dict.get('contact_number'),
+            guardian_dict.get('contact_email')
+        )
+    
+    # Create Student with the student_id from the loaded data
+    student = Student(
+        fname=student_dict['fname'],
+        lname=student_dict['lname'],
+        birthday=student_dict['birthday'],
+        allergies=student_dict.get('allergies', []),
+        student_id=student_dict['student_id']  # Set the ID directly from loaded data
+    )
+    
+    student.guardian = guardian  # Associate the guardian with the student
+    return student
+
+
+def load_classrooms():
+    """
+    Load the classroom configuration from 'data/classrooms.json' into a ClassroomRegistry.
+
+    Purpose: Lets each site configure its own rooms, age ranges and capacities without changing the code.
+    If the file does not exist, the default Babies, Toddlers and Kindergarten rooms are used (see DEFAULT_CLASSROOMS in classes/classrooms.py).
+
+    Returns:
+        ClassroomRegistry: The classrooms in the configured order, which is the order they are offered to new students.
+
+    JSON Input Example ('data/classrooms.json'):
+        [
+            {"name": "Babies Room (0-2 years)", "min_age": 0, "max_age": 2, "capacity": 12},
+            {"name": "Toddlers Room (2-3 years)", "min_age": 2, "max_age": 3, "capacity": null}
+        ]
+    """
+    try:
+        with open(CLASSROOMS_FILE, 'r') as file:
+            return ClassroomRegistry.from_config(json.load(file))
+    except FileNotFoundError:
+        return ClassroomRegistry.from_config(DEFAULT_CLASSROOMS)
+
+
+def load_students(students, classrooms, progress=None, connection=None, report=print):
     """
     Load student data from a JSON file and populate the global students list.
 
     Purpose: Reads student data from a JSON file, reconstructs Student and ParentGuardian objects,
     and assigns students to their appropriate classrooms based on their age.
 
-    It reads the data from 'data/students.json', recreating Student and ParentGuardian instances from the loaded data.
-    It then appends each student to the global students list and assigns each student to the correct classroom using `assign_student`.
+    It first loads the guardians table from 'data/guardians.json', so siblings share one ParentGuardian instance.
+    It then streams the data from 'data/students.json' one record at a time, applying any changes saved to
+    'data/students_journal.jsonl' since then, so only one record is parsed and built at a time.
+    Each student is appended to the global students list as soon as it is read, rather than after the whole file has
+    been parsed. Once every record is read, all students are assigned to the correct classroom for their age in one
+    pass with `reassign_students`, which gives the same classrooms as `assign_student` without capacity limits.
+    Each loaded student ID is also marked as used in the student ID allocator, so newly added students get a different ID.
 
     Arguments:
         1. students (list): The global list of Student instances to populate.
         2. classrooms (list): A list of Classroom instances used for student assignment.
+        3. progress (callable, optional): Called with the number of students loaded so far after each student. Default is None.
+        4. connection (sqlite3.Connection, optional): Load from the SQLite storage backend instead of the JSON files. Default is None.
+        5. report (callable, optional): Called with each message about the load, e.g. a missing data file. Default is print.
 
     Example: load_students(students, classrooms) -> Loads student data and populates the global students list and classrooms.
+             load_students(students, classrooms, progress=lambda count: print(count, end="\r")) -> Also reports progress.
 
     JSON Input Example ('data/students.json'):
         [
@@ -105,15 +519,20 @@ def load_students(students, classrooms):
                 "lname": "Doe",
                 "birthday": "2015-03-25",
                 "allergies": ["Peanuts", "Shellfish"],
-                "guardian": {
-                    "fname": "Jane",
-                    "lname": "Doe",
-                    "contact_number": "0412345678",
-                    "contact_email": "jane.doe@example.com"
-                }
+                "guardian_id": 1
             }
         ]
 
+    JSON Input Example ('data/guardians.json'):
+        {
+            "1": {
+                "fname": "Jane",
+                "lname": "Doe",
+                "contact_number": "0412345678",
+                "contact_email": "jane.doe@example.com"
+            }
+        }
+
         Outcome:
             - A Student instance is created with the attributes:
                 - student_id = 1
@@ -121,110 +540,226 @@ def load_students(students, classrooms):
                 - lname = "Doe"
                 - birthday = "2015-03-25"
                 - allergies = ["Peanuts", "Shellfish"]
-            - A ParentGuardian instance is associated with this student:
+            - The ParentGuardian instance with guardian ID 1 is associated with this student (and any sibling referring to it):
                 - fname = "Jane"
                 - lname = "Doe"
                 - contact_number = "0412345678"
                 - contact_email = "jane.doe@example.com"
     """
     try:
-        with open('data/students.json', 'r') as file:
-            students_data = json.load(file)
-            for student_dict in students_data:
-                guardian_dict = student_dict.get('guardian', {})
-                guardian = ParentGuardian(
-                    fname=guardian_dict.get('fname'),
-                    lname=guardian_dict.get('lname'),
-                    contact_number=guardian_dict.get('contact_number'),
-                    contact_email=guardian_dict.get('contact_email')
-                )
-                
-                # Create Student with the student_id from the loaded data
-                student = Student(
-                    fname=student_dict['fname'],
-                    lname=student_dict['lname'],
-                    birthday=student_dict['birthday'],
-                    allergies=student_dict.get('allergies', []),
-                    student_id=student_dict['student_id']  # Set the ID directly from loaded data
-                )
-                
-                student.guardian = guardian  # Associate the guardian with the student
-                students.append(student)  # Append to the global students list
-                
-                # Assign the student to the correct classroom based on age
-                assign_student(classrooms, student, silent=True)  # This should not change student_id when loading students and assigning them again
+        if connection is not None:
+            student_records = iter_student_records_from_database(connection)
+        else:
+            load_guardians()
+            student_records = iter_student_records()
+
+        loaded_count = 0
+        saved_classrooms = {}  # Each student's classroom saved in the database, keyed by student ID
+        for student_dict in student_records:
+            student = student_from_dict(student_dict)
+            student_ids.mark_used(student.student_id)  # Seed the ID allocator so new students never reuse a loaded ID
+            students.append(student)  # Append to the global students list
+            if connection is not None:
+                saved_classrooms[student.student_id] = student_dict.get('classroom')
+
+            loaded_count += 1
+            if progress:
+                progress(loaded_count)
 
     except FileNotFoundError:
-        print("No previous student data found. Starting fresh.")
+        report("No previous student data found. Starting fresh.")
     except Exception as e:
-        print(f"An error occurred while loading students: {e}")
+        report(f"An error occurred while loading students: {e}")
+
+    # Assign every loaded student (including those read before any error) to the correct classroom for their age in one pass
+    for student in reassign_students(students, classrooms):
+        clear_student_details(student)  # Not enrolled, as with assign_student
+    moved_students = []  # Students whose saved classroom in the database no longer matches their age
+    for student in students:
+        if student.classroom is None:
+            continue
+        allergen_index.add(student)  # Index their allergies for the kitchen's allergy listings
+        name_index.add(student)  # Index their and their guardian's names for name search
+        if connection is not None and student.classroom.get_name() != saved_classrooms.get(student.student_id):
+            moved_students.append((student.classroom.get_name(), student.student_id))
+
+    if moved_students:
+        update_classrooms_in_database(connection, moved_students)
 
 
 # Start of kitchen file functions
 
-def save_menu(kitchen):
+# Folder holding one JSON file per week of the menu, the dish table shared by every week, the rotating menu
+# repeated by a range of weeks, and the single file used before menus were split by week.
+MENU_FOLDER = 'data/kitchen'
+MENU_DISHES_FILE = 'data/kitchen_dishes.json'
+MENU_ROTATION_FILE = 'data/kitchen_rotation.json'
+LEGACY_MENU_FILE = 'data/kitchen.json'
+
+# The allergens in each dish, used to check the menu against the students' allergies (kept in JSON with either storage backend).
+DISH_ALLERGENS_FILE = 'data/dish_allergens.json'
+
+
+def write_menu_weeks(menu, weeks):
+    """
+    Write the dish table, the rotation and the given weeks of a compact menu to their JSON files.
+
+    Purpose:
+        Writes the dishes added to the dish table since it was last saved, the rotation if it changed, then each of
+        the given weeks: its 21 dish IDs, or for a week following the rotation only the days that differ from it.
+        The dish table is written first, so a saved week never refers to a dish missing from the saved table.
+        The file of a week with nothing of its own to save (e.g. a week that just repeats the rotation) is removed,
+        as is the file of every week deleted since the last save (see WeekMenuFiles.deleted_weeks), even if the
+        deletion was not recorded in the given weeks. Weeks without a menu or a file are skipped.
+
+    Arguments:
+        menu (WeekMenuFiles): The menu to save.
+        weeks (iterable): The week number strings to write, e.g. Kitchen.changed_weeks.
+
+    Example Usage:
+        write_menu_weeks(kitchen.menu, {"1"}) -> Writes 'data/kitchen_dishes.json' (if new dishes were added) and 'data/kitchen/week_1.json'.
     """
-    Save the kitchen menu to a JSON file.
-    Purpose:  Serializes and saves the menu from the Kitchen instance to a JSON file.
-    It does this by converting the menu dictionary to a JSON-compatible format and writing the menu data to 'data/kitchen.json'.
+    os.makedirs(menu.folder, exist_ok=True)
+    if len(menu.dishes) > menu.saved_dish_count:
+        write_file_atomically(menu.dishes_path, json.dumps(menu.dishes, separators=(',', ':')))
+        menu.saved_dish_count = len(menu.dishes)
+    if menu.rotation_changed and menu.rotation_path is not None:
+        rotation = menu.rotation_record()
+        if rotation is not None:
+            write_file_atomically(menu.rotation_path, json.dumps(rotation, separators=(',', ':')))
+        elif os.path.exists(menu.rotation_path):
+            os.remove(menu.rotation_path)
+        menu.rotation_changed = False
+    for week in set(weeks) | menu.deleted_weeks:
+        saved_week = menu.saved_week(week) if week in menu else None
+        path = menu_week_path(menu.folder, week)
+        if saved_week is not None:
+            write_file_atomically(path, json.dumps(saved_week, separators=(',', ':')))
+        elif os.path.exists(path):
+            os.remove(path)
+    menu.deleted_weeks.clear()
+
+
+def save_menu(kitchen, connection=None):
+    """
+    Save the changed weeks of the kitchen menu to JSON files.
+    Purpose:  Serializes and saves the menu from the Kitchen instance, one JSON file per week in 'data/kitchen/' (e.g. 'week_1.json').
+    Each week is saved in compact form: the IDs of its 21 dishes (7 days of breakfast, lunch and afternoon tea),
+    with the dish names stored once in 'data/kitchen_dishes.json' (see `CompactMenu` in classes/kitchen.py).
+    A rotating menu is saved once in 'data/kitchen_rotation.json', and a week repeating it only saves the days that differ.
+    Only the weeks changed since the menu was loaded or last saved (see `Kitchen.changed_weeks`) are written,
+    so the cost of a save does not grow with the number of planned weeks, and a save with no changes does no I/O.
+    The allergens in each dish are saved to 'data/dish_allergens.json' if they changed, with either storage backend.
+    Each file is replaced with `write_file_atomically`, so a crash never leaves a truncated week.
     Arguments: The Kitchen instance containing the menu to save.
+        connection (sqlite3.Connection, optional): With the SQLite storage backend each day is already saved by
+            `add_menu_for_day` and `delete_menu_for_day`, so nothing is rewritten. Default is None.
 
     Example with usage:
-        save_menu(kitchen) -> Saves the current kitchen menu to a JSON file.
+        save_menu(kitchen) -> Saves the changed weeks of the kitchen menu to 'data/kitchen/week_<number>.json'.
 
-    JSON Output Example:
-        {
-            "1": {
-                "Monday": {
-                    "Breakfast": "Pancakes",
-                    "Lunch": "Spaghetti",
-                    "Afternoon Tea": "Fruit Salad"
-                },
-                "Tuesday": {
-                    "Breakfast": "Oatmeal",
-                    "Lunch": "Chicken Nuggets",
-                    "Afternoon Tea": "Cookies"
-                }
-            }
-        }
+    JSON Output Example (Monday to Tuesday of Week 1 set, the rest of the week empty):
+        'data/kitchen_dishes.json':
+            [null,"Pancakes","Spaghetti","Fruit Salad","Oatmeal","Chicken Nuggets","Cookies"]
+        'data/kitchen/week_1.json':
+            [1,2,3,4,5,6,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0]
 
     """
-    
-    with open('data/kitchen.json', 'w') as file:
-        json.dump(kitchen.menu, file, indent=4)
-   
+    if kitchen.dish_allergens_changed:
+        save_dish_allergens(kitchen)
+
+    deleted_weeks = kitchen.menu.deleted_weeks if isinstance(kitchen.menu, WeekMenuFiles) else set()
+    if connection is not None or not (kitchen.changed_weeks or deleted_weeks):
+        kitchen.changed_weeks.clear()
+        return  # Nothing changed, or every change was already committed to the database
+
+    if not isinstance(kitchen.menu, WeekMenuFiles):
+        # A menu built before any menu was loaded is moved into the weekly files, sharing their dish table
+        menu_files = WeekMenuFiles(MENU_FOLDER, MENU_DISHES_FILE, MENU_ROTATION_FILE)
+        for week, days in kitchen.menu.items():
+            menu_files[week] = days
+        if kitchen.menu.cycle_length:
+            menu_files.set_rotation(kitchen.menu.cycle_first_week, kitchen.menu.cycle_length, kitchen.menu.cycle_last_week)
+        kitchen.menu = menu_files
 
+    write_menu_weeks(kitchen.menu, kitchen.changed_weeks)
+    kitchen.changed_weeks.clear()
 
-def load_menu(kitchen):
+
+def save_dish_allergens(kitchen):
+    """
+    Save the allergens in each dish to 'data/dish_allergens.json'.
+
+    Arguments:
+        kitchen (Kitchen): The Kitchen instance whose `dish_allergens` are saved.
+
+    Example Usage:
+        save_dish_allergens(kitchen) -> Writes {"Peanut Butter Toast": ["Peanut", "Wheat"]} to 'data/dish_allergens.json'.
     """
-    Load the kitchen menu from a JSON file.
+    write_file_atomically(DISH_ALLERGENS_FILE, json.dumps(kitchen.dish_allergens, indent=4))
+    kitchen.dish_allergens_changed = False
+
+
+def load_dish_allergens(kitchen):
+    """
+    Load the allergens in each dish from 'data/dish_allergens.json' into the Kitchen instance.
+    No allergens are set for any dish if the file does not exist yet.
+
+    Arguments:
+        kitchen (Kitchen): The Kitchen instance whose `dish_allergens` are loaded.
+    """
+    try:
+        with open(DISH_ALLERGENS_FILE, 'r') as file:
+            kitchen.dish_allergens = json.load(file)
+    except FileNotFoundError:
+        kitchen.dish_allergens = {}
+    kitchen.dish_allergens_changed = False
+
+
+def split_legacy_menu_file():
+    """
+    Move a menu saved in the single 'data/kitchen.json' file into one file per week.
+
+    Purpose:
+        Menus saved before the menu was split by week are converted once, the first time the menu is loaded.
+        The old file is removed after every week has been written, so the weekly files are the only copy.
+    """
+    with open(LEGACY_MENU_FILE, 'r') as file:
+        loaded_menu = json.load(file)
+
+    menu = WeekMenuFiles(MENU_FOLDER, MENU_DISHES_FILE, MENU_ROTATION_FILE)
+    for week, days in loaded_menu.items():
+        menu[week] = days
+    write_menu_weeks(menu, list(menu))
+    os.remove(LEGACY_MENU_FILE)
+
+
+def load_menu(kitchen, connection=None, report=print):
+    """
+    Load the kitchen menu from its weekly JSON files.
 
     Purpose:
-        Reads the menu data from a JSON file and populates the `menu` attribute of the Kitchen instance.
-        This ensures that the saved menu is reloaded correctly for continued use.
+        Points the `menu` attribute of the Kitchen instance at the weekly files in 'data/kitchen/' and loads the dish table.
+        No week is read here: each week is read the first time it is accessed (see `WeekMenuFiles` in classes/kitchen.py),
+        so startup time does not grow with the number of planned weeks.
+        A menu saved in the older single 'data/kitchen.json' file is split into weekly files first.
+        Weekly files saved before the menu was made compact (nested day and meal dicts) are still read as they are.
+        The allergens in each dish are loaded from 'data/dish_allergens.json' with either storage backend.
 
     Arguments:
         kitchen (Kitchen): The Kitchen instance whose `menu` attribute will be populated.
+        connection (sqlite3.Connection, optional): Load from the SQLite storage backend instead of the JSON files. Default is None.
+        report (callable, optional): Called with each message about the load, e.g. a missing menu. Default is print.
 
     Example:
-        JSON Input Example ('data/kitchen.json'):
-        {
-            "1": {
-                "Monday": {
-                    "Breakfast": "Pancakes",
-                    "Lunch": "Grilled Cheese",
-                    "Afternoon Tea": "Fruit Salad"
-                },
-                "Tuesday": {
-                    "Breakfast": "Oatmeal",
-                    "Lunch": "Chicken Wrap",
-                    "Afternoon Tea": "Yogurt"
-                }
-            }
-        }
+        JSON Input Example:
+            'data/kitchen_dishes.json':
+                [null,"Pancakes","Grilled Cheese","Fruit Salad","Oatmeal","Chicken Wrap","Yogurt"]
+            'data/kitchen/week_1.json':
+                [1,2,3,4,5,6,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0]
 
         Outcome:
-            - Week 1's menu is loaded into the Kitchen instance with:
+            - The first time kitchen.menu["1"] is accessed, Week 1's menu is loaded with:
                 - Monday:
                     - Breakfast: Pancakes
                     - Lunch: Grilled Cheese
@@ -235,34 +770,29 @@ def load_menu(kitchen):
                     - Afternoon Tea: Yogurt
 
     Exceptions:
-        - If the file does not exist, the function starts with an empty menu.
+        - If no menu has been saved, the function starts with an empty menu.
             e.g. "No saved menu found. Starting with an empty menu."
-        - If an error occurs while loading, it prints an error message.
+        - If an error occurs while splitting an older kitchen.json, it reports an error message.
           e.g. An error occurred while loading the menu: Expecting property name enclosed in double quotes: line 1 column 2 (char 1)
 
     """
     try:
-        with open('data/kitchen.json', 'r') as file:
-            loaded_menu = json.load(file)
-
-        # Use integer keys for mapping back to day names
-        day_map = {1: "Monday", 2: "Tuesday", 3: "Wednesday", 4: "Thursday", 5: "Friday"}
-        kitchen.menu = {}
-        
-        for week, days in loaded_menu.items():
-            kitchen.menu[week] = {}
-            for day, meals in days.items():
-                # Use the correct day mapping
-                kitchen.menu[week][day] = meals
-        
-    except FileNotFoundError:
-        print("No saved menu found. Starting with an empty menu.")
-        
+        load_dish_allergens(kitchen)
     except Exception as e:
-        print(f"An error occurred while loading the menu: {e}")
+        report(f"An error occurred while loading the dish allergens: {e}")
 
+    if connection is not None:
+        load_menu_from_database(connection, kitchen)
+        return
 
+    try:
+        if os.path.exists(LEGACY_MENU_FILE):
+            split_legacy_menu_file()
+        elif not os.path.isdir(MENU_FOLDER):
+            report("No saved menu found. Starting with an empty menu.")
 
-# Example:
-#     save_menu(kitchen) -> Saves the current kitchen menu to a JSON file.
+        kitchen.menu = WeekMenuFiles(MENU_FOLDER, MENU_DISHES_FILE, MENU_ROTATION_FILE)
+        kitchen.changed_weeks.clear()
 
+    except Exception as e:
+        report(f"An error occurred while loading the menu: {e}")
@@ -1,14 +1,20 @@
-from colored import Style, stylize, attr, fg # Library for terminal text styling and colors.
-from prettytable import PrettyTable # Library for creating formatted tables in the terminal, for example, displaying students with allergies in a neat table.
+from datetime import date, timedelta  # Standard library used to list the menu for a range of dates.
 
-from constants import color3, color4, color5  # Predefined color constants for consistent styling.
+from constants import color3, color4, color5, color_reset, OUTPUT_FORMAT  # Predefined color constants for consistent styling, and the default listing format.
+from functions.database_functions import save_menu_day_to_database, save_menu_to_database, find_students_with_allergies_in_database  # SQLite storage backend.
+from classes.allergen_index import allergen_index  # Index of the students allergic to each allergen.
+from classes.exposure_checker import exposure_checker  # Checks the menu against the students' allergies.
+from classes.kitchen import MENU_DAYS, MENU_MEALS  # The days and meals of each week of the menu.
+from functions.output_functions import write_in_chunks, new_styled_table, write_rows  # Writes long listings in chunks, creates tables in the application's table style, and writes plain, TSV and JSON Lines listings.
+from classes.render_cache import render_cache  # Reuses the allergy listing rendered since the students last changed.
 
-def add_menu_for_day(kitchen):
+def add_menu_for_day(kitchen, connection=None):
     #  Prompt the user to add or update the menu for a specific day in a given week.
     # Purpose: It allows the user to set or update dishes for breakfast, lunch, and afternoon tea for a specific day by 
     # updating the `menu` dictionary in the Kitchen instance.
     
     # Arguments: kitchen (Kitchen): The Kitchen instance where the menu will be updated.
+    #            connection (sqlite3.Connection, optional): With the SQLite storage backend, the day is also saved to the database.
 
     # Example of how it works/is used: 
     #     1. Prompts the user for the week number and day of the week.
@@ -21,12 +27,12 @@ def add_menu_for_day(kitchen):
         # Prompt for week number
         week_input = input("Enter the week number (1-52): ").strip()
         if not week_input:
-            raise ValueError(f"{color5}Week number cannot be empty.{Style.reset}")
+            raise ValueError(f"{color5}Week number cannot be empty.{color_reset}")
         week = int(week_input)
 
         # Ensure week is within valid range (1-52)
         if week < 1 or week > 52:
-            raise ValueError(f"{color5}Please enter a valid week number between 1 and 52.{Style.reset}\n")
+            raise ValueError(f"{color5}Please enter a valid week number between 1 and 52.{color_reset}\n")
 
         # Day mapping
         day_map = {1: "Monday", 2: "Tuesday", 3: "Wednesday", 4: "Thursday", 5: "Friday"}
@@ -34,23 +40,23 @@ def add_menu_for_day(kitchen):
         # Prompt for day of the week
         day_input = input("Enter the day of the week (1 = Monday,..,5 = Friday): ").strip()
         if not day_input:
-            raise ValueError(f"{color5}Day cannot be empty.{Style.reset}\n")
+            raise ValueError(f"{color5}Day cannot be empty.{color_reset}\n")
         day = int(day_input)
         
         if day not in day_map:
-            raise ValueError(f"{color5}Please enter a number between 1 and 5 (weekdays only).{Style.reset}\n")
+            raise ValueError(f"{color5}Please enter a number between 1 and 5 (weekdays only).{color_reset}\n")
         day = day_map[day]
 
-        print(f"\n{color4}Adding/updating menu for Week {week}, Day: {day}{Style.reset}\n")
+        print(f"\n{color4}Adding/updating menu for Week {week}, Day: {day}{color_reset}\n")
 
     except ValueError as error:
-        print(f"{color5}{error}{Style.reset}")
+        print(f"{color5}{error}{color_reset}")
         return  
     except (EOFError, KeyboardInterrupt):
-        print(f"\n{color5}Input interrupted.{Style.reset}")
+        print(f"\n{color5}Input interrupted.{color_reset}")
         return
     except Exception as e:
-        print(f"\n{color5}An unexpected error occurred{Style.reset}")
+        print(f"\n{color5}An unexpected error occurred{color_reset}")
         return
 
     # Ask the user to input dishes for each meal
@@ -59,130 +65,344 @@ def add_menu_for_day(kitchen):
         lunch = input("Enter the lunch dish: ").strip().title()
         afternoon_tea = input("Enter the afternoon tea dish: ").strip().title()
     except (EOFError, KeyboardInterrupt):
-        print(f"\n{color5}Input interrupted.{Style.reset}")
+        print(f"\n{color5}Input interrupted.{color_reset}")
         return
     except Exception as e:
-        print(f"\n{color5}An unexpected error occurred{Style.reset}")
+        print(f"\n{color5}An unexpected error occurred{color_reset}")
         return
 
     week_str = str(week)
-    if week_str not in kitchen.menu:
+    set_menu_for_day(kitchen, week_str, day, [breakfast, lunch, afternoon_tea], connection=connection)
+
+    print(f"\n{color3}Menu for {day} in Week {week} has been updated.{color_reset}")
+
+    # Warn about students allergic to the dishes just set, rechecking only the changed meals
+    exposure_checker.refresh(kitchen)
+    day_conflicts = exposure_checker.conflicts(week_str, day)
+    if day_conflicts:
+        print_allergy_conflicts(day_conflicts, f"Warning: students allergic to the menu for {day} in Week {week}:")
+
+def set_menu_for_day(kitchen, week, day, dishes, connection=None):
+    # Set the dishes for one day of the menu, without prompting, e.g. for add_menu_for_day or a batch "menu set" command.
+
+    # Arguments:
+    #     kitchen (Kitchen): The Kitchen instance where the menu will be updated.
+    #     week (str): The week number, e.g. "5".
+    #     day (str): The day of the week, e.g. "Monday".
+    #     dishes (list): The breakfast, lunch and afternoon tea dishes, in that order ("" for no dish).
+    #     connection (sqlite3.Connection, optional): With the SQLite storage backend, the day is also saved to the database.
+
+    # Example: set_menu_for_day(kitchen, "5", "Monday", ["Pancakes", "Pasta", "Fruit"])
+    if week not in kitchen.menu:
         # Check if the specified week exists in the kitchen's menu.
-        # If the week is not present, initialize a new entry in the `menu` dictionary.
-        kitchen.menu[week_str] = {
-            "Monday": {"Breakfast": None, "Lunch": None, "Afternoon Tea": None},
-            "Tuesday": {"Breakfast": None, "Lunch": None, "Afternoon Tea": None},
-            "Wednesday": {"Breakfast": None, "Lunch": None, "Afternoon Tea": None},
-            "Thursday": {"Breakfast": None, "Lunch": None, "Afternoon Tea": None},
-            "Friday": {"Breakfast": None, "Lunch": None, "Afternoon Tea": None}
-        }
+        # If the week is not present, add it with no dishes set for any day.
+        kitchen.menu[week] = {}
+
+    for meal, dish in zip(MENU_MEALS, dishes):
+        kitchen.menu[week][day][meal] = dish
+    kitchen.mark_week_changed(week)  # Only changed weeks are saved
+
+    if connection is not None:
+        save_menu_day_with_repeats(kitchen, week, day, connection)
+
+
+def save_menu_day_with_repeats(kitchen, week, day, connection):
+    # Save a day of the menu to the database, with the same day of every week that repeats it from the rotation.
+    # Purpose: The database stores each day's dishes rather than the rotation, so a change to a day of the rotation's
+    # first weeks is also written to the weeks repeating it, which would otherwise keep the old dishes after a reload.
+
+    # Example: save_menu_day_with_repeats(kitchen, "1", "Monday", connection) -> Saves Monday of weeks 1, 3, 5, ... in a 2 week rotation.
+    meals = dict(kitchen.menu[week][day])
+    for repeating_week in kitchen.menu.weeks_repeating_day(week, day):
+        save_menu_day_to_database(connection, repeating_week, day, meals)
+
+
+def menu_weeks_in_range(first_week, last_week):
+    # Generate the weekdays of a range of weeks, in order.
+    # Yields: tuple: (week, day, None), e.g. ("1", "Monday", None), for Monday to Friday of each week.
+    for week in range(first_week, last_week + 1):
+        for day in MENU_DAYS[:5]:
+            yield str(week), day, None
+
 
-    kitchen.menu[week_str][day]["Breakfast"] = breakfast
-    kitchen.menu[week_str][day]["Lunch"] = lunch
-    kitchen.menu[week_str][day]["Afternoon Tea"] = afternoon_tea
+def menu_dates_in_range(first_date, last_date):
+    # Generate the weekdays between two dates (inclusive), with the week of the year each falls in (ISO week number).
+    # Yields: tuple: (week, day, date), e.g. ("2", "Monday", date(2026, 1, 5)). Weekends are skipped.
+    day_date = first_date
+    while day_date <= last_date:
+        if day_date.weekday() < 5:
+            yield str(day_date.isocalendar()[1]), MENU_DAYS[day_date.weekday()], day_date
+        day_date += timedelta(days=1)
 
-    print(f"\n{color3}Menu for {day} in Week {week} has been updated.{Style.reset}")
 
-def list_menu_for_week(kitchen):
-    # Display the menu for all weekdays in a given week.
+def parse_menu_range(text):
+    # Parse the weeks or dates typed at the List Menu prompt.
+    # Arguments: text (str): A week ("5"), a range of weeks ("1-13") or a range of dates ("2026-01-05 to 2026-03-27").
+    # Returns: generator: The (week, day, date) of each weekday in the range, from menu_weeks_in_range or menu_dates_in_range.
+    # Raises: ValueError: If the text is not a valid week, range of weeks or range of dates.
+    if " to " in text:
+        first_text, last_text = (part.strip() for part in text.split(" to ", 1))
+        first_date, last_date = date.fromisoformat(first_text), date.fromisoformat(last_text)
+        if last_date < first_date:
+            raise ValueError("The end date is before the start date.")
+        return menu_dates_in_range(first_date, last_date)
 
-    # Purpose: Retrieves and displays the menu for a specified week in a formatted layout.
+    first_text, _, last_text = text.partition("-")
+    first_week = int(first_text)
+    last_week = int(last_text) if last_text.strip() else first_week
+    if not 1 <= first_week <= last_week <= 52:
+        raise ValueError("Please enter weeks between 1 and 52, with the first week before the last.")
+    return menu_weeks_in_range(first_week, last_week)
 
-    # Arguments: kitchen (Kitchen): The Kitchen instance containing the menu to display.
+
+def menu_range_lines(kitchen, days, colors=True):
+    # Generate the formatted lines of the menu for each day in a range, one line at a time.
+
+    # Purpose: Produces the listing lazily, reading each week of the menu only when its first day is reached, so a
+    # whole year can be written with write_in_chunks without building the listing in memory.
+
+    # Arguments:
+    #     kitchen (Kitchen): The Kitchen instance containing the menu.
+    #     days (iterable): (week, day, date) tuples, from menu_weeks_in_range or menu_dates_in_range.
+    #     colors (bool, optional): Whether to color the headings for the terminal. Default is True; use False for files.
+
+    # Yields: str: Each line of the listing, ending with a newline.
+    week_color, day_color, reset = (color3, color4, color_reset) if colors else ("", "", "")
+    current_week = None
+    dish_ids = None
+    for week, day, day_date in days:
+        if week != current_week:
+            current_week = week
+            dish_ids = kitchen.menu.week_slots(week) if week in kitchen.menu else None
+            yield f"\n{week_color}--- Menu for Week {week} ---{reset}\n"
+            if dish_ids is None:
+                yield f"{week_color}No menu found for Week {week}.{reset}\n"
+            elif kitchen.menu.cycle_week(week):
+                yield f"{day_color}Week {week} follows week {kitchen.menu.cycle_week(week)} of the rotating menu.{reset}\n"
+        if dish_ids is None:
+            continue
+        label = f"{day} {day_date.isoformat()}" if day_date else day
+        yield f"{day_color}\nMenu for {label}:{reset}\n"
+        start = MENU_DAYS.index(day) * len(MENU_MEALS)
+        for meal, dish_id in zip(MENU_MEALS, dish_ids[start:start + len(MENU_MEALS)]):
+            yield f"  {meal}: {kitchen.menu.dish(dish_id) or 'No dishes set.'}\n"
+
+
+def menu_range_rows(kitchen, days):
+    # Generate a row of plain strings for each meal of each day in a range, for the plain, TSV and JSON Lines listings.
+    # Weeks without a menu are skipped, and meals without a dish have an empty dish.
+    # Arguments: the same as menu_range_lines.
+    # Yields: list: The week, day, date (empty for a range of weeks), meal and dish, matching MENU_LISTING_HEADERS.
+    # Example: next(menu_range_rows(kitchen, menu_weeks_in_range(1, 1))) -> ["1", "Monday", "", "Breakfast", "Pancakes"]
+    current_week = None
+    dish_ids = None
+    for week, day, day_date in days:
+        if week != current_week:
+            current_week = week
+            dish_ids = kitchen.menu.week_slots(week) if week in kitchen.menu else None
+        if dish_ids is None:
+            continue
+        start = MENU_DAYS.index(day) * len(MENU_MEALS)
+        for meal, dish_id in zip(MENU_MEALS, dish_ids[start:start + len(MENU_MEALS)]):
+            yield [week, day, day_date.isoformat() if day_date else "", meal, kitchen.menu.dish(dish_id) or ""]
+
+
+def list_menu_for_week(kitchen, output_format=None):
+    # Display the menu for all weekdays in a given week, a range of weeks, or a range of dates.
+
+    # Purpose: Retrieves and displays the menu in a formatted layout. A range such as a term or the whole year is
+    # listed in one go: its lines are generated lazily (see menu_range_lines) and written in chunks, to the terminal
+    # or to a file, so even a full year is a single fast operation with flat memory use.
+
+    # Arguments:
+    #     kitchen (Kitchen): The Kitchen instance containing the menu to display.
+    #     output_format (str, optional): "table", "plain", "tsv" or "jsonl". Defaults to OUTPUT_FORMAT in constants.py.
+    #         Any format other than "table" writes one row per meal (see menu_range_rows) instead of a heading per day.
 
     # Example of how it works/is used: 
-    #     1. Prompts the user for the week number.
-    #     2. Checks if a menu exists for the week.
-    #     3. Displays the menu for each weekday with breakfast, lunch, and afternoon tea.
-    #     4. Exception Handling: Handles invalid week inputs and missing menu data and safely exits if input is interrupted.
+    #     1. Prompts the user for a week number (e.g. 5), a range of weeks (e.g. 1-13) or a range of dates
+    #        (e.g. 2026-01-05 to 2026-03-27).
+    #     2. For a range, prompts for a file to save the listing to, or Enter to show it here.
+    #     3. Displays the menu for each weekday with breakfast, lunch, and afternoon tea, or notes weeks with no menu.
+    #     4. Exception Handling: Handles invalid inputs and missing menu data and safely exits if input is interrupted.
     try:
-        week = int(input("Enter the week number: "))
+        range_input = input("Enter the week number, a range of weeks (e.g. 1-13) or dates (e.g. 2026-01-05 to 2026-03-27): ").strip()
+        days = parse_menu_range(range_input)
+        file_name = ""
+        if not range_input.isdigit():
+            file_name = input("Enter a file name to save the menu to, or press Enter to show it here: ").strip()
     except ValueError:
-        print(f"{color5}Invalid input. Please enter a valid week number (integer).{Style.reset}")
+        print(f"{color5}Invalid input. Please enter a valid week number (1-52), a range of weeks such as 1-13, or dates such as 2026-01-05 to 2026-03-27.{color_reset}")
         return
     except (EOFError, KeyboardInterrupt):
-        print(f"\n{color5}Input interrupted.{Style.reset}")
+        print(f"\n{color5}Input interrupted.{color_reset}")
         return
     except Exception as e:
-        print(f"\n{color5}An unexpected error occurred{Style.reset}")
+        print(f"\n{color5}An unexpected error occurred{color_reset}")
         return
 
-    week_str = str(week)
-
-    if week_str not in kitchen.menu:
-        print(f"{color3}No menu found for Week {week}.{Style.reset}\n")
+    output_format = OUTPUT_FORMAT if output_format is None else output_format
+    if not file_name:
+        if output_format != "table":
+            write_rows(MENU_LISTING_HEADERS, menu_range_rows(kitchen, days), output_format, title="Menu:")
+        else:
+            write_in_chunks(menu_range_lines(kitchen, days))
         return
+    try:
+        with open(file_name, 'w') as file:
+            if output_format != "table":
+                write_rows(MENU_LISTING_HEADERS, menu_range_rows(kitchen, days), output_format, file, title="Menu:")
+            else:
+                write_in_chunks(menu_range_lines(kitchen, days, colors=False), file)
+    except OSError as error:
+        print(f"{color5}Could not save the menu to {file_name}: {error}{color_reset}")
+        return
+    print(f"\n{color3}Menu saved to {file_name}.{color_reset}")
 
-    days_of_week = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-
-    print(f"\n{color3}--- Menu for Week {week} ---{Style.reset}")
+# Columns of the allergy, allergen search and conflict listings in the plain, TSV and JSON Lines formats.
+ALLERGY_LISTING_HEADERS = ["Student ID", "Name", "Classroom", "Allergies"]
+CONFLICT_LISTING_HEADERS = ["Week", "Day", "Meal", "Dish"] + ALLERGY_LISTING_HEADERS
+MENU_LISTING_HEADERS = ["Week", "Day", "Date", "Meal", "Dish"]
 
-    for day in days_of_week:
-        if day in kitchen.menu[week_str]:
-            menu_for_day = kitchen.menu[week_str][day]
-            print(f"{color4}\nMenu for {day}:{Style.reset}")
-            print(f"  Breakfast: {menu_for_day['Breakfast'] or 'No dishes set.'}")
-            print(f"  Lunch: {menu_for_day['Lunch'] or 'No dishes set.'}")
-            print(f"  Afternoon Tea: {menu_for_day['Afternoon Tea'] or 'No dishes set.'}")
-        else:
-            print(f"No menu found for {day}.")
 
-def list_students_with_allergies(classrooms):
+def list_students_with_allergies(classrooms, connection=None, output_format=None, output=None):
 
     #  List all students with allergies, displaying their name, classroom, and allergies in a formatted table.
-    # Purpose: It iterates through all classrooms to find students with allergies and displays the student information (name, ID, classroom, and allergies) 
+    # Purpose: It looks up the students with allergies in the allergen index (see classes/allergen_index.py), rather than
+    # scanning every student in every classroom, and displays the student information (name, ID, classroom, and allergies)
     # in a color-coded and styled table.
 
     # Arguments:
     #     classrooms (list): A list of Classroom instances, each containing a list of students.
+    #     connection (sqlite3.Connection, optional): With the SQLite storage backend, only students with allergies are
+    #         read from the database's allergies table instead of scanning every classroom.
+    #     output_format (str, optional): "table", "plain", "tsv" or "jsonl". Defaults to OUTPUT_FORMAT in constants.py.
+    #     output (file, optional): The open file to write to. Defaults to the terminal.
 
     # Example of how it works/is used: 
-    #     1. Initializes a PrettyTable for displaying the information in a tabular format.
-    #     2. Iterates through each classroom and its students to find students with allergies using a nested for loop.
-    #     3. Populates and output the table with relevant student data.
-    #     4. Exception Handling: handles empty tables gracefully by providing a clear message if no students have allergies.
-
-    # Initialize the table
-    table = PrettyTable()
-
-    # Bold the headers and apply the spring_green_4 color
-    header_color = fg("blue") + attr("bold")
-    header_student_name_id = stylize("Student Name (Student ID)", header_color)
-    header_classroom = stylize("Classroom", header_color)
-    header_allergies = stylize("Allergies", header_color)
-
-    # Apply green color for table lines
-    table.horizontal_char = stylize("-", fg("spring_green_4"))
-    table.junction_char = stylize("+", fg("spring_green_4"))
-    table.vertical_char = stylize("|", fg("spring_green_4"))
-    
-    table.field_names = [header_student_name_id, header_classroom, header_allergies]
+    #     1. In the plain, TSV and JSON Lines formats, writes the rows from allergy_rows without a table and returns.
+    #     2. Prints the table rendered last time if no student was added, removed or moved since (see classes/render_cache.py),
+    #        otherwise builds a table for displaying the information in a tabular format.
+    #     3. Groups the indexed students with allergies by classroom, in the order of the classrooms list.
+    #     4. Populates and output the table with relevant student data.
+    #     5. Exception Handling: handles empty tables gracefully by providing a clear message if no students have allergies.
+
+    output_format = OUTPUT_FORMAT if output_format is None else output_format
+    if output_format != "table":
+        write_rows(ALLERGY_LISTING_HEADERS, allergy_rows(classrooms, connection), output_format, output, title="Students with allergies:")
+        return
 
-    for classroom in classrooms:
-        for student in classroom.students:
-            if student.allergies:  # If student has allergies
-                allergies = ', '.join(student.allergies)
-                name_id = f"{student.full_name} (ID: {student.get_formatted_id()})"
-                
-                # Add row to the table
-                table.add_row([name_id, classroom.get_name(), allergies])
+    if connection is not None:
+        print(render_allergy_table(classrooms, connection), file=output)
+        return
+
+    # The listing is rendered again only if the allergen index or a classroom's students changed since it was last shown
+    cache_key = (allergen_index.version, tuple((classroom.get_name(), classroom.students.version) for classroom in classrooms))
+    print(render_cache.render(("allergies",), cache_key, lambda: render_allergy_table(classrooms)), file=output)
 
 
+def allergy_rows(classrooms, connection=None):
+    # Generate a row of plain strings for each student with allergies, grouped by classroom in the order of the classrooms list.
+    # Arguments:
+    #     classrooms (list): A list of Classroom instances. Students in other classrooms are not listed.
+    #     connection (sqlite3.Connection, optional): Read the students with allergies from the database instead of the allergen index.
+    # Yields: list: The student's ID, full name, classroom and allergies, matching ALLERGY_LISTING_HEADERS.
+    # Example: next(allergy_rows(classrooms)) -> ["14", "Lionel Messi", "Toddlers Room (2-3 years)", "Peanut, Dairy"]
+    if connection is not None:
+        rows_by_classroom = {classroom.get_name(): [] for classroom in classrooms}
+        for student_id, fname, lname, classroom_name, allergies in find_students_with_allergies_in_database(connection):
+            rows_by_classroom.setdefault(classroom_name, []).append(
+                [f"{student_id:02}", f"{fname.capitalize()} {lname.capitalize()}", classroom_name, ', '.join(allergies)]
+            )
+    else:
+        rows_by_classroom = {id(classroom): [] for classroom in classrooms}
+        for student in allergen_index.students_with_allergies.values():
+            rows = rows_by_classroom.get(id(student.classroom))
+            if rows is not None:  # Only list students in these classrooms
+                rows.append([student.get_formatted_id(), student.full_name, student.classroom.get_name(), ', '.join(student.allergies)])
+    for rows in rows_by_classroom.values():
+        yield from rows
+
+
+def render_allergy_table(classrooms, connection=None):
+    # Render the table of students with allergies, with its heading, as used by list_students_with_allergies.
+    # Arguments:
+    #     classrooms (list): A list of Classroom instances, in the order their students are listed.
+    #     connection (sqlite3.Connection, optional): Read the students with allergies from the database instead of the allergen index.
+    # Returns: str: The heading and the table, or a message if no students have allergies.
+    table = new_styled_table(["Student Name (Student ID)", "Classroom", "Allergies"])
+    for student_id, name, classroom_name, allergies in allergy_rows(classrooms, connection):
+        table.add_row([f"{name} (ID: {student_id})", classroom_name, allergies])
+
     # Check if the table has any rows
     if len(table.rows) == 0:
+        return "No students with allergies.\n"
+    return f"\n{color3}Students with allergies:{color_reset}\n{table}"
+
+
+def find_students_with_allergen(classrooms, output_format=None):
+
+    # Find the students allergic to one allergen, optionally in one classroom, e.g. "who is allergic to peanuts in the Toddlers Room".
+    # Purpose: Answers the question from the allergen index (see classes/allergen_index.py) without scanning the roster.
+    # Different spellings of the same allergen match, e.g. "Peanut", "peanuts" and "Peanut Allergy".
+
+    # Arguments:
+    #     classrooms (list): A list of Classroom instances, offered as the classrooms to search.
+    #     output_format (str, optional): "table", "plain", "tsv" or "jsonl". Defaults to OUTPUT_FORMAT in constants.py.
+
+    # Example of how it works/is used:
+    #     1. Prompts the user for an allergen, listing the allergens recorded for enrolled students.
+    #     2. Prompts for a classroom number, or Enter for all classrooms.
+    #     3. Prints a table of the matching students, or a message if there are none.
+
+    known_allergens = allergen_index.allergens()
+    if not known_allergens:
         print("No students with allergies.\n")
-    else:
-        print(f"\n{color3}Students with allergies:{Style.reset}")
-        print(table)
+        return
+    print(f"\n{color3}Recorded allergies: {', '.join(known_allergens)}{color_reset}")
+    try:
+        allergen = input("Enter the allergy to search for: ").strip()
+        for number, classroom in enumerate(classrooms, start=1):
+            print(f"{number}. {classroom.get_name()}")
+        classroom_choice = input("Enter a classroom number, or press Enter for all classrooms: ").strip()
+    except (EOFError, KeyboardInterrupt):
+        print(f"\n{color5}Input interrupted.{color_reset}")
+        return
 
+    classroom_name = None
+    if classroom_choice:
+        if not classroom_choice.isdigit() or not 1 <= int(classroom_choice) <= len(classrooms):
+            print(f"{color5}Invalid classroom number. Please enter a number from 1 to {len(classrooms)}.{color_reset}")
+            return
+        classroom_name = classrooms[int(classroom_choice) - 1].get_name()
+
+    students = allergen_index.find_students(allergen, classroom_name)
+    where = f" in {classroom_name}" if classroom_name else ""
+    if not students:
+        print(f"\n{color3}No students allergic to {allergen}{where}.{color_reset}\n")
+        return
+
+    output_format = OUTPUT_FORMAT if output_format is None else output_format
+    if output_format != "table":
+        rows = ([student.get_formatted_id(), student.full_name, student.classroom.get_name(), ', '.join(student.allergies)] for student in students)
+        write_rows(ALLERGY_LISTING_HEADERS, rows, output_format, title=f"Students allergic to {allergen}{where}:")
+        return
+
+    table = new_styled_table(["Student Name (Student ID)", "Classroom", "Allergies"])
+    for student in students:
+        table.add_row([f"{student.full_name} (ID: {student.get_formatted_id()})", student.classroom.get_name(), ', '.join(student.allergies)])
+    print(f"\n{color3}Students allergic to {allergen}{where}:{color_reset}")
+    print(table)
 
-def delete_menu_for_day(kitchen):
+
+def delete_menu_for_day(kitchen, connection=None):
     # Delete the menu for a specific day in a given week.
     # Purpose: This function allows the user to remove the menu for breakfast, lunch, and afternoon tea for a specific day in the specified week.
     # It is done by updating the `menu` dictionary in the Kitchen instance to clear the menu for the selected day.
 
     # Arguments:
     #     kitchen (Kitchen): The Kitchen instance where the menu will be modified.
+    #     connection (sqlite3.Connection, optional): With the SQLite storage backend, the cleared day is also saved to the database.
 
     # Example of how it works/is used:
     #     1. Prompts the user for the week number and day of the week.
@@ -197,13 +417,13 @@ def delete_menu_for_day(kitchen):
     try:
         week = int(input("Enter the week number: "))
     except ValueError:
-        print(f"{color5}Invalid input. Please enter a valid week number (integer).{Style.reset}")
+        print(f"{color5}Invalid input. Please enter a valid week number (integer).{color_reset}")
         return
     except (EOFError, KeyboardInterrupt):
-        print(f"\n{color5}Input interrupted.{Style.reset}")
+        print(f"\n{color5}Input interrupted.{color_reset}")
         return
     except Exception as e:
-        print(f"\n{color5}An unexpected error occurred{Style.reset}")
+        print(f"\n{color5}An unexpected error occurred{color_reset}")
         return
 
     day_map = {
@@ -220,19 +440,176 @@ def delete_menu_for_day(kitchen):
             raise ValueError
         day = day_map[day_input]
     except ValueError:
-        print(f"{color5}Invalid input. Please enter a number between 1 and 5 for weekdays.{Style.reset}")
+        print(f"{color5}Invalid input. Please enter a number between 1 and 5 for weekdays.{color_reset}")
         return
     except (EOFError, KeyboardInterrupt):
-        print(f"\n{color5}Input interrupted.{Style.reset}")
+        print(f"\n{color5}Input interrupted.{color_reset}")
         return
     except Exception as e:
-        print(f"\n{color5}An unexpected error occurred{Style.reset}")
+        print(f"\n{color5}An unexpected error occurred{color_reset}")
         return
 
     week_str = str(week)
     
     if week_str in kitchen.menu and day in kitchen.menu[week_str]:
         kitchen.menu[week_str][day] = {"Breakfast": None, "Lunch": None, "Afternoon Tea": None}
-        print(f"\n{color3}Menu for {day} (Week {week}) has been deleted.{Style.reset}")
+        kitchen.mark_week_changed(week_str)  # Only changed weeks are saved
+        if connection is not None:
+            save_menu_day_with_repeats(kitchen, week_str, day, connection)
+        print(f"\n{color3}Menu for {day} (Week {week}) has been deleted.{color_reset}")
+    else:
+        print(f"{color3}No menu found for {day} (Week {week}).{color_reset}\n")
+
+
+def print_allergy_conflicts(conflicts, title, output_format=None, output=None):
+    # Print allergy conflicts found by the exposure checker in a formatted table.
+
+    # Arguments:
+    #     conflicts (list): (week, day, meal, dish, student, allergies) tuples from exposure_checker.conflicts.
+    #     title (str): The heading printed above the table.
+    #     output_format (str, optional): "table", "plain", "tsv" or "jsonl". Defaults to OUTPUT_FORMAT in constants.py.
+    #     output (file, optional): The open file to write to. Defaults to the terminal.
+    output_format = OUTPUT_FORMAT if output_format is None else output_format
+    if output_format != "table":
+        rows = (
+            [week, day, meal, dish, student.get_formatted_id(), student.full_name,
+             student.classroom.get_name() if student.classroom is not None else "No classroom", ', '.join(allergies)]
+            for week, day, meal, dish, student, allergies in conflicts
+        )
+        write_rows(CONFLICT_LISTING_HEADERS, rows, output_format, output, title=title)
+        return
+
+    table = new_styled_table(["Week", "Day", "Meal", "Dish", "Student Name (Student ID)", "Classroom", "Allergies"])
+    for week, day, meal, dish, student, allergies in conflicts:
+        classroom_name = student.classroom.get_name() if student.classroom is not None else "No classroom"
+        table.add_row([week, day, meal, dish, f"{student.full_name} (ID: {student.get_formatted_id()})", classroom_name, ', '.join(allergies)])
+    print(f"\n{color5}{title}{color_reset}", file=output)
+    print(table, file=output)
+
+
+def set_dish_allergens(kitchen):
+    # Prompt the user for a dish and the allergens it contains.
+
+    # Purpose: Records the allergens in a dish in `kitchen.dish_allergens`, so the menu can be checked against the
+    # students' allergies. Only the meals serving the dish are rechecked, and any students now exposed are listed.
+
+    # Arguments: kitchen (Kitchen): The Kitchen instance whose dish allergens will be updated.
+
+    # Example of how it works/is used:
+    #     1. Prompts for the dish name, e.g. "Peanut Butter Toast".
+    #     2. Prompts for its allergens separated by commas, e.g. "Peanut, Wheat", or Enter to clear them.
+    #     3. Saves them in the kitchen and prints the meals where students are allergic to the dish.
+    try:
+        dish = input("Enter the dish name: ").strip().title()
+        if not dish:
+            print(f"{color5}Dish name cannot be empty.{color_reset}\n")
+            return
+        allergens_input = input("Enter the allergens in the dish separated by commas (or press Enter for none): ").strip()
+    except (EOFError, KeyboardInterrupt):
+        print(f"\n{color5}Input interrupted.{color_reset}")
+        return
+
+    allergens = [allergen.strip().capitalize() for allergen in allergens_input.split(",") if allergen.strip()]
+    if allergens:
+        kitchen.dish_allergens[dish] = allergens
+    else:
+        kitchen.dish_allergens.pop(dish, None)
+    kitchen.dish_allergens_changed = True
+
+    exposure_checker.refresh(kitchen, kitchen.menu)  # Every week is read, as the dish's conflicts are listed for the whole menu
+    exposure_checker.update_dish(dish)
+    if allergens:
+        print(f"\n{color3}Allergens in {dish}: {', '.join(allergens)}{color_reset}")
+    else:
+        print(f"\n{color3}No allergens recorded for {dish}.{color_reset}")
+
+    dish_conflicts = [conflict for conflict in exposure_checker.conflicts() if conflict[3] and conflict[3].lower() == dish.lower()]
+    if dish_conflicts:
+        print_allergy_conflicts(dish_conflicts, f"Students allergic to {dish} on the menu:")
+
+
+def list_allergy_conflicts(kitchen, output_format=None):
+    # Display every meal on the menu that a student is allergic to, for one week or for the whole year.
+
+    # Purpose: Checks the menu against the students' allergies with the exposure checker (see classes/exposure_checker.py),
+    # which only rechecks the meals and students that changed since the last check.
+
+    # Arguments:
+    #     kitchen (Kitchen): The Kitchen instance containing the menu to check.
+    #     output_format (str, optional): "table", "plain", "tsv" or "jsonl". Defaults to OUTPUT_FORMAT in constants.py.
+
+    # Example of how it works/is used:
+    #     1. Prompts for a week number, or Enter for all weeks.
+    #     2. Prints a table of each week, day, meal and dish with the students allergic to it, or a message if there are none.
+    try:
+        week_input = input("Enter the week number to check, or press Enter for all weeks: ").strip()
+    except (EOFError, KeyboardInterrupt):
+        print(f"\n{color5}Input interrupted.{color_reset}")
+        return
+    if week_input and (not week_input.isdigit() or not 1 <= int(week_input) <= 52):
+        print(f"{color5}Please enter a valid week number between 1 and 52.{color_reset}\n")
+        return
+
+    week = week_input or None
+    exposure_checker.refresh(kitchen, [week] if week else kitchen.menu)  # Reads only the weeks listed
+    conflicts = exposure_checker.conflicts(week)
+    where = f" in Week {week}" if week else ""
+    if not conflicts:
+        print(f"\n{color3}No allergy conflicts found on the menu{where}.{color_reset}\n")
+        return
+    print_allergy_conflicts(conflicts, f"Allergy conflicts on the menu{where}:", output_format)
+
+
+def set_up_menu_rotation(kitchen, connection=None):
+    # Prompt the user to repeat a rotating menu (e.g. 4 or 6 weeks) through the rest of the year, or to stop repeating one.
+
+    # Purpose: Weeks repeating the rotation share its dishes instead of storing their own, so a year planned from a
+    # 4 week rotation is saved as those 4 weeks plus any days that differ (see CompactMenu in classes/kitchen.py).
+    # Editing a day of the rotation's first weeks changes every week repeating it; editing a day of a later week only
+    # changes that week.
+
+    # Arguments: kitchen (Kitchen): The Kitchen instance whose menu will repeat the rotation.
+    #            connection (sqlite3.Connection, optional): With the SQLite storage backend, every day of the repeated
+    #            weeks is saved to the database, as the database stores each day's dishes. Later edits to a day of the
+    #            rotation are saved to every week repeating it (see save_menu_day_with_repeats).
+
+    # Example of how it works/is used:
+    #     1. Prompts for the first week of the rotation (e.g. 1), or Enter to stop repeating a rotation.
+    #     2. Prompts for the number of weeks in the rotation (e.g. 4) and the last week to repeat it through (default 52).
+    #     3. Days of the repeated weeks that already had different dishes keep them.
+    menu = kitchen.menu
+    try:
+        first_input = input("Enter the first week of the rotation (1-52), or press Enter to stop repeating a rotation: ").strip()
+        if not first_input:
+            if not menu.cycle_length:
+                print(f"{color3}The menu does not repeat a rotation.{color_reset}\n")
+                return
+            length_input = last_input = ""
+        else:
+            length_input = input("Enter the number of weeks in the rotation (e.g. 4 or 6): ").strip()
+            last_input = input("Enter the last week to repeat the rotation through (or press Enter for week 52): ").strip()
+    except (EOFError, KeyboardInterrupt):
+        print(f"\n{color5}Input interrupted.{color_reset}")
+        return
+
+    previous_weeks = range(menu.cycle_first_week, menu.cycle_last_week + 1) if menu.cycle_length else range(0)
+    if not first_input:
+        menu.clear_rotation()
+        changed_weeks = previous_weeks
+        message = "The menu no longer repeats a rotation. Each week keeps its current dishes."
     else:
-        print(f"{color3}No menu found for {day} (Week {week}).{Style.reset}\n")
+        try:
+            first_week, length = int(first_input), int(length_input)
+            last_week = int(last_input) if last_input else 52
+            menu.set_rotation(first_week, length, last_week)
+        except ValueError as error:
+            print(f"{color5}Invalid rotation: {error}{color_reset}\n")
+            return
+        changed_weeks = set(previous_weeks) | set(range(first_week, last_week + 1))
+        message = f"Weeks {first_week} to {last_week} now repeat the {length} week rotation starting at Week {first_week}."
+
+    for week in changed_weeks:
+        kitchen.mark_week_changed(week)  # The repeated weeks' files are rewritten or removed when the menu is saved
+    if connection is not None:
+        save_menu_to_database(connection, kitchen)
+    print(f"\n{color3}{message}{color_reset}")
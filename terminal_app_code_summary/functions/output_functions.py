@@ -0,0 +1,149 @@
+import itertools  # Standard library used to write a title before the plain columns.
+import json  # Standard library used to write rows as JSON Lines.
+import sys  # Standard library used to write to the terminal.
+from functools import lru_cache  # Standard library cache, used to style each table header and border character once.
+
+# Listing formats accepted by write_rows and the listings, in addition to the colored "table" format (see OUTPUT_FORMAT in constants.py).
+ROW_FORMATS = ("plain", "tsv", "jsonl")
+OUTPUT_FORMATS = ("table",) + ROW_FORMATS
+
+# Lines collected before each write, so long listings are written in a few large writes with a bounded buffer.
+OUTPUT_CHUNK_LINES = 512
+
+
+def write_in_chunks(lines, output=None, chunk_lines=OUTPUT_CHUNK_LINES):
+    """
+    Write lines produced one at a time to the terminal or a file, a chunk at a time.
+
+    Purpose:
+        Long listings (e.g. a whole year of menus) are produced lazily by a generator and written in chunks of
+        `chunk_lines` lines joined into one string, instead of one print call per line or one string holding the
+        whole listing. The number of writes is small and memory use stays flat however long the listing is.
+
+    Arguments:
+        lines (iterable): The lines to write, each ending with a newline.
+        output (file, optional): The open file to write to. Defaults to the terminal (sys.stdout).
+        chunk_lines (int, optional): The number of lines written at a time. Default is OUTPUT_CHUNK_LINES.
+
+    Returns:
+        int: The number of lines written.
+
+    Example Usage:
+        write_in_chunks(menu_range_lines(kitchen, menu_weeks_in_range(1, 52))) -> Prints the menu for the whole year.
+    """
+    output = sys.stdout if output is None else output
+    chunk = []
+    count = 0
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_lines:
+            output.write("".join(chunk))
+            count += len(chunk)
+            chunk.clear()
+    if chunk:
+        output.write("".join(chunk))
+        count += len(chunk)
+    output.flush()
+    return count
+
+
+@lru_cache(maxsize=None)
+def table_style(text, style):
+    # Returns: str: The text in a table style ("header" for bold blue, "border" for spring green), styled once and reused.
+    from colored import stylize, attr, fg  # Imported when the first table is styled, so the plain, TSV and JSON Lines formats never load it
+
+    color = fg("blue") + attr("bold") if style == "header" else fg("spring_green_4")
+    return stylize(text, color)
+
+
+def new_styled_table(headers):
+    """
+    Create a PrettyTable with the application's table style: bold blue headers and spring green borders.
+
+    Purpose:
+        Every listing uses the same style, so the styled header and border strings are built once (see table_style)
+        instead of calling stylize and fg for every table.
+
+    Arguments:
+        headers (list of str): The column headings.
+
+    Example Usage:
+        table = new_styled_table(["Student Name (Student ID)", "Age"])
+        table.add_row(["Dani Olmo (ID: 01)", "2 years, 0 months"])
+    """
+    from prettytable import PrettyTable  # Imported when the first table is built, so starting the application does not wait for it
+
+    table = PrettyTable()
+    table.horizontal_char = table_style("-", "border")
+    table.junction_char = table_style("+", "border")
+    table.vertical_char = table_style("|", "border")
+    table.field_names = [table_style(header, "header") for header in headers]
+    return table
+
+
+def plain_lines(headers, rows):
+    # Generate the lines of rows as left-aligned columns separated by two spaces, without colors or borders.
+    # Every row is needed to size the columns, so the rows are gathered into a list first.
+    # Example: plain_lines(["Name", "Age"], [["Dani Olmo", "2 years old"]]) -> "Name       Age", "---------  -----------", ...
+    rows = list(rows)
+    widths = [max([len(header)] + [len(row[column]) for row in rows]) for column, header in enumerate(headers)]
+    # The last column is not padded, so lines have no trailing spaces
+    line_format = "".join(f"{{:<{width}}}  " for width in widths[:-1]) + "{}\n"
+    yield line_format.format(*headers)
+    yield line_format.format(*("-" * width for width in widths))
+    for row in rows:
+        yield line_format.format(*row)
+
+
+def tsv_lines(headers, rows):
+    # Generate the lines of rows as tab-separated values, with the headers on the first line.
+    # Tabs and newlines inside values are replaced with spaces so every row stays on one line.
+    yield "\t".join(headers) + "\n"
+    for row in rows:
+        yield "\t".join(value.replace("\t", " ").replace("\n", " ") for value in row) + "\n"
+
+
+def jsonl_lines(headers, rows):
+    # Generate one JSON object per row, keyed by the headers in snake case, e.g. "Student ID" -> "student_id".
+    keys = [header.lower().replace(" ", "_") for header in headers]
+    for row in rows:
+        yield json.dumps(dict(zip(keys, row))) + "\n"
+
+
+def write_rows(headers, rows, output_format="plain", output=None, title=None):
+    """
+    Write a listing in one of the row formats: plain columns, tab-separated values or JSON Lines.
+
+    Purpose:
+        Reports piped to other tools or sent to a printer do not need colors or table borders. The rows are given as
+        columns of strings that are already formatted, and are written straight to a buffered stream with
+        write_in_chunks, without PrettyTable or colored. TSV and JSON Lines rows are written as they are produced;
+        plain columns are sized from every row first.
+
+    Arguments:
+        headers (list of str): The column headings, e.g. ["Student ID", "Name"].
+        rows (iterable): The rows, each a list of strings with one value per heading.
+        output_format (str, optional): "plain", "tsv" or "jsonl". Default is "plain".
+        output (file, optional): The open file to write to. Defaults to the terminal (sys.stdout).
+        title (str, optional): A heading written above plain columns. TSV and JSON Lines never include it, so the
+            output can be read by other tools. Default is None.
+
+    Returns:
+        int: The number of lines written.
+
+    Example Usage:
+        write_rows(["Student ID", "Name"], [["01", "Dani Olmo"]], "jsonl")
+        Output:
+            {"student_id": "01", "name": "Dani Olmo"}
+    """
+    if output_format == "plain":
+        lines = plain_lines(headers, rows)
+        if title:
+            lines = itertools.chain([f"\n{title}\n"], lines)
+    elif output_format == "tsv":
+        lines = tsv_lines(headers, rows)
+    elif output_format == "jsonl":
+        lines = jsonl_lines(headers, rows)
+    else:
+        raise ValueError(f"Unknown output format {output_format!r}, expected one of {', '.join(ROW_FORMATS)}.")
+    return write_in_chunks(lines, output)
@@ -1,12 +1,126 @@
+import csv  # Import to read rosters in CSV files for bulk import.
 from datetime import datetime  # Import to handle date and age calculations.
-from colored import Style  # Import for styled terminal output.
+from itertools import islice  # Import to read CSV rows in batches.
 
-from constants import color3, color4, color5  # Import predefined color codes for consistent styling.
+from constants import color3, color4, color5, color_reset  # Import predefined color codes for consistent styling.
 from functions.classroom_functions import assign_student  # Import to assign students to classrooms.
-from classes.students import Student  # Import the Student class for creating student instances.
-from classes.parent_guardian import ParentGuardian  # Import the ParentGuardian class for guardian details.
+from classes.students import Student, record_student_change  # Import the Student class for creating student instances and recording unsaved changes.
+from classes.parent_guardian import guardian_registry  # Import the guardian registry so siblings share one guardian.
+from classes.student_registry import StudentRegistry  # Import to look students up by ID without scanning the list.
+from classes.classrooms import ClassroomRegistry  # Import to assign a batch of imported students to classrooms in one pass.
+from classes.allergen_index import allergen_index  # Import to index the allergies of new students.
+from classes.name_index import name_index  # Import to index the names of new students and search them.
+from classes.transition_scheduler import transition_scheduler  # Import to schedule each imported student's move to the next classroom.
+from classes.students import student_ids  # Import to give back the IDs of students who could not be placed in a classroom.
+from functions.file_functions import save_students  # Import to write the roster once after a bulk import.
+from functions.output_functions import new_styled_table  # Import to display search results in the application's table style.
+from functions.database_functions import save_student_to_database, save_students_to_database, find_guardian_in_database  # Import for the SQLite storage backend.
+
+# Validation rules shared by `add_student` (one prompt at a time) and `import_students_from_csv` (one CSV row at a time).
+# Each function returns the cleaned value, or raises ValueError with a message describing the problem.
+
+def validate_name(name, label="First name"):
+    """
+    Validate a first or last name and return it capitalized.
+
+    Arguments:
+        name (str): The name as entered.
+        label (str, optional): How the name is described in the error message, e.g. "Parent/guardian's last name".
+
+    Returns:
+        str: The name with surrounding spaces removed and the first letter capitalized.
+
+    Example Usage:
+        validate_name(" bukayo ") -> "Bukayo"
+        validate_name("Jean--Luc") -> ValueError: First name cannot contain consecutive hyphens ('--').
+    """
+    name = name.strip().capitalize()
+    # Check for consecutive hyphens first
+    if '--' in name:
+        raise ValueError(f"{label} cannot contain consecutive hyphens ('--').")
+    # Allow alphabets and hyphens only
+    if not name.replace('-', '').isalpha():
+        raise ValueError(f"{label} should only contain alphabets. Hyphens ('-') are allowed.")
+    return name
+
+
+def validate_birthday(birthday, classrooms):
+    """
+    Validate a birthday and check that the student's age fits at least one classroom.
+
+    Arguments:
+        birthday (str): The birthday as entered, in the format YYYY-MM-DD.
+        classrooms (list): The Classroom instances the student could be assigned to.
+
+    Returns:
+        bool: True if the student's age fits a classroom, False if it is out of the range of every classroom.
+
+    Raises:
+        ValueError: If the birthday is not a valid date in the format YYYY-MM-DD.
+
+    Example Usage:
+        validate_birthday("2023-01-01", classrooms) -> True
+        validate_birthday("2023-02-30", classrooms) -> ValueError
+    """
+    try:
+        birthday_date = datetime.strptime(birthday, "%Y-%m-%d")
+    except ValueError:
+        raise ValueError("Invalid date format or date out of range. Please enter valid date in the format YYYY-MM-DD.")
+    # Calculate age based on birthday and current date
+    age_in_years = (datetime.now() - birthday_date).days // 365
+    # Check if the age falls within any classroom range
+    return any(classroom.is_valid_for_age(age_in_years) for classroom in classrooms)
+
+
+def validate_allergy(allergy):
+    """
+    Validate the name of an allergy and return it capitalized.
+
+    Example Usage:
+        validate_allergy("peanut") -> "Peanut"
+        validate_allergy("Peanut!") -> ValueError
+    """
+    allergy = allergy.strip().capitalize()
+    # Check that allergy is not empty and contains only alphabetic characters, spaces, or hyphens
+    if not (allergy and all(char.isalpha() or char in [' ', '-'] for char in allergy)):
+        raise ValueError("Allergy should only contain alphabetic characters, spaces, or hyphens. Please try again.")
+    return allergy
+
+
+def validate_contact_number(contact_number):
+    """
+    Validate an Australian contact number: exactly 10 digits starting with '04' for mobiles or '0' for landlines.
+
+    Example Usage:
+        validate_contact_number("0406346693") -> "0406346693"
+        validate_contact_number("+61406346693") -> ValueError
+    """
+    contact_number = contact_number.strip()
+    # Check if it's a valid 10-digit Australian number
+    if not (contact_number.isdigit() and len(contact_number) == 10 and (contact_number.startswith('04') or contact_number.startswith('0'))):
+        raise ValueError("Contact number should start with '04' for mobiles or '0' for landlines, and contain exactly 10 digits.")
+    return contact_number
+
 
-def add_student(students, classrooms):
+def validate_contact_email(contact_email):
+    """
+    Validate a contact email: no spaces and exactly one '@' symbol.
+
+    Example Usage:
+        validate_contact_email("mary@example.com") -> "mary@example.com"
+        validate_contact_email("mary at example.com") -> ValueError
+    """
+    contact_email = contact_email.strip()
+    # Check for spaces
+    if " " in contact_email:
+        raise ValueError("Email address should not contain spaces.")
+    # Check for a single '@'
+    if contact_email.count("@") != 1:
+        raise ValueError("Email address should contain exactly one '@' symbol.")
+    return contact_email
+
+
+def add_student(students, classrooms, connection=None):
     """
     The add_student functions adds a new student to the system.
     
@@ -24,6 +138,8 @@ def add_student(students, classrooms):
     Arguments:
         students (list): The global list of Student instances to update.
         classrooms (list): The list of Classroom instances used for student assignment.
+        connection (sqlite3.Connection, optional): With the SQLite storage backend, the new student is saved to the database
+            in its own transaction. Default is None.
 
     Example Usage:
         # Initialize an empty list for students
@@ -46,53 +162,35 @@ def add_student(students, classrooms):
     # Validate first name (fname)
     while True:
         try:
-            fname = input("Enter student's first name: ").strip().capitalize() # prompts for first name input
-            # Check for consecutive hyphens first
-            if '--' in fname:
-                raise ValueError(f"{color5}First name cannot contain consecutive hyphens ('--').{Style.reset}")
-            # Allow alphabets and hyphens only
-            elif fname.replace('-', '').isalpha():
-                break  # Valid input, exit loop
-            else:
-                raise ValueError(f"{color5}First name should only contain alphabets. Hyphens ('-') are allowed.{Style.reset}")
+            fname = validate_name(input("Enter student's first name: "), "First name")
+            break  # Valid input, exit loop
         except ValueError as e:
-            print(f"{color5}{e}{Style.reset}")
+            print(f"{color5}{e}{color_reset}")
         except (KeyboardInterrupt, EOFError):
-            print(f"\n{color5}Input interrupted. Returning to previous menu.{Style.reset}")
+            print(f"\n{color5}Input interrupted. Returning to previous menu.{color_reset}")
             return  
 
     # Validate last name (lname)
     while True:
         try:
-            lname = input("Enter student's last name: ").strip().capitalize()
-            # Check for consecutive hyphens first
-            if '--' in lname:
-                raise ValueError(f"{color5}Last name cannot contain consecutive hyphens ('--').{Style.reset}")
-            # Allow alphabets and hyphens only
-            elif lname.replace('-', '').isalpha():
-                break  # Valid input, exit loop
-            else:
-                raise ValueError(f"{color5}Last name should only contain alphabets. Hyphens ('-') are allowed.{Style.reset}")
+            lname = validate_name(input("Enter student's last name: "), "Last name")
+            break  # Valid input, exit loop
         except ValueError as e:
-            print(f"{color5}{e}{Style.reset}")
+            print(f"{color5}{e}{color_reset}")
         except (KeyboardInterrupt, EOFError):
-            print(f"\n{color5}Input interrupted. Returning to previous menu.{Style.reset}")
+            print(f"\n{color5}Input interrupted. Returning to previous menu.{color_reset}")
             return  
 
     # Validate birthday input with try...except block
     while True:
         birthday = input("Enter student's birthday (YYYY-MM-DD): ")
         try:
-            birthday_date = datetime.strptime(birthday, "%Y-%m-%d")
-            # Calculate age based on birthday and current date
-            age_in_years = (datetime.now() - birthday_date).days // 365
-            # Check if the age falls within any classroom range
-            if not any(classroom.is_valid_for_age(age_in_years) for classroom in classrooms):
-                print(f"{color5}Student's age is out of the range for all available classrooms. No further input is needed{Style.reset}")
+            if not validate_birthday(birthday, classrooms):
+                print(f"{color5}Student's age is out of the range for all available classrooms. No further input is needed{color_reset}")
                 return  # Exit the function without collecting more input
             break
-        except ValueError:
-            print(f"{color5}Invalid date format or date out of range. Please enter valid date in the format YYYY-MM-DD.{Style.reset}")
+        except ValueError as e:
+            print(f"{color5}{e}{color_reset}")
         
 
      # Initialize an empty list for allergies
@@ -105,9 +203,9 @@ def add_student(students, classrooms):
             if has_allergy in ['yes', 'y', 'no', 'n']:
                 break  # Valid input, exit loop
             else:
-                print(f"{color5}Please enter a valid answer - 'yes' or 'y' and 'no' or 'n'.{Style.reset}")
+                print(f"{color5}Please enter a valid answer - 'yes' or 'y' and 'no' or 'n'.{color_reset}")
         except EOFError:
-            print(f"\n{color5}Input interrupted. Returning to previous menu.{Style.reset}")
+            print(f"\n{color5}Input interrupted. Returning to previous menu.{color_reset}")
             return
             
 
@@ -116,13 +214,7 @@ def add_student(students, classrooms):
         while True:
             try:
                 # Get the first allergy
-                allergy = input("Enter name of allergy: ").strip().capitalize()
-                
-                # Check that allergy is not empty and contains only alphabetic characters, spaces, or hyphens
-                if allergy and all(char.isalpha() or char in [' ', '-'] for char in allergy):
-                    allergies.append(allergy)
-                else:
-                    raise ValueError(f"{color5}Allergy should only contain alphabetic characters, spaces, or hyphens. Please try again.{Style.reset}")
+                allergies.append(validate_allergy(input("Enter name of allergy: ")))
 
                 # Ask if there are more allergies
                 while True:
@@ -130,15 +222,15 @@ def add_student(students, classrooms):
                     if more_allergies in ['yes', 'y', 'no', 'n']:
                         break  # Valid input, exit loop
                     else:
-                        print(f"{color5}Please enter a valid answer - 'yes' or 'y' and 'no' or 'n'.{Style.reset}")
+                        print(f"{color5}Please enter a valid answer - 'yes' or 'y' and 'no' or 'n'.{color_reset}")
 
                 # Exit the loop if there are no more allergies
                 if more_allergies in ['no', 'n']:
                     break
             except ValueError as e:
-                print(f"{color5}{e}{Style.reset}")
+                print(f"{color5}{e}{color_reset}")
             except EOFError:
-                print(f"\n{color5}Input interrupted. Returning to previous menu.{Style.reset}")
+                print(f"\n{color5}Input interrupted. Returning to previous menu.{color_reset}")
                 return
         
 
@@ -148,103 +240,130 @@ def add_student(students, classrooms):
     # Validate guardian first name and last name
     while True:
         try:
-            guardian_fname = input("Enter parent/guardian's first name: ").strip().capitalize()
-            # Check for consecutive hyphens
-            if '--' in guardian_fname:
-                raise ValueError("Parent/guardian's first name cannot contain consecutive hyphens ('--').")
-            # Allow alphabets and hyphens only
-            elif guardian_fname.replace('-', '').isalpha():
-                break  # Valid input, exit loop
-            else:
-                raise ValueError("Parent/guardian's first name should only contain alphabets. Hyphens ('-') are allowed.")
+            guardian_fname = validate_name(input("Enter parent/guardian's first name: "), "Parent/guardian's first name")
+            break  # Valid input, exit loop
         except ValueError as e:
-            print(f"{color5}{e}{Style.reset}")
+            print(f"{color5}{e}{color_reset}")
         except (KeyboardInterrupt, EOFError):
-            print(f"\n{color5}Input interrupted. Returning to previous menu.{Style.reset}")
+            print(f"\n{color5}Input interrupted. Returning to previous menu.{color_reset}")
             return  
 
 # Validate guardian last name
     while True:
         try:
-            guardian_lname = input("Enter parent/guardian's last name: ").strip().capitalize()
-            # Check for consecutive hyphens
-            if '--' in guardian_lname:
-                raise ValueError(f"{color5}Parent/guardian's last name cannot contain consecutive hyphens ('--').{Style.reset}")
-            # Allow alphabets and hyphens only
-            elif guardian_lname.replace('-', '').isalpha():
-                break  # Valid input, exit loop
-            else:
-                raise ValueError(f"{color5}Parent/guardian's last name should only contain alphabets. Hyphens ('-') are allowed.{Style.reset}")
+            guardian_lname = validate_name(input("Enter parent/guardian's last name: "), "Parent/guardian's last name")
+            break  # Valid input, exit loop
         except ValueError as e:
-            print(f"{color5}{e}{Style.reset}")
+            print(f"{color5}{e}{color_reset}")
         except (KeyboardInterrupt, EOFError):
-            print(f"{color5}\nInput interrupted. Returning to previous menu.{Style.reset}")
+            print(f"{color5}\nInput interrupted. Returning to previous menu.{color_reset}")
             return  
 
     # Validate emergency contact number (should contain only digits and check length)
     while True:
         try:
-            contact_number = input("Enter parent/guardian's contact number (numbers only): ").strip()
-            # Check if it's a valid 10-digit Australian number
-            if contact_number.isdigit() and len(contact_number) == 10 and (contact_number.startswith('04') or contact_number.startswith('0')):
-                break  # Valid input, exit loop
-            else:
-                print(f"{color5}Contact number should start with '04' for mobiles or '0' for landlines, and contain exactly 10 digits.{Style.reset}")
-                print(f"{color5}International contacts with '+' area codes are not accepted{Style.reset}\n")
+            contact_number = validate_contact_number(input("Enter parent/guardian's contact number (numbers only): "))
+            break  # Valid input, exit loop
+        except ValueError as e:
+            print(f"{color5}{e}{color_reset}")
+            print(f"{color5}International contacts with '+' area codes are not accepted{color_reset}\n")
         except (KeyboardInterrupt, EOFError):
-            print(f"{color5}\nInput interrupted. Returning to previous menu.{Style.reset}")
+            print(f"{color5}\nInput interrupted. Returning to previous menu.{color_reset}")
             return 
 
     # Validate emergency contact email
     while True:
         try:
-            contact_email = input("Enter parent/guardian's contact email: ").strip()
-            
-            # Check for spaces
-            if " " in contact_email:
-                raise ValueError(f"{color5}Email address should not contain spaces.{Style.reset}")
-            
-            # Check for a single '@'
-            if contact_email.count("@") != 1:
-                raise ValueError(f"{color5}Email address should contain exactly one '@' symbol.{Style.reset}")
-            
-            # If all checks pass, break the loop
-            break
-            
+            contact_email = validate_contact_email(input("Enter parent/guardian's contact email: "))
+            break  # Valid input, exit loop
         except ValueError as e:
-            print(f"{color5}{e}{Style.reset}")
+            print(f"{color5}{e}{color_reset}")
         except EOFError:
-            print(f"\n{color5}Input interrupted. Returning to previous menu.{Style.reset}")
+            print(f"\n{color5}Input interrupted. Returning to previous menu.{color_reset}")
             return
         except Exception:
-            print(f"{color5}Please enter a valid email.{Style.reset}")
+            print(f"{color5}Please enter a valid email.{color_reset}")
+
+    values = {
+        "fname": fname, "lname": lname, "birthday": birthday, "allergies": allergies,
+        "guardian_fname": guardian_fname, "guardian_lname": guardian_lname,
+        "contact_number": contact_number, "contact_email": contact_email
+    }
+    enrol_student(students, classrooms, values, connection=connection)
+
+
+def enrol_student(students, classrooms, values, connection=None, silent=False):
+    """
+    Enrol a student from values that have already been validated, e.g. by `add_student` or a batch `add` command.
+
+    Purpose:
+        Creates the student with a new ID and their guardian, assigns them to a classroom, adds them to the roster and
+        indexes, and records the change for the next journal save, without prompting for anything.
+
+    Arguments:
+        students (list): The global list of Student instances to update.
+        classrooms (list): The list of Classroom instances used for student assignment.
+        values (dict): The validated values, keyed by the names in CSV_COLUMNS, with "allergies" as a list
+            (as returned by `validate_student_row`).
+        connection (sqlite3.Connection, optional): With the SQLite storage backend, the new student is saved to the database
+            in its own transaction. Default is None.
+        silent (bool, optional): Print nothing, leaving the caller to report a student who could not be enrolled. Default is False.
 
-    # Create the parent/guardian object
-    guardian = ParentGuardian(guardian_fname, guardian_lname, contact_number, contact_email)
+    Returns:
+        Student or None: The new student, or None if no student ID was available. If no classroom could take them,
+        their classroom is None and they are not added to the roster, indexed, recorded or saved, and their ID is released.
+
+    Example Usage:
+        enrol_student(students, classrooms, validate_student_row(row, classrooms)) -> Student("Bukayo", "Saka", ...)
+    """
+    # Find the parent/guardian (e.g. already enrolled with a sibling) or create them
+    guardian = guardian_registry.get_or_add(values["guardian_fname"], values["guardian_lname"], values["contact_number"], values["contact_email"])
 
     # Create a new student with guardian details
-    student = Student(fname, lname, birthday, allergies)
+    student = Student(values["fname"], values["lname"], values["birthday"], values["allergies"])
 
     # Attach the guardian to the student
     student.guardian = guardian
 
     # Check if the student_id is None, indicating the ID couldn't be generated
     if student.student_id is None:
-        print("\nChildcare is full. No more unique student IDs available.")
-        return  # Exit the function without adding the student
+        if not silent:
+            print("\nChildcare is full. No more unique student IDs available.")
+        return None  # Exit the function without adding the student
 
     # Assign student to the correct classroom based on age
-    assign_student(classrooms, student)
+    assign_student(classrooms, student, silent=silent)
+
+    # A student no classroom could take is not enrolled: give their ID back, as import_students_from_csv does
+    if student.classroom is None:
+        student_ids.release(student.student_id)
+        return student
 
     # Add student to the global students list
     students.append(student)
 
-def list_guardian_details(students):
+    # Index their allergies and names so they can be found without scanning the roster
+    allergen_index.add(student)
+    name_index.add(student)
+
+    # Record the enrolment so a journal save only writes this student
+    record_student_change("add", student)
+
+    # With the SQLite storage backend, save just this student straight away
+    if connection is not None:
+        save_student_to_database(connection, student)
+    return student
+
+def list_guardian_details(students, connection=None):
     """
     List parent/guardian details for a specific student by their ID.
     Purpose: This function retrieves and displays the guardian's details for a given student ID.
 
-    Arguments: students (list): The global list of Student instances.
+    Arguments: 
+        students (list): The global list of Student instances. If it is a StudentRegistry (as in main.py), the student is
+            looked up by ID without scanning the list.
+        connection (sqlite3.Connection, optional): With the SQLite storage backend, the student and guardian are looked up
+            in the database by ID instead of scanning the students list. Default is None.
 
     Example of how it works/is used: 
         1. It prompts the user to enter a student ID.
@@ -280,21 +399,259 @@ def list_guardian_details(students):
         # Prompt for a student ID
         student_id = int(input("\nEnter the student ID to view guardian details: "))
     except ValueError:
-        print(f"{color5}Invalid input. Please enter a valid numeric student ID.{Style.reset}")
+        print(f"{color5}Invalid input. Please enter a valid numeric student ID.{color_reset}")
+        return
+
+    if connection is not None:
+        row = find_guardian_in_database(connection, student_id)
+        if row is None:
+            print(f"\n{color3}No student found with ID {student_id}.{color_reset}")
+            return
+        student_fname, student_lname, guardian_fname, guardian_lname, contact_number, contact_email = row
+        student_name = f"{student_fname.capitalize()} {student_lname.capitalize()}"
+        if guardian_fname is None:
+            print(f"Student: {student_name} (ID: {student_id:02}) has no associated guardian.\n")
+            return
+        print(f"\n{color4}Student: {student_name} (ID: {student_id:02}){color_reset}")
+        print(f"  Guardian Name: {guardian_fname.capitalize()} {guardian_lname.capitalize()}")
+        print(f"  Contact Number: {contact_number}")
+        print(f"  Contact Email: {contact_email}\n")
         return
 
     # Find the student by ID
-    # use next() to retrieve first item that matach student id
-    student = next((student for student in students if student.student_id == student_id), None)
+    if isinstance(students, StudentRegistry):
+        student = students.get(student_id)  # Constant time lookup in the student ID index
+    else:
+        # use next() to retrieve first item that matach student id
+        student = next((student for student in students if student.student_id == student_id), None)
     
+    if student is not None and student.classroom is None:
+        student = None  # Students who could not be placed in a classroom are not enrolled
+
     if student:
         guardian = student.guardian # Retrieve the ParentGuardian instance associated with the student.
         if guardian:
-            print(f"\n{color4}Student: {student.full_name} (ID: {student.get_formatted_id()}){Style.reset}")
+            print(f"\n{color4}Student: {student.full_name} (ID: {student.get_formatted_id()}){color_reset}")
             print(f"  Guardian Name: {guardian.full_name}")
             print(f"  Contact Number: {guardian.contact_number}")
             print(f"  Contact Email: {guardian.contact_email}\n")
         else:
             print(f"Student: {student.full_name} (ID: {student.get_formatted_id()}) has no associated guardian.\n")
     else:
-        print(f"\n{color3}No student found with ID {student_id}.{Style.reset}")
+        print(f"\n{color3}No student found with ID {student_id}.{color_reset}")
+
+
+def search_students_by_name(limit=20):
+    """
+    Search students by the start of their own or their parent/guardian's name.
+
+    Purpose: Staff usually know a student's name rather than their student ID. This function looks names up in the
+    name index (see classes/name_index.py), so each search takes well under a millisecond even for very large rosters.
+    The prompt repeats, so the user can keep typing more of the name to narrow the matches down, and then use the
+    student ID shown with options such as Delete Student or Display Parent/Guardian Details.
+
+    Arguments:
+        limit (int, optional): The most students shown for each search. Default is 20.
+
+    Example of how it works/is used:
+        1. Prompts the user for the start of a first name, last name or full name, e.g. "sa".
+        2. Prints a table of the matching students with their ID, classroom and parent/guardian.
+        3. Repeats until the user presses Enter without typing anything.
+
+    Example Output:
+        Enter the start of a student's or parent/guardian's name (press Enter to finish): saka
+        +---------------------------+---------------------------+-------------------+
+        | Student Name (Student ID) | Classroom                 | Parent/Guardian   |
+        +---------------------------+---------------------------+-------------------+
+        | Bukayo Saka (ID: 07)      | Toddlers Room (2-3 years) | Mary Saka         |
+        +---------------------------+---------------------------+-------------------+
+    """
+    while True:
+        try:
+            text = input("\nEnter the start of a student's or parent/guardian's name (press Enter to finish): ").strip()
+        except (KeyboardInterrupt, EOFError):
+            print(f"\n{color5}Input interrupted. Returning to previous menu.{color_reset}")
+            return
+        if not text:
+            return
+
+        matches = name_index.search(text, limit)
+        if not matches:
+            print(f"{color3}No students or parents/guardians with a name starting with '{text}'.{color_reset}")
+            continue
+
+        table = new_styled_table(["Student Name (Student ID)", "Classroom", "Parent/Guardian"])
+        for student in matches:
+            classroom_name = student.get_classroom_name() if student.classroom else ""
+            guardian_name = student.guardian.full_name if student.guardian else ""
+            table.add_row([f"{student.full_name} (ID: {student.get_formatted_id()})", classroom_name, guardian_name])
+        print(table)
+        if len(matches) == limit:
+            print(f"{color4}Showing the first {limit} matches. Type more of the name to narrow them down.{color_reset}")
+
+
+# Columns expected in the header row of a CSV file imported with `import_students_from_csv`.
+# Allergies are separated by semicolons, e.g. "Peanut;Dairy", and may be left empty.
+CSV_COLUMNS = ["fname", "lname", "birthday", "allergies", "guardian_fname", "guardian_lname", "contact_number", "contact_email"]
+
+
+def validate_student_row(row, classrooms):
+    """
+    Validate one CSV row with the same rules as `add_student`.
+
+    Arguments:
+        row (dict): The row, keyed by the names in CSV_COLUMNS.
+        classrooms (list): The Classroom instances the student could be assigned to.
+
+    Returns:
+        dict: The cleaned values, keyed by the names in CSV_COLUMNS, with "allergies" as a list.
+
+    Raises:
+        ValueError: With every problem found in the row, separated by "; ".
+
+    Example Usage:
+        validate_student_row({"fname": "bukayo", "lname": "Saka", "birthday": "2023-01-01", "allergies": "peanut",
+                              "guardian_fname": "Mary", "guardian_lname": "Saka",
+                              "contact_number": "0406346693", "contact_email": "mary@example.com"}, classrooms)
+        -> {"fname": "Bukayo", ..., "allergies": ["Peanut"], ...}
+    """
+    values = {}
+    errors = []
+    name_labels = {
+        "fname": "First name",
+        "lname": "Last name",
+        "guardian_fname": "Parent/guardian's first name",
+        "guardian_lname": "Parent/guardian's last name"
+    }
+    for column, label in name_labels.items():
+        try:
+            values[column] = validate_name(row[column] or "", label)
+        except ValueError as e:
+            errors.append(str(e))
+    try:
+        values["birthday"] = (row["birthday"] or "").strip()
+        if not validate_birthday(values["birthday"], classrooms):
+            errors.append("Student's age is out of the range for all available classrooms.")
+    except ValueError as e:
+        errors.append(str(e))
+    try:
+        values["allergies"] = [validate_allergy(allergy) for allergy in (row["allergies"] or "").split(";") if allergy.strip()]
+    except ValueError as e:
+        errors.append(str(e))
+    for column, validate in [("contact_number", validate_contact_number), ("contact_email", validate_contact_email)]:
+        try:
+            values[column] = validate(row[column] or "")
+        except ValueError as e:
+            errors.append(str(e))
+    if errors:
+        raise ValueError("; ".join(errors))
+    return values
+
+
+def import_students_from_csv(students, classrooms, path, batch_size=1000, connection=None):
+    """
+    Enrol every student listed in a CSV file, e.g. the existing roster of a new site.
+
+    Purpose: Adding thousands of students one prompt at a time with `add_student` is not feasible, so this function
+    reads them from a CSV file instead, using the same validation rules.
+        1. The rows are read and validated in batches of `batch_size`, so a large file is never held in memory at once.
+        2. Every row that fails validation is reported with its line number, and the valid rows are still imported.
+        3. Each valid student is given an ID, and each batch is assigned to classrooms in one pass
+           (see ClassroomRegistry.assign_students). Students for whom no classroom has space are reported and not enrolled.
+        4. The roster is written once at the end (one snapshot of 'data/students.json', or one database transaction),
+           rather than once per student.
+
+    Arguments:
+        students (list): The global list of Student instances to update.
+        classrooms (list): The list of Classroom instances used for student assignment.
+        path (str): The location of the CSV file. Its header row must contain the columns in CSV_COLUMNS.
+        batch_size (int, optional): The number of rows validated and assigned at a time. Default is 1000.
+        connection (sqlite3.Connection, optional): With the SQLite storage backend, the imported students are saved to the
+            database in one transaction. Default is None.
+
+    Returns:
+        tuple or None: (imported students, bad rows), where bad rows is a list of (line number, message) tuples,
+        or None if the file could not be read.
+
+    CSV Input Example:
+        fname,lname,birthday,allergies,guardian_fname,guardian_lname,contact_number,contact_email
+        Bukayo,Saka,2023-01-01,Peanut;Dairy,Mary,Saka,0406346693,mary@example.com
+        Declan,Rice,2023-13-01,,John,Rice,12345,john@example.com
+
+    Example Usage:
+        import_students_from_csv(students, classrooms, "new_site.csv")
+        # Output:
+        #   Imported 1 students from new_site.csv.
+        #   1 rows were not imported:
+        #     Line 3: Invalid date format or date out of range. ...; Contact number should start with '04' ...
+    """
+    try:
+        file = open(path, newline='')
+    except OSError as e:
+        print(f"{color5}Could not open {path}: {e}{color_reset}")
+        return None
+
+    # Assign each batch with one binary search per student, using the classrooms' age band index
+    classroom_registry = classrooms if isinstance(classrooms, ClassroomRegistry) else ClassroomRegistry(classrooms)
+
+    imported = []
+    bad_rows = []  # (line number, message) for every row that was not imported
+    with file:
+        reader = csv.DictReader(file)
+        missing_columns = [column for column in CSV_COLUMNS if column not in (reader.fieldnames or [])]
+        if missing_columns:
+            print(f"{color5}{path} is missing the columns: {', '.join(missing_columns)}{color_reset}")
+            return None
+
+        while True:
+            # Read the next batch, keeping the line each row ended on for error reports
+            batch = [(reader.line_num, row) for row in islice(reader, batch_size)]
+            if not batch:
+                break
+
+            # Validate the batch and create a student, with a new ID, for each valid row
+            new_students = []
+            lines = {}  # Line number of each new student, keyed by student ID
+            for line_number, row in batch:
+                try:
+                    values = validate_student_row(row, classrooms)
+                except ValueError as e:
+                    bad_rows.append((line_number, str(e)))
+                    continue
+                student = Student(values["fname"], values["lname"], values["birthday"], values["allergies"])
+                if student.student_id is None:
+                    bad_rows.append((line_number, "Childcare is full. No more unique student IDs available."))
+                    continue
+                student.guardian = guardian_registry.get_or_add(
+                    values["guardian_fname"], values["guardian_lname"], values["contact_number"], values["contact_email"]
+                )
+                new_students.append(student)
+                lines[student.student_id] = line_number
+
+            # Assign the whole batch to classrooms in one pass
+            for student in classroom_registry.assign_students(new_students):
+                bad_rows.append((lines[student.student_id], "No classroom for the student's age has space."))
+                student_ids.release(student.student_id)
+
+            for student in new_students:
+                if student.classroom is not None:
+                    transition_scheduler.schedule(student)
+                    allergen_index.add(student)
+                    name_index.add(student)
+                    students.append(student)
+                    record_student_change("add", student)
+                    imported.append(student)
+
+    # Write the roster once, now that every batch has been imported
+    if imported:
+        if connection is not None:
+            save_students_to_database(connection, imported)
+        save_students(students, connection=connection)
+
+    print(f"\n{color3}Imported {len(imported)} students from {path}.{color_reset}")
+    if bad_rows:
+        bad_rows.sort()
+        print(f"{color5}{len(bad_rows)} rows were not imported:{color_reset}")
+        for line_number, message in bad_rows:
+            print(f"  Line {line_number}: {message}")
+    return imported, bad_rows
@@ -1,37 +1,88 @@
 # Importing built-in modules (no installation needed)
-from colored import Style  # External library used for adding color and style to terminal output.
+import sys  # Standard library used to read batch commands from the command line and set the exit status.
 
 # Importing third-party libraries (require installation via pip)
-# No third-party libraries are used in this file.
+# No third-party libraries are imported here at startup; `colored` and `prettytable` are imported by the screens that use them.
 
 # Importing internal modules/files (created within the project)
-from constants import color1, color2, color3, color4, color5  # Internal module storing constant variables for consistent styling across the app.
-from functions.student_functions import add_student, list_guardian_details  # Functions to manage students: adding, deleting, and displaying guardian details.
-from functions.classroom_functions import list_students_by_classroom, delete_student, count_total_students  # Functions for classroom-related operations: listing, deleting students, and counting the total number of students.
-from classes.classrooms import students, Classroom  # Internal classes for managing student instances and classroom configurations.
-from classes.kitchen import Kitchen  # Internal class for managing kitchen operations, including meal planning and allergy tracking.
-from functions.kitchen_functions import list_menu_for_week, add_menu_for_day, list_students_with_allergies, delete_menu_for_day  # Functions for managing kitchen operations: adding, updating, listing menus, and handling allergy lists.
-from functions.file_functions import save_students, load_students, save_menu, load_menu  # Functions for saving and loading data persistently to/from JSON files for students and kitchen menus.
+# Only what the main menu needs is imported here. The modules for each screen are imported when it is first opened,
+# and the data is loaded in the background while the main menu is shown (see benchmarks/startup_time.py).
+from constants import color1, color2, color3, color4, color5, color_reset, STORAGE_BACKEND  # Internal module storing constant variables for consistent styling and the selected storage backend.
+from classes.background_task import BackgroundTask  # Internal class that loads the data while the main menu is shown.
 
 
-# Global list for students
-students = []
+def load_application_data(report=print):
+    """
+    Load the classrooms, students and kitchen menu used by both the menus and batch mode.
+
+    Purpose:
+        Imports the classes and file functions it needs itself, so that when it runs in a BackgroundTask their
+        import time overlaps with showing the main menu as well.
+
+    Arguments:
+        report (callable, optional): Called with each message about the load, e.g. a missing data file. Default is print.
+            In a BackgroundTask the messages are kept and printed by the menus instead (see wait_for_data).
+
+    Returns:
+        tuple: (students, classrooms, kitchen, connection), where connection is None with the JSON storage backend.
+
+    Example Usage:
+        students, classrooms, kitchen, connection = load_application_data()
+    """
+    from classes.student_registry import StudentRegistry  # Internal list of students indexed by student ID.
+    from classes.kitchen import Kitchen  # Internal class for managing kitchen operations, including meal planning and allergy tracking.
+    from functions.file_functions import load_students, load_menu, load_classrooms  # Functions for loading data from JSON files for students, kitchen menus and the classroom configuration.
+    from functions.database_functions import connect_database, database_is_empty, save_students_to_database, save_menu_to_database  # Functions for the SQLite storage backend.
+
+    # Global list for students, indexed by student ID so lookups and deletions do not scan the roster
+    students = StudentRegistry()
+
+    # Initialize classrooms from the classroom configuration in data/classrooms.json
+    classrooms = load_classrooms()
+
+    # Open the SQLite database if it is the selected storage backend, otherwise the JSON files are used
+    connection = connect_database() if STORAGE_BACKEND == "sqlite" else None
+
+    # Initialize the kitchen
+    kitchen = Kitchen()
+
+    if connection is not None and database_is_empty(connection):
+        # First start with the database: move the data saved in the JSON files into it
+        load_students(students, classrooms, report=report)
+        load_menu(kitchen, report=report)
+        save_students_to_database(connection, students)
+        save_menu_to_database(connection, kitchen)
+    else:
+        # Load students from the saved students.json file (or the database)
+        load_students(students, classrooms, connection=connection, report=report)
+
+        # Load the kitchen menu from the saved kitchen.json file (or the database)
+        load_menu(kitchen, connection=connection, report=report)
+    return students, classrooms, kitchen, connection
+
+
+def wait_for_data(data):
+    """
+    Wait for the data loading in the background, then print what the loading reported.
 
-# Initialize classrooms
-classrooms = [
-    Classroom("Babies Room (0-2 years)", 0, 2),
-    Classroom("Toddlers Room (2-3 years)", 2, 3),
-    Classroom("Kindergarten Room (3-5 years)", 3, 5)
-]
+    Purpose:
+        The loaders' messages (e.g. "No saved menu found.") are printed here, on the main thread, once the data has
+        loaded, rather than by the background thread over the menu the user is reading.
 
-# Load students from the saved students.json file
-load_students(students, classrooms)
+    Arguments:
+        data (BackgroundTask): The task running load_application_data with report=True.
 
-# Initialize the kitchen
-kitchen = Kitchen()
+    Returns:
+        tuple: (students, classrooms, kitchen, connection), as returned by load_application_data.
+
+    Example Usage:
+        students, classrooms, kitchen, connection = wait_for_data(data)
+    """
+    loaded_data = data.result()
+    for message in data.take_messages():
+        print(message)
+    return loaded_data
 
-# Load the kitchen menu from the saved kitchen.json file
-load_menu(kitchen)
 
 def create_menu(menu_title, options, valid_choices):
     """
@@ -60,7 +111,7 @@ def create_menu(menu_title, options, valid_choices):
             if choice in valid_choices:
                 return choice  # Valid input, return choice
             else:
-                print(f"{color5}Invalid choice. Please enter a number between {valid_choices[0]} and {valid_choices[-1]}.{Style.reset}")
+                print(f"{color5}Invalid choice. Please enter a number between {valid_choices[0]} and {valid_choices[-1]}.{color_reset}")
         except (EOFError, KeyboardInterrupt):
             print("\nInput interrupted. Returning to Main Menu.")
             return valid_choices[-1]  # Return the last valid choice to exit gracefully
@@ -78,7 +129,7 @@ def create_main_menu():
         Input: "1"
         Returns: "1" to indicate the Student Management menu should be opened.
     """
-    welcome_message = f"{color1}Welcome to the Childcare Management Application{Style.reset}\nWhat would you like to manage?\n"
+    welcome_message = f"{color1}Welcome to the Childcare Management Application{color_reset}\nWhat would you like to manage?\n"
     return create_menu(
         welcome_message,
         ["1. Students", "2. Kitchen", "3. Exit\n"],
@@ -98,7 +149,7 @@ def create_student_menu():
         Input: "1"
         Returns: "1" to indicate the Add Student option should be executed.
     """
-    student_header = f"{color2}Student Management Menu{Style.reset}\nWhat would you like to do?\n"
+    student_header = f"{color2}Student Management Menu{color_reset}\nWhat would you like to do?\n"
     return create_menu(
         student_header,
         [
@@ -106,9 +157,12 @@ def create_student_menu():
             "2. Delete Student",
             "3. List Students",
             "4. Display Parent/Guardian Details",
-            "5. Save changes and return to Main Menu\n"
+            "5. Import Students from CSV File",
+            "6. Search Students by Name",
+            "7. List Students Page by Page",
+            "8. Save changes and return to Main Menu\n"
         ],
-        ["1", "2", "3", "4", "5"]
+        ["1", "2", "3", "4", "5", "6", "7", "8"]
     )
 
 def create_kitchen_menu():
@@ -123,7 +177,7 @@ def create_kitchen_menu():
         Input: "3"
         Returns: "3" to indicate the List Menu for the Week option should be executed.
     """
-    kitchen_header = f"{color2}Kitchen Management Menu{Style.reset}\nWhat would you like to do?\n"
+    kitchen_header = f"{color2}Kitchen Management Menu{color_reset}\nWhat would you like to do?\n"
     return create_menu(
         kitchen_header,
         [
@@ -131,58 +185,127 @@ def create_kitchen_menu():
             "2. Delete Menu for the Day",
             "3. List Menu for the Week",
             "4. List Students with Allergies",
-            "5. Save changes and return to Main Menu\n"
+            "5. Find Students with an Allergy",
+            "6. Set Allergens for a Dish",
+            "7. Check Menu for Allergy Conflicts",
+            "8. Set Up a Rotating Menu",
+            "9. Save changes and return to Main Menu\n"
         ],
-        ["1", "2", "3", "4", "5"]
+        ["1", "2", "3", "4", "5", "6", "7", "8", "9"]
     )
 
-# Main logic
-choice = ""
-
-while choice != "3":  # Main menu loop, "3" is exit
-    choice = create_main_menu()
-
-    if choice == "1":  # Student menu
-        student_choice = ""
-        while student_choice != "5":  # Loop for the student sub-menu
-            student_choice = create_student_menu()
-            if student_choice == "1":
-                print(f"{color4}Adding Student{Style.reset}\n")
-                add_student(students, classrooms)
-            elif student_choice == "2":
-                print(f"{color4}Deleting Student{Style.reset}\n")
-                delete_student(students, classrooms)
-            elif student_choice == "3":
-                print(f"\n{color3}Students list{Style.reset}") 
-                list_students_by_classroom(classrooms)  # List students by classroom
-                count_total_students(classrooms)
-            elif student_choice == "4":
-                list_guardian_details(students)  # Display parent/guardian details
-            elif student_choice == "5":
-                save_students(students)# Call save_students while exiting
-                print(f"\n{color3}Student menu changes successfully saved{Style.reset}")  
-
-    elif choice == "2":  # Kitchen menu
-        kitchen_choice = ""
-        while kitchen_choice != "5":  # Loop for the kitchen sub-menu, option 5 goes back to the main menu
-            kitchen_choice = create_kitchen_menu()
-            if kitchen_choice == "1":
-                add_menu_for_day(kitchen)  # Add/Update Menu for the day
-            elif kitchen_choice == "2":
-                print(f"{color4}Deleting Menu for the day{Style.reset}\n")
-                delete_menu_for_day(kitchen)  # Delete menu for the day
-            elif kitchen_choice == "3":
-                list_menu_for_week(kitchen)  # List the menu for the week
-            elif kitchen_choice == "4":
-                list_students_with_allergies(classrooms)  # List students with allergies
-            elif kitchen_choice == "5":
-                print("Save changes and return to Main Menu")
-                save_menu(kitchen)  # Call save_menu to save the kitchen data before exiting
-                print(f"\n{color3}Kitchen changes successfully saved{Style.reset}") 
-                break  # Break the kitchen menu loop to return to the main menu
-
-    elif choice == "3":  # Exit option
-        print(f"\n{color1}Thanks for using the Childcare Management Application.{Style.reset}")
-        print(f"{color1}See you again soon!{Style.reset}\n")
-    
+def run_menus(data, output_format=None):
+    """
+    Run the interactive menus until the user chooses Exit.
+
+    Arguments:
+        data (BackgroundTask): The task running load_application_data with report=True. The main menu is shown while it runs,
+            and the student and kitchen menus wait for it to finish before using the students, classrooms and menu.
+        output_format (str, optional): The format of the listings: "table", "plain", "tsv" or "jsonl", chosen with
+            "python main.py --format FORMAT". Defaults to OUTPUT_FORMAT in constants.py.
+
+    Example Usage:
+        run_menus(BackgroundTask(load_application_data, report=True))
+    """
+    choice = ""
+
+    while choice != "3":  # Main menu loop, "3" is exit
+        if data.done():
+            # Move students who outgrew their classroom since the last menu, once the data has loaded
+            from functions.classroom_functions import run_classroom_transitions  # Function that moves students who outgrow their classroom.
+            students, classrooms, kitchen, connection = wait_for_data(data)
+            run_classroom_transitions(students, classrooms, connection=connection)
+        choice = create_main_menu()
+
+        if choice == "1":  # Student menu
+            students, classrooms, kitchen, connection = wait_for_data(data)  # Wait for the data if it is still loading
+            from functions.student_functions import add_student, list_guardian_details, import_students_from_csv, search_students_by_name  # Functions to manage students: adding, importing, searching, and displaying guardian details.
+            from functions.classroom_functions import list_students_by_classroom, list_students_page_by_page, delete_student, count_total_students, run_classroom_transitions  # Functions for classroom-related operations: listing (as tables or page by page), deleting students, counting the total number of students, and moving students who outgrow their classroom.
+            from functions.file_functions import save_students  # Function for saving the students to the JSON files or database.
+            student_choice = ""
+            while student_choice != "8":  # Loop for the student sub-menu
+                run_classroom_transitions(students, classrooms, connection=connection)
+                student_choice = create_student_menu()
+                if student_choice == "1":
+                    print(f"{color4}Adding Student{color_reset}\n")
+                    add_student(students, classrooms, connection=connection)
+                elif student_choice == "2":
+                    print(f"{color4}Deleting Student{color_reset}\n")
+                    delete_student(students, classrooms, connection=connection)
+                elif student_choice == "3":
+                    print(f"\n{color3}Students list{color_reset}") 
+                    list_students_by_classroom(classrooms, output_format)  # List students by classroom
+                    count_total_students(classrooms)
+                elif student_choice == "4":
+                    list_guardian_details(students, connection=connection)  # Display parent/guardian details
+                elif student_choice == "5":
+                    print(f"{color4}Importing Students{color_reset}\n")
+                    try:
+                        csv_path = input("Enter the path of the CSV file to import: ").strip()
+                        import_students_from_csv(students, classrooms, csv_path, connection=connection)
+                    except EOFError:
+                        print(f"\n{color5}Input interrupted. Returning to previous menu.{color_reset}")
+                elif student_choice == "6":
+                    search_students_by_name()  # Find students and their IDs by name
+                elif student_choice == "7":
+                    list_students_page_by_page(classrooms)  # Stream large classrooms a page at a time
+                elif student_choice == "8":
+                    save_students(students, journal=True, connection=connection)  # Append this session's changes to the student journal while exiting
+                    print(f"\n{color3}Student menu changes successfully saved{color_reset}")  
+
+        elif choice == "2":  # Kitchen menu
+            students, classrooms, kitchen, connection = wait_for_data(data)  # Wait for the data if it is still loading
+            from functions.kitchen_functions import list_menu_for_week, add_menu_for_day, list_students_with_allergies, delete_menu_for_day, find_students_with_allergen, set_dish_allergens, list_allergy_conflicts, set_up_menu_rotation  # Functions for managing kitchen operations: adding, updating, listing and rotating menus, handling allergy lists and searches, and checking the menu against allergies.
+            from functions.classroom_functions import run_classroom_transitions  # Function that moves students who outgrow their classroom.
+            from functions.file_functions import save_menu  # Function for saving the kitchen menu to the JSON files.
+            run_classroom_transitions(students, classrooms, connection=connection)  # In case the data finished loading after the main menu was shown
+            kitchen_choice = ""
+            while kitchen_choice != "9":  # Loop for the kitchen sub-menu, option 9 goes back to the main menu
+                kitchen_choice = create_kitchen_menu()
+                if kitchen_choice == "1":
+                    add_menu_for_day(kitchen, connection=connection)  # Add/Update Menu for the day
+                elif kitchen_choice == "2":
+                    print(f"{color4}Deleting Menu for the day{color_reset}\n")
+                    delete_menu_for_day(kitchen, connection=connection)  # Delete menu for the day
+                elif kitchen_choice == "3":
+                    list_menu_for_week(kitchen, output_format)  # List the menu for the week
+                elif kitchen_choice == "4":
+                    list_students_with_allergies(classrooms, connection=connection, output_format=output_format)  # List students with allergies
+                elif kitchen_choice == "5":
+                    find_students_with_allergen(classrooms, output_format)  # Search students by allergy, optionally in one classroom
+                elif kitchen_choice == "6":
+                    set_dish_allergens(kitchen)  # Record the allergens in a dish
+                elif kitchen_choice == "7":
+                    list_allergy_conflicts(kitchen, output_format)  # List meals that students are allergic to
+                elif kitchen_choice == "8":
+                    set_up_menu_rotation(kitchen, connection=connection)  # Repeat a rotating menu through the year
+                elif kitchen_choice == "9":
+                    print("Save changes and return to Main Menu")
+                    save_menu(kitchen, connection=connection)  # Call save_menu to save the kitchen data before exiting
+                    print(f"\n{color3}Kitchen changes successfully saved{color_reset}") 
+                    break  # Break the kitchen menu loop to return to the main menu
+
+        elif choice == "3":  # Exit option
+            print(f"\n{color1}Thanks for using the Childcare Management Application.{color_reset}")
+            print(f"{color1}See you again soon!{color_reset}\n")
+
 
+# Main logic: with arguments, run them as batch commands (see functions/batch_functions.py), otherwise show the menus
+# ("--format FORMAT" alone shows the menus with their listings in that format)
+if __name__ == "__main__":
+    if sys.argv[1:2] in (["help"], ["--help"], ["-h"]):
+        from functions.batch_functions import BATCH_USAGE  # Description of the batch commands.
+        print(BATCH_USAGE)
+    elif len(sys.argv) == 3 and sys.argv[1] == "--format":
+        # Only a format: show the menus, with every listing in that format
+        from functions.output_functions import OUTPUT_FORMATS  # The listing formats, to check the one given.
+        if sys.argv[2] not in OUTPUT_FORMATS:
+            print(f"--format expects one of {', '.join(OUTPUT_FORMATS)}.", file=sys.stderr)
+            sys.exit(2)
+        run_menus(BackgroundTask(load_application_data, report=True), output_format=sys.argv[2])
+    elif len(sys.argv) > 1:
+        from functions.batch_functions import run_batch  # Runs commands from the command line or a script without the menus.
+        # Loader messages go to standard error, so they never mix with listings piped from standard output
+        sys.exit(run_batch(sys.argv[1:], *load_application_data(report=lambda message: print(message, file=sys.stderr))))
+    else:
+        run_menus(BackgroundTask(load_application_data, report=True))  # Load the data while the main menu is shown
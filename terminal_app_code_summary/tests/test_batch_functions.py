@@ -0,0 +1,76 @@
+import json  # Standard library used to read back the JSON Lines listing.
+from datetime import date, timedelta  # Standard library used to build birthdays relative to today.
+
+from classes.classrooms import Classroom  # Internal class used to create classroom instances.
+from classes.kitchen import Kitchen  # Internal class that holds the kitchen menu.
+from classes.student_registry import StudentRegistry  # Internal list of students indexed by student ID.
+from classes.students import student_ids  # Global student ID allocator, watched for released IDs.
+from functions.batch_functions import run_batch  # Function that runs batch commands and saves once.
+
+
+def test_batch_script_runs_every_command_and_saves_once(mocker, tmp_path, capsys):
+    """
+    Purpose: Tests that a batch script enrols and deletes students, sets the menu and prints listings without prompts,
+    reports failed lines, and saves the roster and menu once at the end.
+
+    Assertions:
+        - Both valid students are enrolled, and the deleted one is removed again.
+        - The menu day is set, with dish names in title case.
+        - The JSON Lines listing is written to standard output, and failures to standard error with line numbers.
+        - The roster and the menu are each saved exactly once, and the exit status reports the failure.
+    """
+    save_students = mocker.patch("functions.batch_functions.save_students")
+    save_menu = mocker.patch("functions.batch_functions.save_menu")
+    mocker.patch("builtins.input", side_effect=AssertionError("Batch mode must not prompt"))
+    students = StudentRegistry()
+    classrooms = [Classroom("Babies Room (0-2 years)", 0, 2), Classroom("Toddlers Room (2-3 years)", 2, 3), Classroom("Kindergarten Room (3-5 years)", 3, 5)]
+    kitchen = Kitchen()
+
+    script = tmp_path / "nightly.txt"
+    script.write_text(
+        "# Nightly sync\n"
+        "add Bukayo Saka 2023-01-01 'Peanut;Dairy' Mary Saka 0406346693 mary@example.com\n"
+        "add Declan Rice 2023-02-01 '' John Rice 0406346694 john@example.com\n"
+        "\n"
+        "delete 999999\n"
+        "menu set 5 monday pancakes 'chicken pasta' 'fruit salad'\n"
+        "list jsonl\n"
+    )
+    assert run_batch(["run", str(script)], students, classrooms, kitchen) == 1
+
+    assert [student.full_name for student in students] == ["Bukayo Saka", "Declan Rice"]
+    assert kitchen.menu["5"]["Monday"]["Lunch"] == "Chicken Pasta"
+    output = capsys.readouterr()
+    assert [json.loads(line)["name"] for line in output.out.splitlines()] == ["Bukayo Saka", "Declan Rice"]
+    assert "Line 5: Student with ID 999999 not found." in output.err
+    assert "Ran 5 commands, 1 failed." in output.err
+    save_students.assert_called_once_with(students, journal=True, connection=None)
+    save_menu.assert_called_once_with(kitchen, connection=None)
+
+    assert run_batch(["delete", str(students[0].student_id)], students, classrooms, kitchen) == 0
+    assert [student.full_name for student in students] == ["Declan Rice"]
+
+
+def test_batch_add_to_full_rooms_enrols_nobody_and_releases_the_id(mocker, capsys):
+    """
+    Purpose: Tests that a batch "add" for a student whose classrooms are all full fails without leaving a nameless
+    student in the roster, and gives the allocated student ID back.
+
+    Assertions:
+        - The command fails with a message on standard error and exit status 1.
+        - The roster is unchanged and nothing is saved.
+        - The allocated student ID is released.
+    """
+    save_students = mocker.patch("functions.batch_functions.save_students")
+    release = mocker.spy(student_ids, "release")
+    students = StudentRegistry()
+    classrooms = [Classroom("Kindergarten Room (3-5 years)", 3, 5, capacity=0)]
+
+    birthday = (date.today() - timedelta(days=4 * 365)).isoformat()
+    assert run_batch(["add", "Bukayo", "Saka", birthday, "", "Mary", "Saka", "0406346693", "mary@example.com"], students, classrooms, Kitchen()) == 1
+
+    assert "No classroom for the student's age has space." in capsys.readouterr().err
+    assert len(students) == 0
+    save_students.assert_not_called()
+    release.assert_called_once()
+    assert not student_ids.is_used(release.call_args.args[0])
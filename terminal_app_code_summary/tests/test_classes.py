@@ -0,0 +1,383 @@
+from datetime import date, timedelta  # Standard library used to fake today's date and build birthdays relative to it.
+from io import StringIO  # Standard library in-memory file, used to capture paged listings.
+from concurrent.futures import ThreadPoolExecutor  # Standard library used to call the ID allocator from several threads.
+
+import pytest  # External library used for writing and running tests.
+
+import classes.students  # Module whose `date` is patched to control today's date.
+from classes.students import Student  # Internal class for creating student instances.
+from classes.parent_guardian import ParentGuardian  # Internal class for guardian details.
+from classes.classrooms import Classroom, ClassroomRegistry  # Internal classes used to create and index classroom instances.
+from classes.student_registry import StudentRegistry  # Internal list of students indexed by student ID.
+from classes.id_allocator import IdAllocator  # Internal allocator of unique student IDs.
+from classes.allergen_index import AllergenIndex, normalize_allergen  # Internal inverted index of students by allergen.
+from classes.name_index import NameIndex  # Internal prefix index of student and guardian names.
+from classes.kitchen import Kitchen  # Internal class that holds the kitchen menu and the allergens in each dish.
+from classes.exposure_checker import ExposureChecker  # Internal checker of the menu against students' allergies.
+from functions.classroom_functions import assign_student, delete_student, list_students_by_classroom, page_students_by_classroom, roster_lines  # Functions that place, delete and list students.
+from classes.render_cache import render_cache  # Internal cache of rendered listings.
+from classes.background_task import BackgroundTask  # Internal class that loads data while the main menu is shown.
+
+def test_slotted_people_keep_getters():
+    """
+    Purpose: Tests that students and guardians use __slots__ instead of a per-instance __dict__,
+    that guardians no longer carry the student-only birthday and allergies, and that the getters still work.
+
+    Assertions:
+        - Neither instance has a __dict__.
+        - The guardian has no birthday or allergies attribute.
+        - The student and guardian getters return the values passed in.
+    """
+    student = Student("Bukayo", "Saka", "2023-01-01", ["Peanut"], student_id=7)
+    guardian = ParentGuardian("Mary", "Saka", "0406346693", "mary@example.com")
+    student.guardian = guardian
+
+    assert not hasattr(student, "__dict__")
+    assert not hasattr(guardian, "__dict__")
+    assert not hasattr(guardian, "birthday") and not hasattr(guardian, "allergies")
+    assert student.get_student_id() == 7
+    assert student.get_formatted_id() == "07"
+    assert student.get_allergies() == ["Peanut"]
+    assert student.guardian.get_guardian_contact_email() == "mary@example.com"
+    assert guardian.full_name == "Mary Saka"
+
+def test_age_is_cached_until_the_day_or_birthday_changes(mocker):
+    """
+    Purpose: Tests that `calculate_age` reuses the age computed earlier the same day,
+    and recomputes it when the date changes or the birthday is edited.
+
+    Assertions:
+        - The age matches the number of days since the birthday divided by 365.25.
+        - Editing the birthday or moving to the next day gives a new age.
+    """
+    fake_date = mocker.patch.object(classes.students, "date", wraps=date)
+    fake_date.fromisoformat = date.fromisoformat
+    fake_date.today.return_value = date(2025, 1, 1)
+
+    student = Student("Bukayo", "Saka", "2023-01-01", student_id=7)
+    assert student.calculate_age() == 731 / 365.25
+    assert student.calculate_age() == 731 / 365.25
+
+    student.birthday = "2024-01-01"
+    assert student.calculate_age() == 366 / 365.25
+
+    fake_date.today.return_value = date(2025, 1, 2)
+    assert student.calculate_age() == 367 / 365.25
+
+def test_student_registry_finds_and_deletes_by_id(mocker):
+    """
+    Purpose: Tests that the student ID index follows students as they are added, assigned and deleted,
+    and that `delete_student` uses it to remove a student from the roster and their classroom.
+
+    Assertions:
+        - Students are found by ID, with their position in the roster and classroom.
+        - After deleting, the other students keep their order and the index is updated.
+        - Unknown IDs return None.
+    """
+    classrooms = [Classroom("Kindergarten Room (3-5 years)", 3, 5)]
+    students = StudentRegistry()
+    for student_id, fname in [(1, "Declan"), (2, "Martin"), (3, "Gabriel")]:
+        student = Student(fname, "Rice", "2022-06-01", student_id=student_id)
+        students.append(student)
+        assign_student(classrooms, student, silent=True)
+
+    assert students.get(2).get_fname() == "Martin"
+    assert students.position(3) == 2
+    assert classrooms[0].students.position(3) == 2
+
+    mocker.patch('builtins.input', return_value='1')
+    delete_student(students, classrooms)
+
+    assert students.get(1) is None
+    assert [student.student_id for student in students] == [2, 3]
+    assert [student.student_id for student in classrooms[0].students] == [2, 3]
+    assert students.position(3) == 1 and classrooms[0].students.position(3) == 1
+    assert students.position(2) == 0 and classrooms[0].students.position(2) == 0
+
+def test_unenrolled_students_are_not_found_and_replaced_students_leave_the_index(mocker, capsys):
+    """
+    Purpose: Tests that deleting or looking up a student who could not be placed in a classroom reports them as
+    not found instead of failing, and that replacing a student in the roster removes the old ID from the index.
+
+    Assertions:
+        - Deleting the unenrolled student's ID prints "not found" and leaves the roster unchanged.
+        - Their guardian details are reported as not found.
+        - After `students[0] = other`, the old ID is not found, the new one is, and removing it still works.
+    """
+    from functions.student_functions import list_guardian_details  # Imported here, as main.py does, to show guardian details.
+
+    classrooms = [Classroom("Kindergarten Room (3-5 years)", 3, 5)]
+    students = StudentRegistry()
+    unenrolled = Student("Declan", "Rice", (date.today() - timedelta(days=10 * 365)).isoformat(), student_id=1)
+    students.append(unenrolled)
+    assign_student(classrooms, unenrolled, silent=True)
+    assert unenrolled.classroom is None
+
+    mocker.patch('builtins.input', return_value='1')
+    delete_student(students, classrooms)
+    assert "not found" in capsys.readouterr().out
+    assert students.get(1) is unenrolled
+
+    list_guardian_details(students)
+    assert "No student found with ID 1" in capsys.readouterr().out
+
+    other = Student("Martin", "Odegaard", (date.today() - timedelta(days=4 * 365)).isoformat(), student_id=2)
+    students[0] = other
+    assert students.get(1) is None
+    assert students.get(2) is other and students.position(2) == 0
+    students.remove(other)
+    assert len(students) == 0 and students.get(2) is None
+
+def test_id_allocator_skips_loaded_ids_and_reuses_released_ones():
+    """
+    Purpose: Tests that the ID allocator never hands out an ID that is marked as used,
+    reuses released IDs, reports when it is full, and gives unique IDs to concurrent callers.
+
+    Assertions:
+        - Seeded IDs are skipped and a released ID is handed out again.
+        - None is returned once every ID is in use.
+        - IDs handed out from several threads are all different.
+    """
+    allocator = IdAllocator(capacity=5)
+    allocator.mark_used(1)
+    allocator.mark_used(3)
+    assert [allocator.allocate(), allocator.allocate()] == [2, 4]
+
+    allocator.release(2)
+    assert not allocator.is_used(2)
+    assert [allocator.allocate(), allocator.allocate(), allocator.allocate()] == [2, 5, None]
+    assert len(allocator) == 5
+
+    allocator = IdAllocator(capacity=2_000_000)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        ids = list(executor.map(lambda _: allocator.allocate(), range(20_000)))
+    assert len(set(ids)) == 20_000 and None not in ids
+
+def test_classroom_registry_handles_overlapping_bands_and_capacity():
+    """
+    Purpose: Tests that the classroom registry's binary search gives the same classroom as checking each
+    classroom in order, including overlapping age ranges, and that full classrooms are skipped.
+
+    Assertions:
+        - Every age finds the first valid classroom in the configured order.
+        - Once a classroom reaches its capacity, students go to the next valid classroom, or are left unassigned.
+    """
+    classrooms = ClassroomRegistry.from_config([
+        {"name": "Babies", "min_age": 0, "max_age": 2, "capacity": 1},
+        {"name": "Mixed", "min_age": 1, "max_age": 3, "capacity": 1},
+        {"name": "Kindergarten", "min_age": 2.5, "max_age": 5}
+    ])
+    for age in [0, 0.5, 1, 1.9, 2, 2.5, 2.99, 3, 4.9, 5, 6, -1]:
+        expected = next((classroom for classroom in classrooms if classroom.is_valid_for_age(age)), None)
+        assert classrooms.find_classroom(age) is expected
+
+    birthday = (date.today() - timedelta(days=500)).isoformat()  # About 1.4 years old, valid for Babies and Mixed
+    students = [Student(fname, "Rice", birthday, student_id=number) for number, fname in enumerate(["Declan", "Martin", "Gabriel"], start=1)]
+
+    unassigned = classrooms.assign_students(students)
+    assert [student.get_classroom_name() for student in students[:2]] == ["Babies", "Mixed"]
+    assert unassigned == [students[2]]
+
+def test_allergen_index_normalizes_names_and_filters_by_classroom():
+    """
+    Purpose: Tests that different spellings of an allergen are indexed together, that students can be found
+    by allergen and classroom, and that removing a student removes them from the index.
+
+    Assertions:
+        - "Peanut", "peanuts" and "Peanut Allergy" normalize to the same allergen, while "Citrus" is left unchanged.
+        - A query finds every student with the allergen, or only those in the given classroom.
+        - Removed students are no longer found, and allergens nobody has are dropped.
+    """
+    assert normalize_allergen("Peanut") == normalize_allergen("peanuts") == normalize_allergen("Peanut Allergy") == "peanut"
+    assert normalize_allergen("Citrus") == "citrus" and normalize_allergen("Tree-Nuts") == "tree nut"
+
+    toddlers = Classroom("Toddlers Room (2-3 years)", 2, 3)
+    kindergarten = Classroom("Kindergarten Room (3-5 years)", 3, 5)
+    index = AllergenIndex()
+    students = []
+    for student_id, allergies, classroom in [(1, ["Peanut"], toddlers), (2, ["peanuts", "Dairy"], kindergarten), (3, [], toddlers)]:
+        student = Student("Declan", "Rice", "2023-01-01", allergies, student_id=student_id)
+        student.assign_classroom(classroom)
+        index.add(student)
+        students.append(student)
+
+    assert index.find_students("Peanut Allergy") == students[:2]
+    assert index.find_students("peanut", classroom_name="Toddlers Room (2-3 years)") == [students[0]]
+    assert list(index.students_with_allergies) == [1, 2]
+    assert index.allergens() == ["Dairy", "Peanut"]
+
+    index.remove(students[1])
+    assert index.find_students("peanuts") == [students[0]]
+    assert index.allergens() == ["Peanut"]
+
+def test_name_index_finds_students_by_name_prefix():
+    """
+    Purpose: Tests that the name index finds students by the start of their own or their guardian's first, last
+    or full name, ignoring case, and that it is updated when students are added and removed.
+
+    Assertions:
+        - Prefixes of first, last and full names (of students and guardians) find the student once.
+        - Students added after a search are found by the next search.
+        - Removed students are no longer found.
+    """
+    index = NameIndex()
+    bukayo = Student("Bukayo", "Saka", "2023-01-01", student_id=1)
+    bukayo.guardian = ParentGuardian("Mary", "Saka", "0406346693", "mary@example.com")
+    declan = Student("Declan", "Rice", "2023-01-01", student_id=2)
+    index.add(bukayo)
+    index.add(declan)
+
+    assert index.search("SA") == [bukayo]
+    assert index.search("bukayo s") == [bukayo]
+    assert index.search("mary") == [bukayo]
+    assert index.search("r") == [declan]
+    assert index.search("x") == [] and index.search("  ") == []
+
+    reece = Student("Reece", "James", "2023-01-01", student_id=3)
+    index.add(reece)
+    assert index.search("r") == [reece, declan]
+
+    index.remove(declan)
+    assert index.search("r") == [reece]
+    assert index.search("declan") == []
+
+def test_exposure_checker_flags_conflicts_and_rechecks_changes():
+    """
+    Purpose: Tests that the exposure checker finds every meal a student is allergic to across the menu,
+    and that changes to the menu, a dish's allergens or the students are picked up by the next refresh.
+
+    Assertions:
+        - Each (week, day, meal, student) conflict is listed once, with the student's matching allergies.
+        - Students in other classrooms or without the allergy are not flagged.
+        - Editing a meal, changing a dish's allergens, and adding or removing students update the conflicts.
+    """
+    toddlers = Classroom("Toddlers Room (2-3 years)", 2, 3)
+    kindergarten = Classroom("Kindergarten Room (3-5 years)", 3, 5)
+    index = AllergenIndex()
+    bukayo = Student("Bukayo", "Saka", "2023-01-01", ["Peanuts"], student_id=1)
+    declan = Student("Declan", "Rice", "2022-01-01", ["Dairy"], student_id=2)
+    for student, classroom in [(bukayo, toddlers), (declan, kindergarten)]:
+        student.assign_classroom(classroom)
+        index.add(student)
+
+    kitchen = Kitchen()
+    kitchen.menu["1"] = {"Monday": {"Breakfast": "Peanut Butter Toast", "Lunch": "Pasta", "Afternoon Tea": "Fruit"}}
+    kitchen.menu["52"] = {"Friday": {"Lunch": "Peanut Butter Toast"}}
+    kitchen.dish_allergens = {"Peanut Butter Toast": ["Peanut", "Wheat"], "Pasta": ["Wheat"]}
+    checker = ExposureChecker(index)
+    checker.refresh(kitchen)
+
+    assert checker.conflicts() == [
+        ("1", "Monday", "Breakfast", "Peanut Butter Toast", bukayo, ["Peanuts"]),
+        ("52", "Friday", "Lunch", "Peanut Butter Toast", bukayo, ["Peanuts"]),
+    ]
+
+    kitchen.menu["1"]["Monday"]["Afternoon Tea"] = "Cheese Scones"
+    kitchen.dish_allergens["Cheese Scones"] = ["Dairy"]
+    checker.refresh(kitchen)
+    checker.update_dish("Cheese Scones")
+    assert checker.conflicts("1", "Monday")[1] == ("1", "Monday", "Afternoon Tea", "Cheese Scones", declan, ["Dairy"])
+
+    kitchen.dish_allergens["Peanut Butter Toast"] = ["Wheat"]
+    checker.update_dish("peanut butter toast")
+    assert [conflict[:3] for conflict in checker.conflicts()] == [("1", "Monday", "Afternoon Tea")]
+
+    reece = Student("Reece", "James", "2022-01-01", ["Wheat"], student_id=3)
+    reece.assign_classroom(kindergarten)
+    index.add(reece)
+    index.remove(declan)
+    checker.refresh(kitchen)
+    assert [(conflict[2], conflict[4]) for conflict in checker.conflicts()] == [("Breakfast", reece), ("Lunch", reece), ("Lunch", reece)]
+
+def test_classroom_listing_is_cached_until_the_roster_changes(capsys):
+    """
+    Purpose: Tests that listing the students by classroom reuses each classroom's rendered table,
+    and that enrolling a student re-renders only their classroom.
+
+    Assertions:
+        - A repeated listing of an unchanged roster renders nothing and prints the same output.
+        - After one enrolment, only the changed classroom is rendered again and the new student is listed.
+    """
+    classrooms = [Classroom("Toddlers Room (2-3 years)", 2, 3), Classroom("Kindergarten Room (3-5 years)", 3, 5)]
+    for student_id, classroom in [(1, classrooms[0]), (2, classrooms[1])]:
+        student = Student("Declan", "Rice", "2022-06-01", student_id=student_id)
+        classroom.students.append(student)
+        student.assign_classroom(classroom)
+    render_cache.clear()
+
+    list_students_by_classroom(classrooms)
+    first_output = capsys.readouterr().out
+    misses = render_cache.misses
+    list_students_by_classroom(classrooms)
+    assert capsys.readouterr().out == first_output
+    assert render_cache.misses == misses
+
+    classrooms[1].students.append(Student("Martin", "Odegaard", "2022-06-01", student_id=3))
+    list_students_by_classroom(classrooms)
+    assert render_cache.misses == misses + 1
+    assert "Martin Odegaard (ID: 03)" in capsys.readouterr().out
+
+
+def test_paged_listing_streams_fixed_width_rows_in_sort_order(mocker):
+    """
+    Purpose: Tests that the page-by-page listing splits a classroom into pages of fixed-width rows in the chosen
+    order, and stops when the next page is declined.
+
+    Assertions:
+        - Sorting by name lists the students by last name, two per page, over two pages.
+        - Every student row has the same width.
+        - Declining the next page stops the listing after the first page.
+        - A classroom already in ID order is listed by ID without being sorted.
+    """
+    classroom = Classroom("Toddlers Room (2-3 years)", 2, 3)
+    for student_id, fname, lname in [(1, "Declan", "Rice"), (2, "Bukayo", "Saka"), (3, "Martin", "Odegaard")]:
+        student = Student(fname, lname, "2022-06-01", student_id=student_id)
+        classroom.students.append(student)
+        student.assign_classroom(classroom)
+
+    output = StringIO()
+    assert page_students_by_classroom([classroom], page_size=2, sort_key="name", output=output) is True
+    lines = output.getvalue().splitlines()
+    rows = [line for line in lines if "(ID: " in line]
+    assert [row.split(" (ID")[0] for row in rows] == ["Martin Odegaard", "Declan Rice", "Bukayo Saka"]
+    assert len({len(row) for row in rows}) == 1
+    assert sum("(page " in line for line in lines) == 2
+
+    output = StringIO()
+    assert page_students_by_classroom([classroom], page_size=2, output=output, next_page=lambda: False) is False
+    assert "page 2 of 2" not in output.getvalue()
+
+    sort = mocker.patch("functions.classroom_functions.sorted", create=True)
+    rows = list(roster_lines(classroom))
+    assert [row.split(" (ID")[0] for row in rows] == ["Declan Rice", "Bukayo Saka", "Martin Odegaard"]
+    sort.assert_not_called()
+
+
+def test_background_task_hands_over_its_result_or_error():
+    """
+    Purpose: Tests that a background task returns what its function returned, waiting for it if needed,
+    raises the error its function raised when the result is asked for, and keeps reported messages for the caller.
+
+    Assertions:
+        - result() returns the function's value and the task is then done.
+        - An error raised in the background is raised again by result().
+        - Messages reported with report=True are returned once by take_messages() instead of being printed.
+    """
+    task = BackgroundTask(lambda: ("students", "classrooms"))
+    assert task.result() == ("students", "classrooms")
+    assert task.done()
+
+    def fail():
+        raise ValueError("Corrupted data file")
+
+    with pytest.raises(ValueError, match="Corrupted data file"):
+        BackgroundTask(fail).result()
+
+    def load(report):
+        report("No saved menu found. Starting with an empty menu.")
+        return "kitchen"
+
+    task = BackgroundTask(load, report=True)
+    assert task.result() == "kitchen"
+    assert task.take_messages() == ["No saved menu found. Starting with an empty menu."]
+    assert task.take_messages() == []
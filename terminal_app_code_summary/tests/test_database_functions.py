@@ -0,0 +1,93 @@
+import pytest  # External library used for writing and running tests.
+
+from classes.classrooms import Classroom  # Internal class used to create and manage classroom instances.
+from classes.students import Student  # Internal class for creating student instances.
+from classes.parent_guardian import ParentGuardian  # Internal class for guardian details.
+from functions.database_functions import connect_database, save_student_to_database, find_students_with_allergies_in_database, save_menu_to_database, load_menu_from_database  # SQLite storage backend.
+from functions.classroom_functions import delete_student  # Function that deletes a student by ID.
+from functions.file_functions import load_students  # Function that loads students from the selected storage backend.
+from functions.kitchen_functions import set_menu_for_day  # Function that sets one day of the menu without prompting.
+from classes.kitchen import Kitchen  # Internal class that holds the kitchen menu.
+
+@pytest.fixture
+def classrooms():
+    """
+    Purpose: Provides a reusable fixture that initializes a list of predefined Classroom instances.
+    """
+    return [
+        Classroom("Babies Room (0-2 years)", 0, 2),
+        Classroom("Toddlers Room (2-3 years)", 2, 3),
+        Classroom("Kindergarten Room (3-5 years)", 3, 5)
+    ]
+
+@pytest.fixture
+def connection():
+    """
+    Purpose: Provides an in-memory SQLite database with the application's tables created.
+    """
+    connection = connect_database(":memory:")
+    yield connection
+    connection.close()
+
+def test_database_round_trip_and_delete(mocker, connection, classrooms):
+    """
+    Purpose: Tests that students saved one at a time are loaded back with their guardian and allergies,
+    and that `delete_student` removes a student from both the database and the classroom.
+
+    Assertions:
+        - The loaded student keeps their ID, guardian and allergies.
+        - Siblings saved with identical guardian details share one guardian row.
+        - The allergy query only returns students with allergies.
+        - After deleting, the student is gone from memory and from the database.
+        - The shared guardian row is kept until the last sibling is deleted.
+    """
+    for student_id, fname, allergies in [(1, "Cole", ["Peanut"]), (2, "Reece", [])]:
+        student = Student(fname, "James", "2023-01-01", allergies, student_id=student_id)
+        student.guardian = ParentGuardian("Mary", "James", "0406346693", "mary@example.com")
+        student.assign_classroom(classrooms[2])
+        save_student_to_database(connection, student)
+
+    students = []
+    load_students(students, classrooms, connection=connection)
+    assert [student.student_id for student in students] == [1, 2]
+    assert students[0].guardian.get_guardian_contact_email() == "mary@example.com"
+    assert connection.execute("SELECT COUNT(*) FROM guardians").fetchone()[0] == 1
+    assert find_students_with_allergies_in_database(connection) == [(1, "Cole", "James", "Kindergarten Room (3-5 years)", ["Peanut"])]
+
+    mocker.patch('builtins.input', return_value='1')
+    delete_student(students, classrooms, connection=connection)
+
+    assert [student.student_id for student in students] == [2]
+    assert [student.student_id for student in classrooms[2].students] == [2]
+    assert connection.execute("SELECT student_id FROM students").fetchall() == [(2,)]
+    assert find_students_with_allergies_in_database(connection) == []
+    assert connection.execute("SELECT COUNT(*) FROM guardians").fetchone()[0] == 1
+
+    mocker.patch('builtins.input', return_value='2')
+    delete_student(students, classrooms, connection=connection)
+    assert connection.execute("SELECT COUNT(*) FROM guardians").fetchone()[0] == 0
+
+def test_rotation_edits_reach_repeated_weeks_after_a_reload(connection):
+    """
+    Purpose: Tests that editing a day of a rotating menu's first weeks with the SQLite backend also saves the weeks
+    repeating that day, so a reloaded menu shows the edit in every repeated week.
+
+    Assertions:
+        - After setting Monday of Week 1 in a 2 week rotation, the reloaded Week 3 Monday has the new dish.
+        - Week 4, which repeats Week 2, and a Week 5 day with its own dishes are unchanged.
+    """
+    kitchen = Kitchen()
+    kitchen.add_menu(1, "Monday", "A1", "A1 Lunch", "A1 Tea")
+    kitchen.add_menu(2, "Monday", "B1", "B1 Lunch", "B1 Tea")
+    kitchen.menu.set_rotation(1, 2, 6)
+    kitchen.menu["5"]["Monday"]["Breakfast"] = "Own"
+    save_menu_to_database(connection, kitchen)
+
+    set_menu_for_day(kitchen, "1", "Monday", ["NEW", "A1 Lunch", "A1 Tea"], connection=connection)
+    assert kitchen.menu["3"]["Monday"]["Breakfast"] == "NEW"
+
+    reloaded_kitchen = Kitchen()
+    load_menu_from_database(connection, reloaded_kitchen)
+    assert reloaded_kitchen.menu["3"]["Monday"]["Breakfast"] == "NEW"
+    assert reloaded_kitchen.menu["4"]["Monday"]["Breakfast"] == "B1"
+    assert reloaded_kitchen.menu["5"]["Monday"]["Breakfast"] == "Own"
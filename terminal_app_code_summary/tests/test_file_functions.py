@@ -0,0 +1,325 @@
+import json  # Standard library used to read the saved files back.
+import os  # Standard library used to check which data files were written.
+from datetime import date, timedelta  # Standard library used to build birthdays relative to today.
+
+import pytest  # External library used for writing and running tests.
+
+from classes.classrooms import Classroom  # Internal class used to create and manage classroom instances.
+from classes.students import Student, student_changes, record_student_change  # Internal class and journal helpers for students.
+from classes.parent_guardian import ParentGuardian  # Internal class for guardian details.
+from functions import file_functions  # Internal module under test, patched to use a temporary data folder.
+from functions.file_functions import save_students, load_students, save_menu, load_menu  # Functions for saving and loading students and menus.
+from classes.kitchen import Kitchen  # Internal class that holds the kitchen menu.
+from classes.allergen_index import AllergenIndex  # Internal index of students by allergen.
+from classes.exposure_checker import ExposureChecker  # Internal checker of the menu against students' allergies.
+from functions.kitchen_functions import set_menu_for_day  # Function that sets one day of the menu without prompting.
+
+@pytest.fixture
+def classrooms():
+    """
+    Purpose: Provides a reusable fixture that initializes a list of predefined Classroom instances.
+    """
+    return [
+        Classroom("Babies Room (0-2 years)", 0, 2),
+        Classroom("Toddlers Room (2-3 years)", 2, 3),
+        Classroom("Kindergarten Room (3-5 years)", 3, 5)
+    ]
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """
+    Purpose: Runs the test inside a temporary folder with an empty 'data' directory,
+    so the saved files never touch the application's real data.
+    """
+    monkeypatch.chdir(tmp_path)
+    os.mkdir("data")
+    student_changes.clear()
+    yield tmp_path
+    student_changes.clear()
+
+def make_student(student_id, fname, classrooms):
+    # Helper that creates an enrolled student with a guardian, as add_student would.
+    birthday = (date.today() - timedelta(days=4 * 365)).isoformat()  # Always in the Kindergarten Room's age range
+    student = Student(fname, "Saka", birthday, ["Peanut"], student_id=student_id)
+    student.guardian = ParentGuardian("Mary", "Saka", "0406346693", "mary@example.com")
+    classrooms[2].students.append(student)
+    student.assign_classroom(classrooms[2])
+    return student
+
+def test_journal_save_replays_on_load(data_dir, classrooms):
+    """
+    Purpose: Tests that journal mode appends only the recorded changes and that
+    `load_students` replays them on top of the snapshot.
+
+    Assertions:
+        - The snapshot is not rewritten by a journal save.
+        - The loaded roster reflects the add and delete recorded in the journal.
+    """
+    bukayo = make_student(1, "Bukayo", classrooms)
+    save_students([bukayo])  # Full snapshot with one student
+    snapshot_size = os.path.getsize(file_functions.STUDENTS_FILE)
+
+    declan = make_student(2, "Declan", classrooms)
+    record_student_change("add", declan)
+    record_student_change("delete", bukayo)
+    save_students([declan], journal=True)
+
+    assert os.path.getsize(file_functions.STUDENTS_FILE) == snapshot_size
+    assert not student_changes
+
+    loaded_students = []
+    load_students(loaded_students, [Classroom("Kindergarten Room (3-5 years)", 3, 5)])
+    assert [student.student_id for student in loaded_students] == [2]
+    assert loaded_students[0].guardian.get_guardian_contact_email() == "mary@example.com"
+
+def test_journal_compacts_past_threshold(data_dir, classrooms, monkeypatch):
+    """
+    Purpose: Tests that the journal is compacted into a fresh snapshot once it passes the size threshold.
+
+    Assertions:
+        - The journal file is removed after compaction.
+        - The snapshot contains the journaled student.
+    """
+    monkeypatch.setattr(file_functions, "JOURNAL_COMPACT_THRESHOLD", 10)
+    student = make_student(3, "Gabriel", classrooms)
+    record_student_change("add", student)
+    save_students([student], journal=True)
+
+    assert not os.path.exists(file_functions.STUDENTS_JOURNAL_FILE)
+    loaded_students = []
+    load_students(loaded_students, classrooms)
+    assert loaded_students[0].get_fname() == "Gabriel"
+
+def test_load_students_streams_with_progress(data_dir, classrooms, monkeypatch):
+    """
+    Purpose: Tests that the streaming loader reads records split across small chunks
+    and reports progress after each student.
+
+    Assertions:
+        - All saved students are loaded in order.
+        - The progress callback receives a running count.
+    """
+    saved_students = [make_student(student_id, f"Student{'abcd'[student_id]}", classrooms) for student_id in range(1, 4)]
+    save_students(saved_students)
+
+    # Use a tiny chunk size so records span several reads
+    original_iter_json_array = file_functions.iter_json_array
+    monkeypatch.setattr(file_functions, "iter_json_array", lambda file: original_iter_json_array(file, chunk_size=7))
+
+    progress_counts = []
+    loaded_students = []
+    load_students(loaded_students, classrooms, progress=progress_counts.append)
+
+    assert [student.student_id for student in loaded_students] == [1, 2, 3]
+    assert progress_counts == [1, 2, 3]
+
+def test_saves_without_changes_do_no_io(data_dir, classrooms):
+    """
+    Purpose: Tests that the dirty tracking skips saving when nothing changed,
+    and that a changed week is written once it is marked.
+
+    Assertions:
+        - No journal or kitchen file is created when nothing changed.
+        - The kitchen file is written after a week is changed, and the dirty set is cleared.
+    """
+    save_students([make_student(4, "Martin", classrooms)], journal=True)
+    kitchen = Kitchen()
+    save_menu(kitchen)
+
+    assert os.listdir("data") == []
+
+    kitchen.menu["1"] = {"Monday": {"Breakfast": "Pancakes", "Lunch": None, "Afternoon Tea": None}}
+    kitchen.mark_week_changed(1)
+    save_menu(kitchen)
+
+    assert os.listdir("data/kitchen") == ["week_1.json"]
+    assert kitchen.changed_weeks == set()
+
+def test_menu_weeks_load_lazily_and_save_only_changes(data_dir):
+    """
+    Purpose: Tests that an older kitchen.json is split into weekly files, that weeks are only read when accessed,
+    and that saving only rewrites the changed week.
+
+    Assertions:
+        - No week is read when the menu is loaded.
+        - Unchanged weekly files are left untouched by a save.
+    """
+    with open("data/kitchen.json", "w") as file:
+        file.write('{"1": {"Monday": {"Breakfast": "Toast", "Lunch": "Soup", "Afternoon Tea": "Fruit"}}, "2": {}}')
+
+    kitchen = Kitchen()
+    load_menu(kitchen)
+    assert sorted(os.listdir("data/kitchen")) == ["week_1.json", "week_2.json"]
+    assert kitchen.menu.loaded_weeks == {}
+    assert list(kitchen.menu) == ["1", "2"]
+
+    week_2_modified = os.stat("data/kitchen/week_2.json").st_mtime_ns
+    kitchen.menu["1"]["Monday"]["Lunch"] = "Pasta"
+    kitchen.mark_week_changed(1)
+    save_menu(kitchen)
+
+    assert os.stat("data/kitchen/week_2.json").st_mtime_ns == week_2_modified
+    reloaded_kitchen = Kitchen()
+    load_menu(reloaded_kitchen)
+    assert reloaded_kitchen.menu["1"]["Monday"]["Lunch"] == "Pasta"
+
+def test_menu_edit_rechecks_allergies_without_reading_other_weeks(data_dir, classrooms):
+    """
+    Purpose: Tests that checking the menu against allergies after setting one day reads no other week's file,
+    and that a report of the whole menu reads every week and finds the conflicts in them.
+
+    Assertions:
+        - After a day is set and the checker refreshed, only the edited week has been read.
+        - A refresh given every week reads them all and lists the conflict in a week read only then.
+    """
+    os.mkdir("data/kitchen")
+    for week in range(1, 6):
+        with open(f"data/kitchen/week_{week}.json", "w") as file:
+            json.dump({"Monday": {"Breakfast": "Peanut Butter Toast"}}, file)
+    index = AllergenIndex()
+    student = make_student(1, "Bukayo", classrooms)
+    index.add(student)
+
+    kitchen = Kitchen()
+    load_menu(kitchen)
+    kitchen.dish_allergens = {"Peanut Butter Toast": ["Peanut"]}
+    checker = ExposureChecker(index)
+    checker.refresh(kitchen)
+    set_menu_for_day(kitchen, "2", "Tuesday", ["Peanut Butter Toast", "Pasta", "Fruit"])
+    checker.refresh(kitchen)
+
+    assert list(kitchen.menu.loaded_weeks) == ["2"]
+    assert [conflict[:2] for conflict in checker.conflicts()] == [("2", "Monday"), ("2", "Tuesday")]
+
+    checker.refresh(kitchen, kitchen.menu)
+    assert sorted(kitchen.menu.loaded_weeks, key=int) == ["1", "2", "3", "4", "5"]
+    assert [conflict[:2] for conflict in checker.conflicts("4")] == [("4", "Monday")]
+
+def test_deleted_menu_week_stays_deleted_and_its_file_is_removed(data_dir):
+    """
+    Purpose: Tests that deleting a whole week hides its file straight away and that the next save removes the file,
+    even though the deletion was not marked as a changed week.
+
+    Assertions:
+        - After `del kitchen.menu["2"]`, week 2 is no longer in the menu or listed, and reading it raises KeyError.
+        - Saving removes 'data/kitchen/week_2.json' and leaves week 1 untouched.
+        - A reloaded menu does not have week 2.
+    """
+    with open("data/kitchen.json", "w") as file:
+        file.write('{"1": {"Monday": {"Breakfast": "Toast", "Lunch": "Soup", "Afternoon Tea": "Fruit"}}, "2": {}}')
+    kitchen = Kitchen()
+    load_menu(kitchen)
+
+    del kitchen.menu["2"]
+    assert "2" not in kitchen.menu and list(kitchen.menu) == ["1"]
+    with pytest.raises(KeyError):
+        kitchen.menu["2"]
+
+    save_menu(kitchen)
+    assert os.listdir("data/kitchen") == ["week_1.json"]
+    reloaded_kitchen = Kitchen()
+    load_menu(reloaded_kitchen)
+    assert list(reloaded_kitchen.menu) == ["1"]
+
+def test_compact_menu_interns_dishes_and_saves_small_files(data_dir):
+    """
+    Purpose: Tests that the compact menu stores each dish once, still reads weekly files saved as nested dicts,
+    and saves each week as its dish IDs, much smaller than the nested dict format.
+
+    Assertions:
+        - A dish served on several days has one entry in the dish table.
+        - A week saved in the nested dict format loads with the same dishes, and is rewritten in compact form.
+        - The compact week file is a list of 21 dish IDs and is under a quarter of the size of the old file.
+    """
+    legacy_week = {day: {"Breakfast": "Toast", "Lunch": "Pizza", "Afternoon Tea": "Fruit"} for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]}
+    os.makedirs("data/kitchen")
+    with open("data/kitchen/week_1.json", "w") as file:
+        json.dump(legacy_week, file, indent=4)
+    legacy_size = os.path.getsize("data/kitchen/week_1.json")
+
+    kitchen = Kitchen()
+    load_menu(kitchen)
+    assert dict(kitchen.menu["1"]["Friday"]) == {"Breakfast": "Toast", "Lunch": "Pizza", "Afternoon Tea": "Fruit"}
+    assert kitchen.menu["1"]["Sunday"]["Lunch"] is None
+    assert kitchen.menu.dishes == [None, "Toast", "Pizza", "Fruit"]
+
+    kitchen.add_menu(2, "Monday", "Toast", "Pasta", None)
+    kitchen.mark_week_changed(1)
+    save_menu(kitchen)
+
+    with open("data/kitchen/week_1.json") as file:
+        saved_week = json.load(file)
+    assert saved_week == [1, 2, 3] * 5 + [0] * 6
+    assert os.path.getsize("data/kitchen/week_1.json") * 4 < legacy_size
+    with open("data/kitchen_dishes.json") as file:
+        assert json.load(file) == [None, "Toast", "Pizza", "Fruit", "Pasta"]
+
+    reloaded_kitchen = Kitchen()
+    load_menu(reloaded_kitchen)
+    assert dict(reloaded_kitchen.menu["2"]["Monday"]) == {"Breakfast": "Toast", "Lunch": "Pasta", "Afternoon Tea": None}
+    assert reloaded_kitchen.menu["1"] == kitchen.menu["1"]
+
+def test_rotating_menu_saves_only_distinct_days(data_dir):
+    """
+    Purpose: Tests that weeks repeating a rotating menu share its dishes, that editing a template week changes every
+    week repeating it, and that editing a later week only copies and changes that day (copy-on-write).
+
+    Assertions:
+        - Weeks after the template repeat it, and days that already differed keep their own dishes.
+        - Only the rotation file and the weeks with days of their own are saved.
+        - The reloaded menu serves the same dishes, and stopping the rotation keeps every week's dishes.
+    """
+    kitchen = Kitchen()
+    kitchen.add_menu(1, "Monday", "Toast", "Pizza", "Fruit")
+    kitchen.add_menu(2, "Monday", "Porridge", "Pasta", "Yoghurt")
+    kitchen.add_menu(6, "Friday", "Eggs", "Soup", "Scones")
+    kitchen.menu.set_rotation(1, 2)
+    for week in range(1, 53):
+        kitchen.mark_week_changed(week)
+
+    assert kitchen.menu["5"]["Monday"]["Lunch"] == "Pizza" and kitchen.menu["52"]["Monday"]["Lunch"] == "Pasta"
+    assert kitchen.menu["6"]["Friday"]["Lunch"] == "Soup"
+
+    kitchen.menu["3"]["Monday"]["Lunch"] = "Curry"
+    kitchen.menu["1"]["Monday"]["Breakfast"] = "Crumpets"
+    assert dict(kitchen.menu["3"]["Monday"]) == {"Breakfast": "Toast", "Lunch": "Curry", "Afternoon Tea": "Fruit"}
+    assert kitchen.menu["5"]["Monday"]["Breakfast"] == "Crumpets" and kitchen.menu["5"]["Monday"]["Lunch"] == "Pizza"
+
+    save_menu(kitchen)
+    assert sorted(os.listdir("data/kitchen")) == ["week_3.json", "week_6.json"]
+    with open("data/kitchen/week_3.json") as file:
+        assert list(json.load(file)) == ["Monday"]
+
+    reloaded_kitchen = Kitchen()
+    load_menu(reloaded_kitchen)
+    assert len(reloaded_kitchen.menu) == 52
+    for week in ["1", "3", "5", "6", "52"]:
+        assert reloaded_kitchen.menu[week] == kitchen.menu[week]
+
+    reloaded_kitchen.menu.clear_rotation()
+    assert reloaded_kitchen.menu.cycle_week("5") == 0
+    assert dict(reloaded_kitchen.menu["51"]["Monday"]) == {"Breakfast": "Crumpets", "Lunch": "Pizza", "Afternoon Tea": "Fruit"}
+
+def test_siblings_share_one_saved_guardian(data_dir, classrooms):
+    """
+    Purpose: Tests that a guardian shared by siblings is stored once in the guardians table
+    and loaded back as a single ParentGuardian instance.
+
+    Assertions:
+        - The guardians table holds one guardian, and both students refer to it by ID.
+        - The loaded siblings share the same guardian instance.
+    """
+    siblings = [make_student(5, "Jude", classrooms), make_student(6, "Jobe", classrooms)]
+    siblings[1].guardian = siblings[0].guardian
+    save_students(siblings)
+
+    with open(file_functions.GUARDIANS_FILE) as file:
+        assert len(json.load(file)) == 1
+    with open(file_functions.STUDENTS_FILE) as file:
+        saved_students = json.load(file)
+    assert saved_students[0]['guardian_id'] == saved_students[1]['guardian_id']
+    assert 'guardian' not in saved_students[0]
+
+    loaded_students = []
+    load_students(loaded_students, classrooms)
+    assert loaded_students[0].guardian is loaded_students[1].guardian
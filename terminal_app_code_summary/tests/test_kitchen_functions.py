@@ -3,7 +3,7 @@ import pytest  # Third-party library used for testing. Provides fixtures and tes
 
 # Importing internal modules (created within the project)
 from classes.kitchen import Kitchen  # Internal module defining the Kitchen class, which manages the menu data structure.
-from functions.kitchen_functions import add_menu_for_day  # Function to add or update the menu for a specific day.
+from functions.kitchen_functions import add_menu_for_day, list_menu_for_week  # Functions to add or update the menu for a specific day, and list the menu for a range of weeks.
 
 # Define fixture for testing
 @pytest.fixture
@@ -86,3 +86,36 @@ def test_add_menu_for_day(mocker, kitchen):
     assert kitchen.menu[week_str]['Monday']['Breakfast'] == 'Pancakes'  # Check breakfast
     assert kitchen.menu[week_str]['Monday']['Lunch'] == 'Sandwich'  # Check lunch
     assert kitchen.menu[week_str]['Monday']['Afternoon Tea'] == 'Cookies'  # Check afternoon tea
+
+def test_list_menu_for_a_range_of_weeks_and_dates(mocker, kitchen, tmp_path, capsys):
+    """
+    Test listing the menu for a range of weeks to a file, and for a range of dates to the terminal.
+
+    Purpose:
+        Validates that `list_menu_for_week` accepts ranges, writes every week in the range in order,
+        notes weeks without a menu, and labels each day with its date for a date range.
+
+    Assertions:
+        - The file lists weeks 1 to 52 once each, with the dishes set and no terminal color codes.
+        - A date range lists only the weekdays between the dates, under the week each falls in.
+    """
+    kitchen.add_menu("1", "Monday", "Pancakes", "Sandwich", "Cookies")
+    kitchen.add_menu("2", "Friday", "Toast", "Pizza", None)
+    output_file = tmp_path / "menu.txt"
+
+    mocker.patch('builtins.input', side_effect=['1-52', str(output_file)])
+    list_menu_for_week(kitchen)
+
+    listing = output_file.read_text()
+    assert [line for line in listing.splitlines() if line.startswith("---")] == [f"--- Menu for Week {week} ---" for week in range(1, 53)]
+    assert "  Lunch: Sandwich" in listing and "No menu found for Week 3." in listing
+    assert "\x1b[" not in listing
+
+    capsys.readouterr()
+    mocker.patch('builtins.input', side_effect=['2026-01-08 to 2026-01-12', ''])  # Thursday of week 2 to Monday of week 3
+    list_menu_for_week(kitchen)
+
+    output = capsys.readouterr().out
+    assert "Menu for Friday 2026-01-09:" in output and "  Lunch: Pizza" in output
+    assert "Menu for Thursday 2026-01-08:" in output and "2026-01-10" not in output and "2026-01-11" not in output
+    assert "No menu found for Week 3." in output
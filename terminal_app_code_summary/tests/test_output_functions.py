@@ -0,0 +1,81 @@
+import json  # Standard library used to read back the JSON Lines output.
+from io import StringIO  # Standard library in-memory file, used to capture the listings.
+
+import pytest  # External library used for writing and running tests.
+from colored import Style, Fore, Back  # External library whose escape codes the color constants are written from.
+
+import constants  # Internal module holding the color constants.
+
+from classes.students import Student  # Internal class for creating student instances.
+from classes.classrooms import Classroom  # Internal class for creating classroom instances.
+from functions.output_functions import write_rows  # Function that writes plain, TSV and JSON Lines listings.
+from functions.classroom_functions import list_students_by_classroom  # Function that lists the students in each classroom.
+
+
+def test_write_rows_formats_plain_tsv_and_json_lines():
+    """
+    Purpose: Tests that the row formats write the same rows as aligned columns, tab-separated values and JSON Lines.
+
+    Assertions:
+        - Plain columns line up under their headings, with no trailing spaces.
+        - TSV has the headings on the first line and replaces tabs inside values.
+        - Each JSON Lines row is an object keyed by the snake case headings, without the title.
+        - An unknown format raises ValueError.
+    """
+    headers = ["Student ID", "Name"]
+    rows = [["01", "Dani Olmo"], ["02", "Harry\tKane"]]
+
+    output = StringIO()
+    assert write_rows(headers, rows, "plain", output, title="Students:") == 5
+    lines = output.getvalue().splitlines()
+    assert lines[1:] == ["Students:", "Student ID  Name", "----------  ----------", "01          Dani Olmo", "02          Harry\tKane"]
+
+    output = StringIO()
+    write_rows(headers, rows, "tsv", output, title="Students:")
+    assert output.getvalue() == "Student ID\tName\n01\tDani Olmo\n02\tHarry Kane\n"
+
+    output = StringIO()
+    write_rows(headers, iter(rows), "jsonl", output, title="Students:")
+    assert [json.loads(line) for line in output.getvalue().splitlines()] == [
+        {"student_id": "01", "name": "Dani Olmo"}, {"student_id": "02", "name": "Harry\tKane"}
+    ]
+
+    with pytest.raises(ValueError):
+        write_rows(headers, rows, "csv", StringIO())
+
+
+def test_student_listing_in_json_lines_has_no_colors():
+    """
+    Purpose: Tests that listing the students by classroom in JSON Lines writes one uncolored row per student.
+
+    Assertions:
+        - Each student is listed once, with their classroom, in classroom order.
+        - The output contains no ANSI escape codes or table borders.
+    """
+    classrooms = [Classroom("Toddlers Room (2-3 years)", 2, 3), Classroom("Kindergarten Room (3-5 years)", 3, 5)]
+    for student_id, classroom in [(2, classrooms[1]), (1, classrooms[0])]:
+        student = Student("Declan", "Rice", "2022-06-01", student_id=student_id)
+        classroom.students.append(student)
+        student.assign_classroom(classroom)
+
+    output = StringIO()
+    list_students_by_classroom(classrooms, "jsonl", output)
+    rows = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [(row["student_id"], row["classroom"]) for row in rows] == [("01", "Toddlers Room (2-3 years)"), ("02", "Kindergarten Room (3-5 years)")]
+    assert "\x1b" not in output.getvalue() and "+" not in output.getvalue()
+
+
+def test_color_constants_match_colored():
+    """
+    Purpose: Tests that the color constants, written out so the main menu does not import `colored`,
+    are the same escape codes the `colored` attributes produce.
+
+    Assertions:
+        - Each color constant equals the colored attributes named beside it in constants.py.
+    """
+    assert constants.color1 == f"{Style.underline}{Style.BOLD}{Fore.dark_green}{Back.spring_green_4}"
+    assert constants.color2 == f"{Style.BOLD}{Fore.white}{Back.dark_blue}"
+    assert constants.color3 == f"{Fore.yellow}{Back.black}"
+    assert constants.color4 == f"{Style.BOLD}{Fore.magenta}"
+    assert constants.color5 == f"{Fore.red}{Back.black}"
+    assert constants.color_reset == Style.reset
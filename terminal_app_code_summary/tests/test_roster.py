@@ -0,0 +1,100 @@
+import pytest  # External library used for writing and running tests.
+
+from classes.classrooms import Classroom  # Internal class used to create and manage classroom instances.
+from classes.students import Student  # Internal class for creating student instances.
+from classes.roster import ColumnarRoster  # Internal class under test.
+from classes.transition_scheduler import TransitionScheduler  # Internal class under test.
+from datetime import date  # Standard library used to build day ordinals for the scheduler.
+
+@pytest.fixture
+def classrooms():
+    """
+    Purpose: Provides a reusable fixture that initializes a list of predefined Classroom instances.
+    """
+    return [
+        Classroom("Babies Room (0-2 years)", 0, 2),
+        Classroom("Toddlers Room (2-3 years)", 2, 3),
+        Classroom("Kindergarten Room (3-5 years)", 3, 5)
+    ]
+
+def test_columnar_assignment_matches_assign_student(classrooms):
+    """
+    Purpose: Tests that the one-pass columnar assignment gives every student the same classroom
+    as `assign_student`, including students right on an age boundary or too old for any classroom.
+
+    Assertions:
+        - The classroom index of every student matches the classroom chosen by `assign_student`.
+        - The per-classroom counts match the classroom lists.
+    """
+    today = Student("Today", "Student", "2025-06-30").get_birth_ordinal()
+    birthdays = ["2025-01-01", "2023-06-30", "2023-07-01", "2022-06-30", "2020-07-01", "2020-06-29", "2019-01-01"]
+    students = [Student("Child", "Test", birthday, student_id=number) for number, birthday in enumerate(birthdays, start=1)]
+
+    roster = ColumnarRoster.from_students(students)
+    indexes = roster.assign_classrooms(classrooms, today=today)
+
+    expected = []
+    for student in students:
+        age = (today - student.get_birth_ordinal()) / 365.25
+        expected.append(next((index for index, classroom in enumerate(classrooms) if classroom.is_valid_for_age(age)), -1))
+    assert list(indexes) == expected
+    assert list(roster.ages(today)) == [(today - student.get_birth_ordinal()) / 365.25 for student in students]
+
+    unassigned = roster.apply(classrooms)
+    assert roster.classroom_counts(classrooms) == [len(classroom.students) for classroom in classrooms]
+    assert len(unassigned) == expected.count(-1)
+
+def test_columnar_assignment_handles_missing_birthdays_and_many_classrooms():
+    """
+    Purpose: Tests that students without a birthday are left unassigned instead of failing,
+    and that classroom indexes past 127 (more than a signed byte holds) are stored.
+
+    Assertions:
+        - A student without a birthday gets classroom index -1 and a NaN age.
+        - A student in the 200th classroom gets index 199 and is placed in that classroom.
+    """
+    classrooms = [Classroom(f"Room {number}", number / 100, (number + 1) / 100) for number in range(200)]
+    today = Student("Today", "Student", "2025-06-30").get_birth_ordinal()
+    no_birthday = Student("Child", "Test", None, student_id=1)
+    oldest = Student("Child", "Test", "2023-07-01", student_id=2)  # 730 days old, age 1.9986
+
+    roster = ColumnarRoster.from_students([no_birthday, oldest])
+    assert list(roster.assign_classrooms(classrooms, today=today)) == [-1, 199]
+    assert roster.ages(today)[0] != roster.ages(today)[0]  # NaN
+
+    assert roster.apply(classrooms) == [no_birthday]
+    assert oldest.classroom is classrooms[199] and no_birthday.classroom is None
+
+def test_transition_scheduler_moves_only_due_students(classrooms):
+    """
+    Purpose: Tests that each day tick moves only the students who became too old for their classroom that day,
+    that deleted students are skipped, and that students too old for every classroom are returned as aged out.
+
+    Assertions:
+        - Nobody moves before a student's age (as calculated by `calculate_age`) reaches a classroom's maximum age.
+        - The day a student's age reaches 2 they move from the Babies Room to the Toddlers Room.
+        - An unscheduled (deleted) student is not moved.
+        - The day a student's age reaches 5 they leave the Kindergarten Room and are reported as aged out.
+    """
+    scheduler = TransitionScheduler()
+    babies, toddlers, kindergarten = classrooms
+    baby = Student("Cole", "Palmer", "2024-03-10", student_id=1)
+    deleted = Student("Reece", "James", "2024-03-10", student_id=2)
+    preschooler = Student("Bukayo", "Saka", "2021-06-01", student_id=3)
+    for student, classroom in [(baby, babies), (deleted, babies), (preschooler, kindergarten)]:
+        classroom.students.append(student)
+        student.assign_classroom(classroom)
+        scheduler.schedule(student)
+    scheduler.unschedule(deleted)
+
+    assert scheduler.tick(classrooms, today=date(2026, 3, 10).toordinal()) == ([], [])  # 730 days old, age 1.998
+
+    moved, aged_out = scheduler.tick(classrooms, today=date(2026, 3, 11).toordinal())  # 731 days old, age 2.001
+    assert moved == [(baby, babies)] and aged_out == []
+    assert baby.classroom is toddlers and toddlers.students == [baby]
+    assert babies.students == [deleted]  # Unscheduled students are left alone
+    assert scheduler.next_due() == date(2026, 6, 2).toordinal()
+
+    moved, aged_out = scheduler.tick(classrooms, today=date(2026, 6, 2).toordinal())
+    assert moved == [] and aged_out == [preschooler]
+    assert preschooler.classroom is None and kindergarten.students == []
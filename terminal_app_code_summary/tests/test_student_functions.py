@@ -1,5 +1,10 @@
+import json  # Standard library used to read the saved roster back.
+import os  # Standard library used to create the temporary data folder.
+from datetime import date, timedelta  # Standard library used to build birthdays relative to today.
+
 import pytest  # External library used for writing and running tests.
-from functions.student_functions import add_student  # Internal module function for adding a student with validations and classroom assignments.
+from functions.student_functions import add_student, import_students_from_csv  # Internal module functions for adding students one at a time or from a CSV file.
+from classes.students import student_changes  # Internal dirty set of unsaved student changes, cleared between tests.
 from classes.classrooms import Classroom  # Internal class used to create and manage classroom instances.
 
 # Pytest fixture for initializing a list of classroom instances.
@@ -75,4 +80,41 @@ def test_add_student(mocker, students, classrooms):
     assert len(students) == 1 # test that student is added to students list
     assert students[0].get_fname() == 'Kylian' # Verify student's first name
     assert students[0].guardian.get_guardian_contact_email() == 'mary@example.com' # Verify student's last name
-    assert students[0].get_allergies() == ['Peanut', 'Dairy'] # Verify student's allergies
\ No newline at end of file
+    assert students[0].get_allergies() == ['Peanut', 'Dairy'] # Verify student's allergies
+
+def test_import_students_from_csv(tmp_path, monkeypatch, students, classrooms):
+    """
+    Purpose: Tests that `import_students_from_csv` enrols the valid rows, reports every invalid row
+    with its line number, and writes the roster once at the end.
+
+    Assertions:
+        - Valid rows are enrolled in the classroom for their age, with a new ID and shared guardian.
+        - Invalid rows are reported with their line number and all of their problems.
+        - The saved roster contains the imported students.
+    """
+    monkeypatch.chdir(tmp_path)
+    os.mkdir("data")
+    student_changes.clear()
+    toddler_birthday = (date.today() - timedelta(days=900)).isoformat()
+    with open("roster.csv", "w") as file:
+        file.write(
+            "fname,lname,birthday,allergies,guardian_fname,guardian_lname,contact_number,contact_email\n"
+            f"bukayo,Saka,{toddler_birthday},peanut;Dairy,Mary,Saka,0406346693,mary@example.com\n"
+            "Declan,Rice,2023-13-01,,John,Rice,12345,john@example.com\n"
+            f"Ethan,Saka,{toddler_birthday},,Mary,Saka,0406346693,mary@example.com\n"
+            f"Jean--Luc,Rice,{toddler_birthday},,John,Rice,0406346693,john at example.com\n"
+        )
+
+    imported, bad_rows = import_students_from_csv(students, classrooms, "roster.csv", batch_size=2)
+
+    assert [student.get_fname() for student in imported] == ["Bukayo", "Ethan"]
+    assert imported[0].get_allergies() == ["Peanut", "Dairy"]
+    assert imported[0].guardian is imported[1].guardian
+    assert all(student.get_classroom_name() == "Toddlers Room (2-3 years)" for student in imported)
+    assert [line_number for line_number, _ in bad_rows] == [3, 5]
+    assert "Invalid date format" in bad_rows[0][1] and "Contact number" in bad_rows[0][1]
+    assert "consecutive hyphens" in bad_rows[1][1] and "Email address" in bad_rows[1][1]
+
+    with open("data/students.json") as file:
+        assert sorted(record["student_id"] for record in json.load(file)) == sorted(student.student_id for student in imported)
+    assert not student_changes